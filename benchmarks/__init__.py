@@ -0,0 +1,26 @@
+"""
+Benchmarks
+----------
+Benchmark suite for the projection pipeline and the simulators in misc/. A
+synthetic league generator (synthetic.py) writes DVOA, PFF, projection, team
+and matchup files at any scale in the layout of data/raw/, and the suite
+(suite.py) times the loaders, Team and Matchup math, the rile simulators and
+the season projection on it, reporting throughput and peak memory and saving
+baselines to compare later runs against.
+
+Run from the repository root:
+
+    python -m benchmarks --scale medium --save before
+    python -m benchmarks --scale medium --compare before
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The model and the misc scripts use flat imports, so their directories go on the path
+for _path in (os.path.join(ROOT_DIR, "src"), os.path.join(ROOT_DIR, "misc"),
+              os.path.join(ROOT_DIR, "misc", "rile_2024")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
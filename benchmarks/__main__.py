@@ -0,0 +1,59 @@
+"""
+Benchmark Runner
+----------------
+Command line entry point: generates (or reuses) a synthetic league, runs the
+benchmark suite on it and prints throughput and peak memory, optionally saving
+the results as a baseline or comparing them with a saved one.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import benchmarks  # noqa: F401  (puts src/ and misc/ on the path)
+from benchmarks.suite import environment, format_results, load_baseline, run_benchmarks, save_baseline
+from benchmarks.synthetic import SCALES, generate_league
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the projection pipeline on a synthetic league.")
+    parser.add_argument('--scale', choices=sorted(SCALES), default="small",
+                        help="Size of the synthetic league (default: small)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the synthetic league (default: 0)")
+    parser.add_argument('--data-dir',
+                        help="Write the league here and keep it (default: a temporary directory)")
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help="Run only benchmarks whose name starts with one of these, e.g. load rile")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per benchmark; the best is kept")
+    parser.add_argument('--save', metavar='NAME', help="Save the results as baseline NAME")
+    parser.add_argument('--compare', metavar='NAME', help="Compare the results with baseline NAME")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Generate the league, run the benchmarks and report."""
+    args = _parse_args(argv)
+    scale = SCALES[args.scale]
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = args.data_dir or temp_dir
+        started = time.perf_counter()
+        league = generate_league(data_dir, scale, args.seed)
+        print(f"Generated {args.scale} league in {time.perf_counter() - started:.1f}s: {len(league.teams)} teams, "
+              f"{league.players:,} players, {league.games:,} games in {os.path.abspath(league.data_dir)}\n")
+        results = run_benchmarks(league, args.only, args.repeat)
+
+    if baseline and baseline["metadata"].get("scale") != args.scale:
+        print(f"Note: baseline '{args.compare}' was run at scale {baseline['metadata'].get('scale')}\n")
+    print(format_results(results, baseline))
+    if args.save:
+        metadata = {"scale": args.scale, "seed": args.seed, "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    **environment()}
+        print(f"\nSaved baseline to {save_baseline(args.save, results, metadata)}")
+
+
+if __name__ == "__main__":
+    main()
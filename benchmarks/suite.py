@@ -0,0 +1,365 @@
+"""
+Benchmark Suite
+---------------
+This module defines the benchmarks run against a synthetic league and the
+runner that times them. Each benchmark has a setup step (not timed) and a run
+step that returns how many items it processed; the runner keeps the best of
+several timed repeats, measures peak traced memory in one extra run, and can
+save the results as a named baseline or compare them with an earlier one.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+import types
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import SyntheticLeague
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+class Benchmark(NamedTuple):
+    """One timed operation: setup(league) builds its inputs, run(state) returns items processed."""
+    name: str
+    unit: str
+    setup: Callable[[SyntheticLeague], Any]
+    run: Callable[[Any], int]
+
+
+class BenchmarkResult(NamedTuple):
+    """Timing and memory of one benchmark."""
+    name: str
+    unit: str
+    items: int
+    seconds: float
+    peak_mb: float
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else float("inf")
+
+
+def _first_week(league: SyntheticLeague):
+    from context import SeasonDataContext
+    context = SeasonDataContext(league.weeks[0], league.seasons[0], league.data_dir)
+    context.preload()
+    return context
+
+
+def _load_dvoa(league: SyntheticLeague) -> int:
+    from dvoa import DVOA
+    store = DVOA(league.data_dir).get_data()
+    return len(store.players) + len(store.teams)
+
+
+def _load_pff(league: SyntheticLeague) -> int:
+    from pff import PFF
+    return len(PFF(league.data_dir).get_data()["2024"]["Passing"])
+
+
+def _load_projections(league: SyntheticLeague) -> int:
+    from projections import Projections
+    return sum(len(Projections(week, league.seasons[0], league.data_dir).load().get_players())
+               for week in league.weeks)
+
+
+def _compile_cache(league: SyntheticLeague):
+    from compile_data import compile_data
+    from data_loader import ParsedDataCache
+    cache = ParsedDataCache(os.path.join(league.data_dir, "cache"))
+    compile_data(league.seasons[:1], league.weeks[:1], league.data_dir, cache)
+    return league, cache
+
+
+def _load_compiled(state) -> int:
+    """Open a fresh week's sources from the memory-mapped cache."""
+    from context import SeasonDataContext
+    league, cache = state
+    context = SeasonDataContext(league.weeks[0], league.seasons[0], league.data_dir, cache)
+    context.preload()
+    return len(context.SOURCES)
+
+
+def _team_values(context) -> int:
+    from team import Team
+    teams = list(context.pass_rates)
+    for team_name in teams:
+        team = Team(team_name, context)
+        team.get_total_passing_value()
+        team.get_total_rushing_value()
+        team.get_total_passing_value_def()
+        team.get_total_rushing_value_def()
+    return len(teams)
+
+
+def _build_matchups(league: SyntheticLeague):
+    from matchup import Matchup
+    context = _first_week(league)
+    return [Matchup(matchup_data, context) for matchup_data in context.matchups]
+
+
+def _project_points(matchups) -> int:
+    for matchup in matchups:
+        matchup._calculate_projected_points()
+    return len(matchups)
+
+
+def _project_season(league: SyntheticLeague) -> int:
+    """Load a whole season and project every game of every week, end to end."""
+    from context import SeasonDataContext
+    from matchup import Matchup
+    season_context = SeasonDataContext(league.weeks[0], league.seasons[0], league.data_dir)
+    games = 0
+    for week in league.weeks:
+        context = season_context if week == league.weeks[0] else season_context.for_week(week)
+        for index, matchup_data in enumerate(context.matchups):
+            Matchup(matchup_data, context).project(index)
+            games += 1
+    return games
+
+
+def _project_slate(league: SyntheticLeague):
+    from matchup import Matchup
+    context = _first_week(league)
+    return [Matchup(matchup_data, context).project(index) for index, matchup_data in enumerate(context.matchups)]
+
+
+def _size_portfolio(projections) -> int:
+    from portfolio import SlatePortfolio
+    return len(SlatePortfolio().optimize(projections).bets)
+
+
+def _scenario_sweep(league: SyntheticLeague):
+    from scenarios import ScenarioSweep, Scenarios
+    scenarios = Scenarios.grid(precipitation=list(range(0, 100, 10)), pass_rate_shift=list(range(-5, 6)),
+                               home_advantage=[0, 1, 1.5, 2, 2.5, 3], field=['turf', 'grass'], qb_weight=[0.4, 0.5, 0.6])
+    return ScenarioSweep(_first_week(league)), scenarios
+
+
+def _sweep_scenarios(state) -> int:
+    sweep, scenarios = state
+    result = sweep.run(scenarios)
+    return result.home_points.size
+
+
+def _fit_games(league: SyntheticLeague):
+    """Gather a season's games with random final scores and a gradient-sized batch of parameter vectors."""
+    from context import SeasonDataContext
+    from fitting import CalibrationFitter, HistoricalGames
+    from matchup import Matchup
+    rng = np.random.default_rng(0)
+    season_context = SeasonDataContext(league.weeks[0], league.seasons[0], league.data_dir)
+    scored = []
+    for week in league.weeks:
+        context = season_context if week == league.weeks[0] else season_context.for_week(week)
+        for matchup_data in context.matchups:
+            scored.append((league.seasons[0], week, matchup_data, Matchup(matchup_data, context),
+                           tuple(rng.integers(0, 45, 2).tolist())))
+    # from_backtest only reads the backtest's (season, week, data, matchup, score) rows
+    games = HistoricalGames.from_backtest(types.SimpleNamespace(matchups=scored))
+    fitter = CalibrationFitter(games)
+    return games, np.repeat(fitter.start[None, :], 2 * len(fitter.free), axis=0)
+
+
+def _evaluate_losses(state) -> int:
+    games, batch = state
+    repeats = 100
+    for _ in range(repeats):
+        games.losses(batch, 'squared_error')
+    return repeats * len(batch)
+
+
+def _drive_predictor():
+    from rile import NFLDrivePredictor
+    predictor = NFLDrivePredictor()
+    predictor.set_offensive_stats(qb_rating=105.0, qb_epa_per_play=0.25, rb_ypc=4.5, wr_ypr=12.0, ol_pbwr=65,
+                                  ol_rbwr=60, third_down_rate=45, rz_efficiency=60, pace_of_play=28,
+                                  kicker_accuracy=90)
+    predictor.set_defensive_stats(def_dvoa=-10, def_pressure_rate=30, def_coverage_rating=75)
+    return predictor
+
+
+def _predict_drives(predictor) -> int:
+    random.seed(0)
+    drives = 20_000
+    for _ in range(drives):
+        predictor.predict_drive_outcome(25)
+    return drives
+
+
+def _sample_drives(predictor) -> int:
+    drives = 1_000_000
+    predictor.sample_drives(drives, 25, rng=np.random.default_rng(0))
+    return drives
+
+
+def _rile_games(league: SyntheticLeague):
+    from rile_game import NFLGameSimulator
+    predictor = _drive_predictor()
+    return predictor, NFLGameSimulator
+
+
+def _simulate_games(state) -> int:
+    predictor, simulator_class = state
+    random.seed(0)
+    games = 200
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(games):
+            game = simulator_class("Home", "Away")
+            game.team1['predictor'] = game.team2['predictor'] = predictor
+            game.simulate_game()
+    return games
+
+
+def _batch_simulator(league: SyntheticLeague):
+    from rile_batch import BatchGameSimulator
+    predictor = _drive_predictor()
+    return BatchGameSimulator.from_predictors("Home", predictor, "Away", predictor)
+
+
+def _simulate_batch(simulator) -> int:
+    games = 100_000
+    simulator.simulate(games, seed=0)
+    return games
+
+
+def _batch_slate(league: SyntheticLeague):
+    from rile_batch import BatchGameSimulator
+    rng = np.random.default_rng(0)
+    return [BatchGameSimulator(f"Home {game}", f"Away {game}", rng.uniform(0.3, 0.7, 2), rng.uniform(24, 30, 2),
+                               rng.uniform(0.8, 0.95, 2))
+            for game in range(league.scale.games_per_week)]
+
+
+def _simulate_slate(simulators) -> int:
+    from rile_batch import simulate_games
+    games = 10_000
+    simulate_games(simulators, games, seed=0)
+    return len(simulators) * games
+
+
+def _league_schedule(league: SyntheticLeague) -> List[Dict]:
+    from data_loader import load_yaml_data
+    rng = np.random.default_rng(0)
+    schedule = []
+    for season in league.seasons[:1]:
+        for week in league.weeks:
+            for game in load_yaml_data(f"{league.data_dir}matchups/{season}/matchups_week_{week}.yaml"):
+                schedule.append({'home': game['home'], 'away': game['away'], 'week': week,
+                                 'home_win_pct': float(rng.uniform(20, 80))})
+    return schedule
+
+
+def _project_records(schedule) -> int:
+    from season_projection import project_season_records
+    project_season_records(schedule)
+    return len(schedule)
+
+
+def _season_simulation(league: SyntheticLeague):
+    divisions = {f"Division {i // 4}": league.teams[i:i + 4] for i in range(0, len(league.teams), 4)}
+    return _league_schedule(league), divisions
+
+
+def _simulate_seasons(state) -> int:
+    from season_simulator import simulate_season
+    schedule, divisions = state
+    seasons = 10_000
+    simulate_season(schedule, seasons, seed=0, divisions=divisions)
+    return seasons
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("load.dvoa", "entities", lambda league: league, _load_dvoa),
+    Benchmark("load.pff", "players", lambda league: league, _load_pff),
+    Benchmark("load.projections", "players", lambda league: league, _load_projections),
+    Benchmark("load.compiled", "sources", _compile_cache, _load_compiled),
+    Benchmark("team.values", "teams", _first_week, _team_values),
+    Benchmark("matchup.project_points", "games", _build_matchups, _project_points),
+    Benchmark("pipeline.season", "games", lambda league: league, _project_season),
+    Benchmark("portfolio.optimize", "bets", _project_slate, _size_portfolio),
+    Benchmark("scenarios.sweep", "game-scenarios", _scenario_sweep, _sweep_scenarios),
+    Benchmark("fitting.losses", "vectors", _fit_games, _evaluate_losses),
+    Benchmark("rile.predict_drive_outcome", "drives", lambda league: _drive_predictor(), _predict_drives),
+    Benchmark("rile.sample_drives", "drives", lambda league: _drive_predictor(), _sample_drives),
+    Benchmark("rile_game.simulate_game", "games", _rile_games, _simulate_games),
+    Benchmark("rile_batch.simulate", "games", _batch_simulator, _simulate_batch),
+    Benchmark("rile_batch.simulate_games", "games", _batch_slate, _simulate_slate),
+    Benchmark("season.project_season_records", "games", _league_schedule, _project_records),
+    Benchmark("season.simulate_season", "seasons", _season_simulation, _simulate_seasons)
+]
+
+
+def run_benchmark(benchmark: Benchmark, league: SyntheticLeague, repeat: int = 3) -> BenchmarkResult:
+    """Time a benchmark (best of `repeat` runs) and measure its peak traced memory in one more run."""
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        state = benchmark.setup(league)
+        started = time.perf_counter()
+        items = benchmark.run(state)
+        best = min(best, time.perf_counter() - started)
+
+    state = benchmark.setup(league)
+    tracemalloc.start()
+    try:
+        benchmark.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(benchmark.name, benchmark.unit, items, best, peak / 2 ** 20)
+
+
+def run_benchmarks(league: SyntheticLeague, names: Optional[List[str]] = None,
+                   repeat: int = 3) -> List[BenchmarkResult]:
+    """Run every benchmark (or those whose name starts with one of `names`)."""
+    selected = [benchmark for benchmark in BENCHMARKS
+                if not names or any(benchmark.name.startswith(name) for name in names)]
+    return [run_benchmark(benchmark, league, repeat) for benchmark in selected]
+
+
+def save_baseline(name: str, results: List[BenchmarkResult], metadata: Dict[str, Any]) -> str:
+    """Save results as a named baseline and return the file written."""
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    file_path = os.path.join(BASELINE_DIR, f"{name}.json")
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump({"metadata": metadata, "results": [result._asdict() for result in results]}, file, indent=2)
+    return file_path
+
+
+def load_baseline(name: str) -> Dict[str, Any]:
+    """Load a named baseline saved by save_baseline."""
+    with open(os.path.join(BASELINE_DIR, f"{name}.json"), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def environment() -> Dict[str, str]:
+    """Return the interpreter and platform the benchmarks ran on."""
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "platform": platform.platform()}
+
+
+def format_results(results: List[BenchmarkResult], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Return a table of results, with the throughput relative to a baseline when one is given."""
+    previous = {result["name"]: result for result in baseline["results"]} if baseline else {}
+    width = max(len("Benchmark"), *(len(result.name) for result in results))
+    header = f"{'Benchmark':<{width}} {'Items':>10} {'Best (s)':>10} {'Throughput':>22} {'Peak MB':>9}"
+    if baseline:
+        header += f" {'vs baseline':>12}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        line = (f"{result.name:<{width}} {result.items:>10,} {result.seconds:>10.4f} "
+                f"{f'{result.throughput:,.0f} {result.unit}/s':>22} {result.peak_mb:>9.1f}")
+        if result.name in previous and result.seconds:
+            before = previous[result.name]
+            line += f" {result.throughput / (before['items'] / before['seconds']):>11.2f}x"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,227 @@
+"""
+Synthetic League Generator
+--------------------------
+This module writes a fake league in the layout of data/raw/: yearly DVOA files
+(players, offensive lines, team defense), DAVE, PFF passing grades, weekly
+player projections, pass rates, home field advantage and weekly matchup YAML.
+Teams, roster depth, seasons, weeks and games per week are configurable, so the
+loaders and the projection model can be run on many times the real data size.
+Every file holds exactly the columns the loaders read plus a few of the real
+files' extra columns, and all values are drawn from a seeded generator.
+"""
+
+import csv
+import os
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+import yaml
+
+import config
+
+# Projected stat columns of the weekly projection files, by position
+PROJECTION_COLUMNS = {
+    "QB": ["pass_cmp", "pass_att", "pass_yds", "pass_td", "pass_int", "rush_att", "rush_yds", "rush_td"],
+    "RB": ["rush_att", "rush_yds", "rush_td", "rec_tgt", "rec", "rec_yds", "rec_td", "fum"],
+    "WR": ["rec_tgt", "rec", "rec_yds", "rec_td", "rush_att", "rush_yds", "rush_td", "fum"],
+    "TE": ["rec_tgt", "rec", "rec_yds", "rec_td", "rush_att", "rush_yds", "rush_td", "fum"]
+}
+
+
+class LeagueScale(NamedTuple):
+    """Size of a synthetic league."""
+    teams: int
+    players_per_position: Dict[str, int]
+    seasons: int
+    weeks: int
+    games_per_week: int
+    # Players in the DVOA files that are not on any roster
+    extra_dvoa_players: int
+
+
+SCALES: Dict[str, LeagueScale] = {
+    "small": LeagueScale(32, {"QB": 3, "RB": 5, "WR": 8, "TE": 4}, 1, 5, 16, 200),
+    "medium": LeagueScale(64, {"QB": 4, "RB": 8, "WR": 12, "TE": 6}, 2, 18, 32, 2_000),
+    "large": LeagueScale(256, {"QB": 4, "RB": 10, "WR": 14, "TE": 7}, 2, 18, 128, 20_000)
+}
+
+
+class SyntheticLeague(NamedTuple):
+    """Where a synthetic league was written and what it contains."""
+    data_dir: str
+    teams: List[str]
+    seasons: List[str]
+    weeks: List[int]
+    scale: LeagueScale
+
+    @property
+    def players(self) -> int:
+        return self.scale.teams * sum(self.scale.players_per_position.values())
+
+    @property
+    def games(self) -> int:
+        return len(self.seasons) * len(self.weeks) * self.scale.games_per_week
+
+
+def team_names(count: int) -> List[str]:
+    """Return `count` distinct uppercase team abbreviations."""
+    names = []
+    for i in range(count):
+        name = ""
+        i += 26  # Start at two letters
+        while i:
+            i, letter = divmod(i, 26)
+            name = chr(ord("A") + letter) + name
+        names.append(name)
+    return names
+
+
+def player_name(team: str, position: str, depth: int) -> str:
+    return f"{team} {position}{depth + 1}"
+
+
+def _write_csv(file_path: str, fieldnames: Sequence[str], rows: List[Dict]):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _roster(teams: List[str], scale: LeagueScale) -> List[tuple]:
+    """Return (team, position, depth, name) for every rostered player."""
+    return [(team, position, depth, player_name(team, position, depth))
+            for team in teams
+            for position, count in scale.players_per_position.items()
+            for depth in range(count)]
+
+
+def _write_dvoa(data_dir: str, teams: List[str], roster: List[tuple], scale: LeagueScale,
+                rng: np.random.Generator):
+    """Write every configured year's player and team DVOA files, plus DAVE."""
+    extra = [f"free agent {i}" for i in range(scale.extra_dvoa_players)]
+    for year in config.YEARS:
+        year_dir = f"{data_dir}dvoa/{year}/"
+        for filename, positions, attempts_column in (
+            ("passing_dvoa.csv", ("QB",), "ATT"),
+            ("rushing_dvoa.csv", ("QB", "RB", "WR"), "ATT"),
+            ("receiving_dvoa.csv", ("RB", "WR", "TE"), "TAR")
+        ):
+            names = [name for team, position, _, name in roster if position in positions] + extra
+            rows = [{"Rk": "", "Player": name, "Tm": "", "G": 17,
+                     attempts_column: int(rng.integers(1, 600)),
+                     "DVOA": round(float(rng.normal(0, 20)), 1)} for name in names]
+            _write_csv(f"{year_dir}{filename}", ["Rk", "Player", "Tm", "G", attempts_column, "DVOA"], rows)
+
+        _write_csv(f"{year_dir}dvoa_adjusted_line_yards.csv", ["Team", "ALYards", "Adj Sack %"],
+                   [{"Team": team, "ALYards": round(float(rng.uniform(3.5, 5.5)), 2),
+                     "Adj Sack %": round(float(rng.uniform(4, 11)), 1)} for team in teams])
+        _write_csv(f"{year_dir}team_defense_dvoa.csv", ["TEAM", "DVOA", "PASS", "RUSH"],
+                   [{"TEAM": team, "DVOA": round(float(rng.normal(0, 12)), 1),
+                     "PASS": round(float(rng.normal(0, 15)), 1),
+                     "RUSH": round(float(rng.normal(0, 10)), 1)} for team in teams])
+
+    _write_csv(f"{data_dir}dvoa/dave.csv", ["TEAM", "Week", "TOT DAVE", "OFF DAVE", "DEF DAVE", "ST DAVE"],
+               [{"TEAM": team, "Week": 1, "TOT DAVE": round(float(rng.normal(0, 12)), 1),
+                 "OFF DAVE": round(float(rng.normal(0, 10)), 1), "DEF DAVE": round(float(rng.normal(0, 8)), 1),
+                 "ST DAVE": round(float(rng.normal(0, 2)), 1)} for team in teams])
+
+
+def _write_pff(data_dir: str, roster: List[tuple], rng: np.random.Generator):
+    """Write PFF passing grades for every rostered quarterback."""
+    _write_csv(f"{data_dir}pff/2024/passing_grades.csv", ["player", "position", "team_name", "attempts", "grades_pass"],
+               [{"player": name, "position": "QB", "team_name": team, "attempts": int(rng.integers(20, 600)),
+                 "grades_pass": round(float(rng.uniform(45, 92)), 1)}
+                for team, position, _, name in roster if position == "QB"])
+
+
+def _write_projections(data_dir: str, season: str, week: int, roster: List[tuple], rng: np.random.Generator):
+    """Write one week's projection file for each position; starters get the most volume."""
+    for position, columns in PROJECTION_COLUMNS.items():
+        rows = []
+        for team, player_position, depth, name in roster:
+            if player_position != position:
+                continue
+            volume = 1 / (depth + 1)
+            row = {"rank": len(rows) + 1, "id": len(rows), "player": name, "team": team, "pos": position,
+                   "game.week": week, "opp": ""}
+            for column in columns:
+                base = {"pass_att": 34, "pass_cmp": 22, "pass_yds": 240, "rush_att": 12, "rush_yds": 50,
+                        "rec_tgt": 7, "rec": 5, "rec_yds": 55}.get(column, 0.4)
+                row[column] = round(float(base * volume * rng.uniform(0.7, 1.3)), 1)
+            rows.append(row)
+        file_path = f"{data_dir}projections/{season}/week{week}/projections_{position.lower()}.csv"
+        _write_csv(file_path, ["rank", "id", "player", "team", "pos", "game.week", "opp"] + columns, rows)
+
+
+def _write_team_files(data_dir: str, teams: List[str], rng: np.random.Generator):
+    """Write pass rates and home field advantage."""
+    _write_csv(f"{data_dir}misc/play_rates.csv", ["Team", "OffPassRate", "DefPassRate"],
+               [{"Team": team, "OffPassRate": round(float(rng.uniform(50, 65)), 2),
+                 "DefPassRate": round(float(rng.uniform(50, 65)), 2)} for team in teams])
+    _write_csv(f"{data_dir}misc/home_adv.csv", ["Team", "Adv"],
+               [{"Team": team, "Adv": round(float(rng.uniform(0.5, 3)), 2)} for team in teams])
+
+
+def _write_matchups(data_dir: str, season: str, week: int, teams: List[str], games: int,
+                    rng: np.random.Generator):
+    """Write one week's matchups, reshuffling the teams whenever every team has played."""
+    matchups = []
+    while len(matchups) < games:
+        order = rng.permutation(teams)
+        for home, away in zip(order[::2], order[1::2]):
+            if len(matchups) == games:
+                break
+            dome = bool(rng.random() < 0.3)
+            spread = round(float(rng.normal(0, 5)) * 2) / 2
+            favorite_ml = -int(110 + abs(spread) * 25)
+            underdog_ml = int(100 + abs(spread) * 22)
+            matchups.append({
+                "home": str(home),
+                "away": str(away),
+                "weather": None if dome else round(float(rng.uniform(0, 60))),
+                "wind": None if dome else round(float(rng.uniform(0, 20))),
+                "temp": None if dome else round(float(rng.uniform(20, 90))),
+                "dome": "yes" if dome else "no",
+                "field": "turf" if rng.random() < 0.5 else "grass",
+                "betting_lines": {
+                    "home_ml": favorite_ml if spread < 0 else underdog_ml,
+                    "away_ml": underdog_ml if spread < 0 else favorite_ml,
+                    "home_spread": spread,
+                    "away_spread": -spread,
+                    "total": round(float(rng.uniform(37, 52)) * 2) / 2
+                }
+            })
+    file_path = f"{data_dir}matchups/{season}/matchups_week_{week}.yaml"
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as file:
+        yaml.safe_dump(matchups, file, sort_keys=False)
+
+
+def generate_league(output_dir: str, scale: LeagueScale, seed: int = 0) -> SyntheticLeague:
+    """
+    Write a synthetic league under output_dir.
+
+    Args:
+        output_dir (str): Directory to write into; it becomes the league's data_dir.
+        scale (LeagueScale): Size of the league.
+        seed (int): Seed for every generated value.
+
+    Returns:
+        SyntheticLeague: The data_dir (with trailing slash, as config.DATA_DIR) and league contents.
+    """
+    rng = np.random.default_rng(seed)
+    data_dir = os.path.join(output_dir, "")
+    teams = team_names(scale.teams)
+    roster = _roster(teams, scale)
+    seasons = [str(int(config.SEASON) - i) for i in range(scale.seasons)]
+    weeks = list(range(1, scale.weeks + 1))
+
+    _write_dvoa(data_dir, teams, roster, scale, rng)
+    _write_pff(data_dir, roster, rng)
+    _write_team_files(data_dir, teams, rng)
+    for season in seasons:
+        for week in weeks:
+            _write_projections(data_dir, season, week, roster, rng)
+            _write_matchups(data_dir, season, week, teams, scale.games_per_week, rng)
+    return SyntheticLeague(data_dir, teams, seasons, weeks, scale)
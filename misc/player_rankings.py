@@ -1,7 +1,14 @@
 import random
 import json
 import csv
-from typing import List, Dict, Tuple
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Journal entries written before the snapshot is rewritten and the journal emptied
+COMPACT_EVERY = 200
+# Key of the snapshot's journal sequence number, alongside the positions
+SEQUENCE_KEY = "_sequence"
+
 
 class Player:
     def __init__(self, name: str, wins: int = 0, losses: int = 0, opponents: List[str] = None):
@@ -9,10 +16,23 @@ class Player:
         self.wins = wins
         self.losses = losses
         self.opponents = opponents or []
+        self.opponent_names = set(self.opponents)
 
     def __repr__(self):
         return f"{self.name} ({self.wins}-{self.losses})"
 
+    def has_played(self, other: "Player") -> bool:
+        return other.name in self.opponent_names or self.name in other.opponent_names
+
+    def beat(self, loser: "Player"):
+        self.wins += 1
+        loser.losses += 1
+        self.opponents.append(loser.name)
+        self.opponent_names.add(loser.name)
+        loser.opponents.append(self.name)
+        loser.opponent_names.add(self.name)
+
+
 def load_players_from_csv(filename: str) -> List[Player]:
     players = []
     with open(filename, 'r', newline='') as csvfile:
@@ -26,6 +46,7 @@ def load_or_create_data(json_filename: str) -> Dict[str, List[Player]]:
     try:
         with open(json_filename, 'r') as f:
             data = json.load(f)
+        data.pop(SEQUENCE_KEY, None)
         return {position: [Player(**p) for p in players] for position, players in data.items()}
     except FileNotFoundError:
         positions = ['qb', 'rb', 'te', 'wr']
@@ -37,14 +58,97 @@ def load_or_create_data(json_filename: str) -> Dict[str, List[Player]]:
                 print(f"Warning: {position}.csv not found. Skipping this position.")
         return data
 
-def save_data(data: Dict[str, List[Player]], filename: str):
+def save_data(data: Dict[str, List[Player]], filename: str, sequence: int = 0):
+    """Atomically write a snapshot of every position's players."""
     serialized_data = {
-        position: [{"name": p.name, "wins": p.wins, "losses": p.losses, "opponents": p.opponents} 
+        position: [{"name": p.name, "wins": p.wins, "losses": p.losses, "opponents": p.opponents}
                    for p in players]
         for position, players in data.items()
     }
-    with open(filename, 'w') as f:
+    serialized_data[SEQUENCE_KEY] = sequence
+    temp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(temp_filename, 'w') as f:
         json.dump(serialized_data, f, indent=2)
+    os.replace(temp_filename, filename)
+
+
+class RankingStore:
+    """
+    Ranking data persisted as a JSON snapshot plus an append-only journal of results.
+
+    Each comparison appends one line to the journal instead of rewriting the
+    snapshot. Every COMPACT_EVERY results (and on close) the snapshot is rewritten
+    with the journal folded in and the journal is emptied. Journal entries carry a
+    sequence number and the snapshot records the last one it includes, so entries
+    already in the snapshot are skipped if a crash leaves them behind. A journal
+    found on load is compacted straight away, so a line torn by a crash is dropped
+    rather than continued by the next result.
+    """
+
+    def __init__(self, filename: str, journal_filename: Optional[str] = None, compact_every: int = COMPACT_EVERY):
+        self.filename = filename
+        self.journal_filename = journal_filename or f"{os.path.splitext(filename)[0]}.journal"
+        self.compact_every = compact_every
+        self.data = load_or_create_data(filename)
+        self.sequence = self._snapshot_sequence()
+        self.pending = 0
+        self._index = {position: {player.name: player for player in players} for position, players in self.data.items()}
+        replayed = self._replay()
+        self._journal = open(self.journal_filename, 'a')
+        # Fold any replayed journal into the snapshot, which also drops a line torn by a crash
+        # so the next result is not appended onto it
+        if replayed:
+            self.compact()
+
+    def _snapshot_sequence(self) -> int:
+        try:
+            with open(self.filename, 'r') as f:
+                return json.load(f).get(SEQUENCE_KEY, 0)
+        except FileNotFoundError:
+            return 0
+
+    def _replay(self) -> bool:
+        """Apply the journal's results not yet in the snapshot; return whether it had any lines."""
+        try:
+            with open(self.journal_filename, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return False
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                print(f"Warning: skipping unreadable journal entry: {line.strip()}")
+                continue
+            if entry["sequence"] <= self.sequence:
+                continue
+            players = self._index[entry["position"]]
+            players[entry["winner"]].beat(players[entry["loser"]])
+            self.sequence = entry["sequence"]
+            self.pending += 1
+        return bool(lines)
+
+    def record(self, position: str, winner: Player, loser: Player):
+        winner.beat(loser)
+        self.sequence += 1
+        self._journal.write(json.dumps({"sequence": self.sequence, "position": position,
+                                        "winner": winner.name, "loser": loser.name}) + "\n")
+        self._journal.flush()
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        save_data(self.data, self.filename, self.sequence)
+        self._journal.close()
+        self._journal = open(self.journal_filename, 'w')
+        self.pending = 0
+
+    def close(self):
+        if self.pending:
+            self.compact()
+        self._journal.close()
+
 
 def get_winner_input(player1: Player, player2: Player) -> Player:
     while True:
@@ -56,33 +160,42 @@ def get_winner_input(player1: Player, player2: Player) -> Player:
         else:
             print("Invalid input. Please enter either 1 or 2.")
 
-def match_players(players: List[Player]) -> List[Tuple[Player, Player]]:
+def match_players(players: Iterable[Player]) -> List[Tuple[Player, Player]]:
+    """
+    Pair players for a Swiss round: neighbours in the standings first, then each
+    leftover player with the next-ranked leftover they have not played.
+
+    Leftovers are kept in a linked list over their standings order, so paired
+    players are unlinked in O(1) and each search only visits unpaired players.
+    """
     sorted_players = sorted(players, key=lambda x: (-x.wins, x.losses))
     matchups = []
-    used_players = set()
-
-    for i in range(0, len(sorted_players), 2):
-        if i + 1 < len(sorted_players):
-            player1, player2 = sorted_players[i], sorted_players[i + 1]
-            if player2.name not in player1.opponents and player1.name not in player2.opponents:
-                matchups.append((player1, player2))
-                used_players.add(player1)
-                used_players.add(player2)
-
-    remaining_players = [p for p in sorted_players if p not in used_players]
-    while len(remaining_players) >= 2:
-        player1 = remaining_players.pop(0)
-        for i, player2 in enumerate(remaining_players):
-            if player2.name not in player1.opponents and player1.name not in player2.opponents:
-                matchups.append((player1, player2))
-                remaining_players.pop(i)
-                break
+    paired = [False] * len(sorted_players)
+
+    for i in range(0, len(sorted_players) - 1, 2):
+        player1, player2 = sorted_players[i], sorted_players[i + 1]
+        if not player1.has_played(player2):
+            matchups.append((player1, player2))
+            paired[i] = paired[i + 1] = True
+
+    remaining = [i for i, is_paired in enumerate(paired) if not is_paired]
+    following = {i: j for i, j in zip(remaining, remaining[1:])}
+    head = remaining[0] if remaining else None
+    while head is not None and head in following:
+        player1 = sorted_players[head]
+        previous, candidate = head, following[head]
+        while candidate is not None and player1.has_played(sorted_players[candidate]):
+            previous, candidate = candidate, following.get(candidate)
+        if candidate is not None:
+            matchups.append((player1, sorted_players[candidate]))
+            following[previous] = following.get(candidate)
+        head = following.get(head)
 
     return matchups
 
-def play_round(players: List[Player], data: Dict[str, List[Player]], filename: str):
+def play_round(players: List[Player], position: str, store: RankingStore):
     matchups = match_players(players)
-    
+
     if not matchups:
         print("No more valid matchups available. Rankings are complete.")
         return False
@@ -92,40 +205,39 @@ def play_round(players: List[Player], data: Dict[str, List[Player]], filename: s
         winner = get_winner_input(player1, player2)
         loser = player2 if winner == player1 else player1
 
-        winner.wins += 1
-        loser.losses += 1
-        winner.opponents.append(loser.name)
-        loser.opponents.append(winner.name)
-
-        save_data(data, filename)
+        store.record(position, winner, loser)
         print(f"{winner.name} wins!")
 
     return True
 
 def main():
     filename = "nfl_rankings.json"
-    data = load_or_create_data(filename)
-
-    while True:
-        position = input("Enter the position to rank (qb/rb/te/wr) or 'q' to quit: ").strip().lower()
-        if position == 'q':
-            break
+    store = RankingStore(filename)
+    data = store.data
 
-        if position not in data:
-            print(f"No data found for {position}. Please make sure {position}.csv exists.")
-            continue
+    try:
+        while True:
+            position = input("Enter the position to rank (qb/rb/te/wr) or 'q' to quit: ").strip().lower()
+            if position == 'q':
+                break
 
-        players = data[position]
-        print(f"\nCurrent rankings for {position.upper()}:")
-        for player in sorted(players, key=lambda x: (-x.wins, x.losses)):
-            print(player)
+            if position not in data:
+                print(f"No data found for {position}. Please make sure {position}.csv exists.")
+                continue
 
-        if play_round(players, data, filename):
-            print(f"\nUpdated rankings for {position.upper()}:")
+            players = data[position]
+            print(f"\nCurrent rankings for {position.upper()}:")
             for player in sorted(players, key=lambda x: (-x.wins, x.losses)):
                 print(player)
-        else:
-            print(f"Rankings for {position.upper()} are complete.")
+
+            if play_round(players, position, store):
+                print(f"\nUpdated rankings for {position.upper()}:")
+                for player in sorted(players, key=lambda x: (-x.wins, x.losses)):
+                    print(player)
+            else:
+                print(f"Rankings for {position.upper()} are complete.")
+    finally:
+        store.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
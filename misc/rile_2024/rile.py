@@ -1,5 +1,231 @@
 import random
 
+import numpy as np
+
+OFFENSIVE_STATS = ['qb_rating', 'qb_epa_per_play', 'rb_yards_per_carry', 'wr_yards_per_reception',
+                   'ol_pass_block_win_rate', 'ol_run_block_win_rate', 'off_third_down_rate', 'off_red_zone_efficiency']
+DEFENSIVE_STATS = ['def_dvoa', 'def_pressure_rate', 'def_coverage_rating']
+
+# Drive outcomes, indexed by the outcome codes DriveModel.sample_drives returns
+OUTCOMES = ['Touchdown', 'Field Goal', 'Missed Field Goal', 'Punt', 'Turnover']
+TOUCHDOWN, FIELD_GOAL, MISSED_FIELD_GOAL, PUNT, TURNOVER = range(len(OUTCOMES))
+
+FG_ENDING_YARDS = np.arange(65, 86)  # Field goal range
+AVG_DRIVE_LENGTH = 30  # Average NFL drive length
+AVG_PLAYS_PER_DRIVE = 6.5  # NFL average
+TOUCHDOWN_POINTS = 6 + (0.94 * 1)  # TD + extra point (94% success rate)
+
+# DriveModel's outcome table has one entry per (outcome, field goal ending yard): touchdown,
+# field goal made at each ending yard, missed at each, punt, turnover. The layout is the same
+# for every model, so everything that depends on the entry is looked up rather than branched on.
+_KICKS = len(FG_ENDING_YARDS)
+ENTRY_OUTCOMES = np.array([TOUCHDOWN] + [FIELD_GOAL] * _KICKS + [MISSED_FIELD_GOAL] * _KICKS + [PUNT, TURNOVER])
+ENTRY_FG_DISTANCES = np.concatenate(([0], 100 - FG_ENDING_YARDS + 17, 100 - FG_ENDING_YARDS + 17, [0, 0]))
+# Ending yard of scoring and kicking drives; punts and turnovers end where their yards gained take them
+ENTRY_ENDING_YARDS = np.concatenate(([100], FG_ENDING_YARDS, FG_ENDING_YARDS, [0, 0]))
+ENTRY_POINTS = np.where(ENTRY_OUTCOMES == TOUCHDOWN, TOUCHDOWN_POINTS, np.where(ENTRY_OUTCOMES == FIELD_GOAL, 3, 0))
+ENTRY_PUNTS = (ENTRY_OUTCOMES == PUNT).astype(np.int64)
+ENTRY_TURNOVERS = (ENTRY_OUTCOMES == TURNOVER).astype(np.int64)
+# A missed field goal gives the ball back at the spot of the kick, or the 20 if that is farther
+ENTRY_MISS_STARTS = np.where(ENTRY_OUTCOMES == MISSED_FIELD_GOAL, np.minimum(100 - ENTRY_FG_DISTANCES + 10, 80), 0)
+
+
+def field_goal_probability(distance, kicker_accuracy):
+    # Linear decrease in probability as distance increases, adjusted by the kicker's accuracy
+    return np.clip(1.1 - distance / 60, 0, 1) * (0.5 + 0.5 * kicker_accuracy)
+
+
+def rounded_uniform_probabilities(scale, low, high):
+    # Exact distribution of round(scale * U) for U uniform on [low, high]
+    values = np.arange(round(scale * low), round(scale * high) + 1)
+    upper = np.minimum(high, (values + 0.5) / scale)
+    lower = np.maximum(low, (values - 0.5) / scale)
+    return values, np.maximum(upper - lower, 0) / (high - low)
+
+
+class AliasSampler:
+    """Walker/Vose alias table: draws from a fixed discrete distribution in O(1) per sample."""
+
+    __slots__ = ['values', 'prob', 'alias', 'choices']
+
+    def __init__(self, values, probabilities):
+        probabilities = np.asarray(probabilities, dtype=float)
+        size = len(probabilities)
+        scaled = probabilities / probabilities.sum() * size
+        self.values = np.asarray(values)
+        self.prob = np.ones(size)
+        self.alias = np.arange(size)
+
+        small = [i for i in range(size) if scaled[i] < 1]
+        large = [i for i in range(size) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # choices[2 * i] is column i's own value and choices[2 * i + 1] its alias's
+        self.choices = np.stack((self.values, self.values[self.alias]), axis=1).ravel()
+
+    def sample(self, n, rng):
+        # One uniform per draw: the integer part picks the column, the fraction decides column vs alias
+        draws = rng.random(n) * len(self.prob)
+        column = np.floor(draws)
+        index = column.astype(np.int64)
+        return self.choices[2 * index + (draws - column >= self.prob[index])]
+
+
+class StackedAliasSampler:
+    """
+    Alias tables of several distributions in one flat array, so every draw can use a different one.
+
+    Row r holds distribution r in columns 0..sizes[r] - 1 (the rest is padding that is
+    never drawn), so a draw is the same handful of lookups whichever row it uses.
+    """
+
+    __slots__ = ['prob', 'choices', 'sizes', 'width']
+
+    def __init__(self, samplers):
+        self.sizes = np.array([len(sampler.prob) for sampler in samplers], dtype=float)
+        self.width = int(self.sizes.max())
+        self.prob = np.ones((len(samplers), self.width))
+        self.choices = np.zeros((len(samplers), 2 * self.width),
+                                dtype=np.result_type(*(sampler.values for sampler in samplers)))
+        for row, sampler in enumerate(samplers):
+            self.prob[row, :len(sampler.prob)] = sampler.prob
+            self.choices[row, :len(sampler.choices)] = sampler.choices
+        self.prob, self.choices = self.prob.ravel(), self.choices.ravel()
+
+    def sample(self, rows, rng):
+        # rows picks the distribution of each draw; otherwise the same as AliasSampler.sample
+        draws = rng.random(len(rows)) * self.sizes[rows]
+        column = np.floor(draws)
+        position = rows * self.width + column.astype(np.int64)
+        return self.choices[2 * position + (draws - column >= self.prob[position])]
+
+
+class DriveSamples:
+    """Arrays describing a batch of simulated drives, one entry per drive."""
+
+    __slots__ = ['outcomes', 'points', 'num_plays', 'time_used', 'starting_yards', 'yards_gained',
+                 'ending_yards', 'next_possession_starts', 'fg_distances']
+
+    def __init__(self, outcomes, points, num_plays, time_used, starting_yards, yards_gained,
+                 ending_yards, next_possession_starts, fg_distances):
+        self.outcomes = outcomes  # Codes into OUTCOMES
+        self.points = points
+        self.num_plays = num_plays
+        self.time_used = time_used
+        self.starting_yards = starting_yards
+        self.yards_gained = yards_gained
+        self.ending_yards = ending_yards
+        self.next_possession_starts = next_possession_starts  # 0 after a score
+        self.fg_distances = fg_distances  # 0 when no field goal was attempted
+
+
+class DriveModel:
+    """
+    Frozen drive model for one offense against one defense.
+
+    Built by NFLDrivePredictor.compile. The drive score, the outcome table (touchdown,
+    field goal made or missed at each ending yard, punt, turnover) and the yards and
+    plays distributions are all computed once, so sampling a drive is a handful of
+    alias-table lookups.
+    """
+
+    __slots__ = ['drive_score', 'pace_of_play', 'kicker_accuracy', 'outcome_weights',
+                 '_drive_sampler', '_yards_sampler', '_plays_sampler']
+
+    def __init__(self, drive_score, pace_of_play, kicker_accuracy):
+        self.drive_score = max(0, min(drive_score, 1))
+        self.pace_of_play = pace_of_play
+        self.kicker_accuracy = kicker_accuracy
+
+        td_prob = self.drive_score * 0.6  # Max 60% chance of TD
+        fg_prob = (1 - td_prob) * 0.4  # Max 40% chance of FG if not TD
+        punt_prob = 1 - td_prob - fg_prob
+        self.outcome_weights = (td_prob, fg_prob, punt_prob * 0.8, punt_prob * 0.2)
+
+        # One table entry per (outcome, field goal ending yard), laid out as ENTRY_OUTCOMES
+        fg_distances = 100 - FG_ENDING_YARDS + 17  # Add 17 yards for the end zone and holder
+        fg_made = field_goal_probability(fg_distances, kicker_accuracy)
+        fg_attempt = fg_prob / len(FG_ENDING_YARDS)
+        probabilities = np.concatenate(([td_prob], fg_attempt * fg_made, fg_attempt * (1 - fg_made),
+                                        [punt_prob * 0.8, punt_prob * 0.2]))
+        self._drive_sampler = AliasSampler(np.arange(len(probabilities)), probabilities)
+
+        self._yards_sampler = AliasSampler(*rounded_uniform_probabilities(
+            AVG_DRIVE_LENGTH * (1 + self.drive_score), 0.5, 1.5))
+        plays, plays_probs = rounded_uniform_probabilities(AVG_PLAYS_PER_DRIVE * (1 + self.drive_score), 0.8, 1.2)
+        self._plays_sampler = AliasSampler(np.maximum(plays, 1), plays_probs)
+
+    def sample_drives(self, n, starting_yards, rng=None):
+        """
+        Simulate n drives at once.
+
+        starting_yards: the offense's starting yard line, one value for every drive or an array of n
+        rng: numpy Generator (a new one is created if not given)
+        """
+        rng = rng or np.random.default_rng()
+        starting_yards = np.broadcast_to(np.asarray(starting_yards, dtype=np.int64), (n,))
+        entries = self._drive_sampler.sample(n, rng)
+        yards = self._yards_sampler.sample(n, rng)
+        num_plays = self._plays_sampler.sample(n, rng)
+        return _drive_samples(entries, yards, num_plays, self.pace_of_play, starting_yards, rng)
+
+
+class DriveModelSet:
+    """
+    Several frozen DriveModels stacked so one call samples each drive from its own model.
+
+    Lets a batch of games between different teams advance together: every drive
+    names the model (offense vs defense) it is drawn from.
+    """
+
+    __slots__ = ['models', 'pace_of_play', 'kicker_accuracy', '_drive_sampler', '_yards_sampler', '_plays_sampler']
+
+    def __init__(self, models):
+        self.models = tuple(models)
+        self.pace_of_play = np.array([model.pace_of_play for model in self.models], dtype=float)
+        self.kicker_accuracy = np.array([model.kicker_accuracy for model in self.models], dtype=float)
+        self._drive_sampler = StackedAliasSampler([model._drive_sampler for model in self.models])
+        self._yards_sampler = StackedAliasSampler([model._yards_sampler for model in self.models])
+        self._plays_sampler = StackedAliasSampler([model._plays_sampler for model in self.models])
+
+    def __len__(self):
+        return len(self.models)
+
+    def sample_drives(self, models, starting_yards, rng=None):
+        """
+        Simulate one drive for every entry of models at once.
+
+        models: index into self.models of each drive's model
+        starting_yards: the offense's starting yard line, one value for every drive or one per drive
+        rng: numpy Generator (a new one is created if not given)
+        """
+        rng = rng or np.random.default_rng()
+        models = np.asarray(models, dtype=np.int64)
+        starting_yards = np.broadcast_to(np.asarray(starting_yards, dtype=np.int64), models.shape)
+        entries = self._drive_sampler.sample(models, rng)
+        yards = self._yards_sampler.sample(models, rng)
+        num_plays = self._plays_sampler.sample(models, rng)
+        return _drive_samples(entries, yards, num_plays, self.pace_of_play[models], starting_yards, rng)
+
+
+def _drive_samples(entries, yards, num_plays, pace_of_play, starting_yards, rng):
+    """Turn sampled outcome table entries, drive yards and play counts into DriveSamples."""
+    punts, turnovers = ENTRY_PUNTS[entries], ENTRY_TURNOVERS[entries]
+    ending_yards = ENTRY_ENDING_YARDS[entries] + (punts + turnovers) * np.minimum(starting_yards + yards, 100)
+    # Punts net 35-45 yards and turnovers are returned 0-10 yards; one draw serves either
+    returns = rng.integers(0, 11, len(entries))
+    next_starts = (ENTRY_MISS_STARTS[entries]
+                   + punts * np.maximum(20, np.minimum(135 - ending_yards + returns, 80))
+                   + turnovers * np.minimum(ending_yards + returns, 80))
+    return DriveSamples(ENTRY_OUTCOMES[entries], ENTRY_POINTS[entries], num_plays, num_plays * pace_of_play,
+                        starting_yards, ending_yards - starting_yards, ending_yards, next_starts,
+                        ENTRY_FG_DISTANCES[entries])
+
+
 class NFLDrivePredictor:
     def __init__(self):
         self.stats = {
@@ -31,9 +257,11 @@ class NFLDrivePredictor:
             'def_pressure_rate': -0.05,
             'def_coverage_rating': -0.05
         }
+        self._models = {}
 
     def normalize_stat(self, stat, value, max_value):
         self.stats[stat] = max(0, min(value / max_value, 1))
+        self._models.clear()
 
     def set_offensive_stats(self, qb_rating, qb_epa_per_play, rb_ypc, wr_ypr, 
                             ol_pbwr, ol_rbwr, third_down_rate, rz_efficiency, pace_of_play, kicker_accuracy):
@@ -46,6 +274,7 @@ class NFLDrivePredictor:
         self.normalize_stat('off_third_down_rate', third_down_rate, 100)
         self.normalize_stat('off_red_zone_efficiency', rz_efficiency, 100)
         self.stats['pace_of_play'] = pace_of_play  # Seconds per play, not normalized
+        self._models.clear()
         self.normalize_stat('kicker_accuracy', kicker_accuracy, 100)  # Kicker accuracy percentage
 
     def set_defensive_stats(self, def_dvoa, def_pressure_rate, def_coverage_rating):
@@ -74,20 +303,35 @@ class NFLDrivePredictor:
         remaining_seconds = int(seconds % 60)
         return f"{minutes}:{remaining_seconds:02d}"
 
-    def predict_drive_outcome(self, starting_yard):
-        drive_score = sum(self.stats[stat] * self.weights[stat] for stat in self.stats if stat not in ['pace_of_play', 'kicker_accuracy'])
-        
+    def drive_score(self, defense=None):
+        # Offensive stats come from this team, defensive stats from the opponent (or this team if none given)
+        defense = defense or self
+        drive_score = sum(self.stats[stat] * self.weights[stat] for stat in OFFENSIVE_STATS)
+        drive_score += sum(defense.stats[stat] * defense.weights[stat] for stat in DEFENSIVE_STATS)
+
         # Normalize drive score to be between 0 and 1
-        drive_score = max(0, min(drive_score, 1))
-        
-        # Determine drive outcome probabilities
-        td_prob = drive_score * 0.6  # Max 60% chance of TD
-        fg_prob = (1 - td_prob) * 0.4  # Max 40% chance of FG if not TD
-        punt_prob = 1 - td_prob - fg_prob
+        return max(0, min(drive_score, 1))
+
+    def compile(self, defense=None):
+        # Frozen drive model against this defense, rebuilt only when either team's stats change
+        defense = defense or self
+        key = tuple(defense.stats[stat] for stat in DEFENSIVE_STATS)
+        model = self._models.get(key)
+        if model is None:
+            model = self._models[key] = DriveModel(self.drive_score(defense), self.stats['pace_of_play'],
+                                                   self.stats['kicker_accuracy'])
+        return model
+
+    def sample_drives(self, n, starting_yards, defense=None, rng=None):
+        return self.compile(defense).sample_drives(n, starting_yards, rng)
+
+    def predict_drive_outcome(self, starting_yard, defense=None):
+        model = self.compile(defense)
+        drive_score = model.drive_score
         
         # Simulate drive outcome
         outcome = random.choices(['Touchdown', 'Field Goal Attempt', 'Punt', 'Turnover'], 
-                                 weights=[td_prob, fg_prob, punt_prob * 0.8, punt_prob * 0.2])[0]
+                                 weights=model.outcome_weights)[0]
         
         # Calculate yards gained and ending yard
         if outcome == 'Touchdown':
@@ -100,22 +344,20 @@ class NFLDrivePredictor:
             fg_made = self.simulate_field_goal(fg_distance)
             outcome = 'Field Goal' if fg_made else 'Missed Field Goal'
         else:
-            avg_drive_length = 30  # Average NFL drive length
-            yards_gained = max(0, min(round(avg_drive_length * (1 + drive_score) * random.uniform(0.5, 1.5)), 100 - starting_yard))
+            yards_gained = max(0, min(round(AVG_DRIVE_LENGTH * (1 + drive_score) * random.uniform(0.5, 1.5)), 100 - starting_yard))
             ending_yard = starting_yard + yards_gained
 
         # Calculate projected points
         if outcome == 'Touchdown':
-            points = 6 + (0.94 * 1)  # TD + extra point (94% success rate)
+            points = TOUCHDOWN_POINTS
         elif outcome == 'Field Goal':
             points = 3
         else:
             points = 0
         
         # Calculate number of plays and time used
-        avg_plays_per_drive = 6.5  # NFL average
         play_variation = random.uniform(0.8, 1.2)  # Add some randomness
-        num_plays = max(1, round(avg_plays_per_drive * play_variation * (1 + drive_score)))
+        num_plays = max(1, round(AVG_PLAYS_PER_DRIVE * play_variation * (1 + drive_score)))
         
         time_used = num_plays * self.stats['pace_of_play']
         
@@ -132,10 +374,9 @@ class NFLDrivePredictor:
 
         return outcome, points, num_plays, time_used, starting_yard, yards_gained, ending_yard, next_possession_start, fg_distance if 'Field Goal' in outcome else None
 
-    def simulate_drive(self, starting_yard):
-        outcome, points, num_plays, time_used, start_yard, yards_gained, end_yard, next_start, fg_distance = self.predict_drive_outcome(starting_yard)
-        drive_quality = sum(self.stats[stat] * self.weights[stat] for stat in self.stats if stat not in ['pace_of_play', 'kicker_accuracy'])
-        drive_quality = max(0, min(drive_quality, 1))  # Normalize to 0-1
+    def simulate_drive(self, starting_yard, defense=None):
+        outcome, points, num_plays, time_used, start_yard, yards_gained, end_yard, next_start, fg_distance = self.predict_drive_outcome(starting_yard, defense)
+        drive_quality = self.compile(defense).drive_score
         
         print(f"Drive Quality: {drive_quality:.2f}")
         print(f"Starting Field Position: {self.format_field_position(start_yard)}")
@@ -152,29 +393,29 @@ class NFLDrivePredictor:
             print(f"Next Possession Starts At: {self.format_field_position(100 - next_start)}")
 
 # Example usage
-predictor = NFLDrivePredictor()
-
-# Set offensive stats
-predictor.set_offensive_stats(
-    qb_rating=105.0,
-    qb_epa_per_play=0.25,
-    rb_ypc=4.5,
-    wr_ypr=12.0,
-    ol_pbwr=65,
-    ol_rbwr=60,
-    third_down_rate=45,
-    rz_efficiency=60,
-    pace_of_play=28,  # Average seconds per play
-    kicker_accuracy=85  # 85% field goal accuracy
-)
-
-# Set defensive stats
-predictor.set_defensive_stats(
-    def_dvoa=-10,
-    def_pressure_rate=30,
-    def_coverage_rating=75
-)
-
-# Simulate a drive starting from the team's own 25-yard line
-predictor.simulate_drive(25)
+if __name__ == "__main__":
+    predictor = NFLDrivePredictor()
+
+    # Set offensive stats
+    predictor.set_offensive_stats(
+        qb_rating=105.0,
+        qb_epa_per_play=0.25,
+        rb_ypc=4.5,
+        wr_ypr=12.0,
+        ol_pbwr=65,
+        ol_rbwr=60,
+        third_down_rate=45,
+        rz_efficiency=60,
+        pace_of_play=28,  # Average seconds per play
+        kicker_accuracy=85  # 85% field goal accuracy
+    )
+
+    # Set defensive stats
+    predictor.set_defensive_stats(
+        def_dvoa=-10,
+        def_pressure_rate=30,
+        def_coverage_rating=75
+    )
 
+    # Simulate a drive starting from the team's own 25-yard line
+    predictor.simulate_drive(25)
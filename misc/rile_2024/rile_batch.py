@@ -0,0 +1,264 @@
+"""
+Vectorized batch version of NFLGameSimulator.
+
+BatchGameSimulator plays many games at once, holding score, clock, quarter,
+possession and field position for every game in NumPy arrays and advancing all of
+them one drive per step. Drives are drawn in bulk from each offense's compiled
+DriveModel, so drive quality is computed once, against the defense the offense
+actually faces, and nothing is printed. simulate_games stacks a whole slate's
+models into one DriveModelSet and plays every game of every matchup together, in
+blocks of GAMES_PER_BLOCK games, instead of looping over the matchups.
+
+Team inputs can come from NFLDrivePredictor stats (from_predictors) or from a
+projection-model Matchup (from_matchup), in which case each side's drive quality
+is solved so the simulated scoring matches the Matchup's projected points.
+"""
+
+import numpy as np
+
+from rile import (AVG_PLAYS_PER_DRIVE, FG_ENDING_YARDS, TOUCHDOWN, DriveModel, DriveModelSet, NFLDrivePredictor,
+                  field_goal_probability)
+
+QUARTER_SECONDS = 15 * 60
+TOUCHBACK_YARD = 25
+
+# League-average inputs used when a Matchup does not provide them; the pace gives
+# roughly ten drives per team, in line with the league
+DEFAULT_PACE_OF_PLAY = 18
+DEFAULT_KICKER_ACCURACY = 0.85
+# Points of each drive outcome (indexed by outcome code) before the extra point
+SCORE_POINTS = np.array([6, 3, 0, 0, 0])
+# Games played together by _play_games; small enough that a block's arrays stay in cache
+GAMES_PER_BLOCK = 1 << 15
+
+
+class SimulationResult:
+    """Final scores of a batch of simulated games between two teams."""
+
+    __slots__ = ['team1', 'team2', 'team1_scores', 'team2_scores']
+
+    def __init__(self, team1, team2, team1_scores, team2_scores):
+        self.team1 = team1
+        self.team2 = team2
+        self.team1_scores = team1_scores
+        self.team2_scores = team2_scores
+
+    @property
+    def margins(self):
+        """Team 1's score minus team 2's score in every game."""
+        return self.team1_scores - self.team2_scores
+
+    @property
+    def totals(self):
+        """Combined score in every game."""
+        return self.team1_scores + self.team2_scores
+
+    def win_probability(self):
+        """Team 1's win probability, counting ties as half a win."""
+        margins = self.margins
+        return float(np.mean(margins > 0) + 0.5 * np.mean(margins == 0))
+
+    def margin_distribution(self):
+        """Return (margins, probabilities) for every margin that occurred."""
+        values, counts = np.unique(self.margins, return_counts=True)
+        return values, counts / counts.sum()
+
+    def total_distribution(self):
+        """Return (totals, probabilities) for every total that occurred."""
+        values, counts = np.unique(self.totals, return_counts=True)
+        return values, counts / counts.sum()
+
+
+class BatchGameSimulator:
+    """Simulates many games between two teams at once."""
+
+    def __init__(self, team1_name, team2_name, drive_scores, paces_of_play, kicker_accuracies):
+        """
+        drive_scores: (team 1 on offense, team 2 on offense) drive quality, each 0-1
+        paces_of_play: seconds per play for each team
+        kicker_accuracies: normalized (0-1) kicker accuracy for each team
+        """
+        self.team1_name = team1_name
+        self.team2_name = team2_name
+        self.models = tuple(DriveModel(*team) for team in zip(drive_scores, paces_of_play, kicker_accuracies))
+
+    @classmethod
+    def from_models(cls, team1_name, team1_model, team2_name, team2_model):
+        """Build a simulator from each offense's compiled DriveModel."""
+        simulator = cls.__new__(cls)
+        simulator.team1_name = team1_name
+        simulator.team2_name = team2_name
+        simulator.models = (team1_model, team2_model)
+        return simulator
+
+    @classmethod
+    def from_predictors(cls, team1_name, team1_predictor, team2_name, team2_predictor):
+        """Build a simulator from two teams' NFLDrivePredictor stats."""
+        return cls.from_models(team1_name, team1_predictor.compile(team2_predictor),
+                               team2_name, team2_predictor.compile(team1_predictor))
+
+    @classmethod
+    def from_matchup(cls, matchup, paces_of_play=(DEFAULT_PACE_OF_PLAY, DEFAULT_PACE_OF_PLAY),
+                     kicker_accuracies=(DEFAULT_KICKER_ACCURACY, DEFAULT_KICKER_ACCURACY)):
+        """Build a home (team 1) vs away (team 2) simulator from a projection-model Matchup."""
+        home_points, away_points = matchup.project_points()
+        drive_scores = drive_scores_for_points((home_points, away_points), paces_of_play, kicker_accuracies)
+        return cls(matchup.home_team.team_name, matchup.away_team.team_name,
+                   drive_scores, paces_of_play, kicker_accuracies)
+
+    @property
+    def drive_scores(self):
+        return np.array([model.drive_score for model in self.models])
+
+    def simulate(self, n, seed=None):
+        """Simulate n games and return their final scores."""
+        return self._simulate(n, np.random.default_rng(seed))
+
+    def _simulate(self, n, rng):
+        """Play n games between the two teams."""
+        scores = _play_games(DriveModelSet(self.models), np.zeros(n, dtype=np.int64), rng)
+        return SimulationResult(self.team1_name, self.team2_name, scores[:, 0], scores[:, 1])
+
+
+def simulate_games(simulators, n, seed=None):
+    """
+    Simulate n games for each simulator from one random stream.
+
+    Every simulator's models are stacked into one DriveModelSet and all of the
+    len(simulators) * n games are played together.
+
+    Returns:
+        list of SimulationResult, one per simulator.
+    """
+    models = DriveModelSet([model for simulator in simulators for model in simulator.models])
+    matchups = np.repeat(np.arange(len(simulators), dtype=np.int64), n)
+    scores = _play_games(models, matchups, np.random.default_rng(seed)).reshape(len(simulators), n, 2)
+    return [SimulationResult(simulator.team1_name, simulator.team2_name, game_scores[:, 0], game_scores[:, 1])
+            for simulator, game_scores in zip(simulators, scores)]
+
+
+def _play_games(models, matchups, rng):
+    """
+    Play a batch of games, GAMES_PER_BLOCK at a time.
+
+    models: DriveModelSet holding (team 1 on offense, team 2 on offense) for each matchup in turn
+    matchups: each game's matchup, so its teams' models are 2 * matchup and 2 * matchup + 1
+
+    Returns:
+        (games, 2) array of team 1 and team 2 scores.
+    """
+    scores = np.zeros((len(matchups), 2), dtype=np.int64)
+    for start in range(0, len(matchups), GAMES_PER_BLOCK):
+        block = slice(start, start + GAMES_PER_BLOCK)
+        scores[block] = _play_block(models, matchups[block], rng)
+    return scores
+
+
+def _play_block(models, matchups, rng):
+    """
+    Play games advancing every unfinished one a drive per step, dropping finished games from the arrays.
+
+    Possession alternates after every drive; the team that did not receive the
+    opening kickoff receives the second-half kickoff.
+    """
+    n = len(matchups)
+    scores = np.zeros((n, 2), dtype=np.int64)
+    games = np.arange(n)
+    team1_score = np.zeros(n, dtype=np.int64)
+    team2_score = np.zeros(n, dtype=np.int64)
+    first_model = 2 * np.asarray(matchups, dtype=np.int64)
+    quarter = np.ones(n, dtype=np.int64)
+    time_left = np.full(n, float(QUARTER_SECONDS))
+    receiving = rng.integers(0, 2, n)
+    possession = receiving.copy()
+    field_position = np.full(n, TOUCHBACK_YARD, dtype=np.int64)
+
+    while games.size:
+        drive_models = first_model + possession
+        drives = models.sample_drives(drive_models, field_position, rng)
+
+        extra_point = rng.random(games.size) < models.kicker_accuracy[drive_models]
+        points = SCORE_POINTS[drives.outcomes] + ((drives.outcomes == TOUCHDOWN) & extra_point)
+        team2_score += points * possession
+        team1_score += points * (1 - possession)
+        time_left -= np.minimum(drives.time_used, time_left)
+        # A score (next start 0) is followed by a touchback
+        next_starts = drives.next_possession_starts
+        field_position = 100 - next_starts - (100 - TOUCHBACK_YARD) * (next_starts == 0)
+        possession = 1 - possession
+
+        expired = time_left == 0
+        if not expired.any():
+            continue
+        game_over = expired & (quarter >= 4)
+        next_quarter = expired & ~game_over
+        quarter[next_quarter] += 1
+        time_left[next_quarter] = QUARTER_SECONDS
+        halftime = next_quarter & (quarter == 3)
+        possession[halftime] = 1 - receiving[halftime]
+        field_position[halftime] = TOUCHBACK_YARD
+
+        if game_over.any():
+            scores[games[game_over], 0] = team1_score[game_over]
+            scores[games[game_over], 1] = team2_score[game_over]
+            playing = ~game_over
+            games, team1_score, team2_score, first_model = (
+                games[playing], team1_score[playing], team2_score[playing], first_model[playing])
+            quarter, time_left, receiving, possession, field_position = (
+                quarter[playing], time_left[playing], receiving[playing], possession[playing],
+                field_position[playing])
+
+    return scores
+
+
+def expected_points_per_drive(drive_score, kicker_accuracy):
+    """Expected points of one drive under the drive outcome model."""
+    td_prob = drive_score * 0.6
+    fg_prob = (1 - td_prob) * 0.4
+    fg_prob_made = np.mean(field_goal_probability(100 - FG_ENDING_YARDS + 17, kicker_accuracy))
+    return td_prob * (6 + kicker_accuracy) + fg_prob * fg_prob_made * 3
+
+
+def drive_scores_for_points(points, paces_of_play, kicker_accuracies, iterations=20):
+    """
+    Solve each team's drive quality so its expected game score matches target points.
+
+    A game is modeled as 60 minutes split into alternating drives whose length
+    depends on both teams' drive quality and pace, so the two scores are solved
+    together by fixed-point iteration. The drive that runs out each quarter's clock
+    still counts, which adds about one drive per team. Targets beyond what the drive
+    model can produce are clipped to drive quality 0 or 1.
+    """
+    points = np.asarray(points, dtype=float)
+    paces = np.asarray(paces_of_play, dtype=float)
+    kickers = np.asarray(kicker_accuracies, dtype=float)
+    grid = np.linspace(0, 1, 1001)
+    drive_scores = np.full(2, 0.5)
+    for _ in range(iterations):
+        drive_seconds = AVG_PLAYS_PER_DRIVE * (1 + drive_scores) * paces
+        drives_per_team = 4 * QUARTER_SECONDS / drive_seconds.sum() + 1
+        for team in range(2):
+            expected = expected_points_per_drive(grid, kickers[team]) * drives_per_team
+            drive_scores[team] = grid[np.argmin(np.abs(expected - points[team]))]
+    return drive_scores
+
+
+# Example usage
+if __name__ == "__main__":
+    import time
+
+    eagles = NFLDrivePredictor()
+    eagles.set_offensive_stats(qb_rating=105.0, qb_epa_per_play=0.25, rb_ypc=4.5, wr_ypr=12.0, ol_pbwr=65,
+                               ol_rbwr=60, third_down_rate=45, rz_efficiency=60, pace_of_play=28, kicker_accuracy=94)
+    eagles.set_defensive_stats(def_dvoa=-10, def_pressure_rate=30, def_coverage_rating=75)
+    chiefs = NFLDrivePredictor()
+    chiefs.set_offensive_stats(qb_rating=110.0, qb_epa_per_play=0.28, rb_ypc=4.2, wr_ypr=13.0, ol_pbwr=70,
+                               ol_rbwr=55, third_down_rate=48, rz_efficiency=65, pace_of_play=26, kicker_accuracy=95)
+    chiefs.set_defensive_stats(def_dvoa=-5, def_pressure_rate=28, def_coverage_rating=80)
+
+    simulator = BatchGameSimulator.from_predictors("Eagles", eagles, "Chiefs", chiefs)
+    started = time.perf_counter()
+    result = simulator.simulate(100_000, seed=1)
+    print(f"Simulated 100,000 games in {time.perf_counter() - started:.2f}s")
+    print(f"Eagles win probability: {result.win_probability():.1%}")
+    print(f"Average score: Eagles {result.team1_scores.mean():.1f} - Chiefs {result.team2_scores.mean():.1f}")
@@ -15,10 +15,11 @@ class NFLGameSimulator:
         team['predictor'].set_defensive_stats(**defensive_stats)
 
     def simulate_extra_point(self, kicker_accuracy):
-        return random.random() < (kicker_accuracy / 100)
+        # kicker_accuracy is the predictor's normalized (0-1) stat
+        return random.random() < kicker_accuracy
 
     def simulate_drive(self, offense, defense):
-        drive_result = offense['predictor'].predict_drive_outcome(self.field_position)
+        drive_result = offense['predictor'].predict_drive_outcome(self.field_position, defense['predictor'])
         outcome, points, num_plays, time_used, _, yards_gained, end_yard, next_start, fg_distance = drive_result
 
         # Ensure time_used doesn't exceed remaining time
@@ -102,30 +103,31 @@ class NFLGameSimulator:
         print(f"\nFinal Score: {self.team1['name']} {self.team1['score']} - {self.team2['name']} {self.team2['score']}")
 
 # Example usage
-game = NFLGameSimulator("Eagles", "Chiefs")
-
-# Set stats for Eagles
-game.set_team_stats(game.team1, 
-    offensive_stats={
-        'qb_rating': 105.0, 'qb_epa_per_play': 0.25, 'rb_ypc': 4.5, 'wr_ypr': 12.0,
-        'ol_pbwr': 65, 'ol_rbwr': 60, 'third_down_rate': 45, 'rz_efficiency': 60,
-        'pace_of_play': 28, 'kicker_accuracy': 94
-    },
-    defensive_stats={
-        'def_dvoa': -10, 'def_pressure_rate': 30, 'def_coverage_rating': 75
-    }
-)
-
-# Set stats for Chiefs
-game.set_team_stats(game.team2, 
-    offensive_stats={
-        'qb_rating': 110.0, 'qb_epa_per_play': 0.28, 'rb_ypc': 4.2, 'wr_ypr': 13.0,
-        'ol_pbwr': 70, 'ol_rbwr': 55, 'third_down_rate': 48, 'rz_efficiency': 65,
-        'pace_of_play': 26, 'kicker_accuracy': 95
-    },
-    defensive_stats={
-        'def_dvoa': -5, 'def_pressure_rate': 28, 'def_coverage_rating': 80
-    }
-)
-
-game.simulate_game()
\ No newline at end of file
+if __name__ == "__main__":
+    game = NFLGameSimulator("Eagles", "Chiefs")
+
+    # Set stats for Eagles
+    game.set_team_stats(game.team1, 
+        offensive_stats={
+            'qb_rating': 105.0, 'qb_epa_per_play': 0.25, 'rb_ypc': 4.5, 'wr_ypr': 12.0,
+            'ol_pbwr': 65, 'ol_rbwr': 60, 'third_down_rate': 45, 'rz_efficiency': 60,
+            'pace_of_play': 28, 'kicker_accuracy': 94
+        },
+        defensive_stats={
+            'def_dvoa': -10, 'def_pressure_rate': 30, 'def_coverage_rating': 75
+        }
+    )
+
+    # Set stats for Chiefs
+    game.set_team_stats(game.team2, 
+        offensive_stats={
+            'qb_rating': 110.0, 'qb_epa_per_play': 0.28, 'rb_ypc': 4.2, 'wr_ypr': 13.0,
+            'ol_pbwr': 70, 'ol_rbwr': 55, 'third_down_rate': 48, 'rz_efficiency': 65,
+            'pace_of_play': 26, 'kicker_accuracy': 95
+        },
+        defensive_stats={
+            'def_dvoa': -5, 'def_pressure_rate': 28, 'def_coverage_rating': 80
+        }
+    )
+
+    game.simulate_game()
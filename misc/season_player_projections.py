@@ -1,9 +1,53 @@
+import argparse
 import csv
-from typing import Dict, List
+import json
+import os
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Source columns of the projection files, mapped to the stat names the scoring systems use.
+# Weekly and per-position season files use the snake_case columns, the all-positions season
+# file the abbreviated ones; any other numeric column is kept under its own header. The
+# all-positions file's "Fum" projects fumbles lost, the stat the scoring systems charge.
+STAT_COLUMNS = {
+    "pass_cmp": "PassComp", "Pa Com": "PassComp",
+    "pass_att": "PassAtt", "Pa Att": "PassAtt",
+    "pass_yds": "PassYds", "Pa Yds": "PassYds",
+    "pass_td": "PassTDs", "Pa TDs": "PassTDs",
+    "pass_int": "PassInt", "INT": "PassInt",
+    "rush_att": "RushAtt", "Ru Att": "RushAtt",
+    "rush_yds": "RushYds", "Ru Yds": "RushYds",
+    "rush_td": "RushTDs", "Ru TDs": "RushTDs",
+    "rec_tgt": "Targets", "Tar": "Targets",
+    "rec": "Receptions", "Rec": "Receptions",
+    "rec_yds": "RecYards", "Re Yds": "RecYards",
+    "rec_td": "RecTDs", "Re TDs": "RecTDs",
+    "fum": "Fumbles",
+    "fum_lost": "FumblesLost", "Fum": "FumblesLost"
+}
+NAME_COLUMNS = ("Player", "player")
+POSITION_COLUMNS = ("Pos", "pos")
+# Identifying or derived columns that are never scored
+IGNORED_COLUMNS = {"Team", "team", "Tm", "rank", "id", "gp", "game.week", "opp"}
+
+_STANDARD = {
+    "PassYds": 0.04, "PassTDs": 4, "PassInt": -2,
+    "RushYds": 0.1, "RushTDs": 6,
+    "RecYards": 0.1, "RecTDs": 6,
+    "FumblesLost": -2
+}
+SCORING_SYSTEMS: Dict[str, Dict[str, float]] = {
+    "standard": _STANDARD,
+    "half_ppr": {**_STANDARD, "Receptions": 0.5},
+    "ppr": {**_STANDARD, "Receptions": 1},
+    "6pt_pass_td": {**_STANDARD, "Receptions": 1, "PassTDs": 6}
+}
+
 
 class ScoringSettings:
-    def __init__(self):
-        self.settings: Dict[str, float] = {}
+    def __init__(self, settings: Optional[Mapping[str, float]] = None):
+        self.settings: Dict[str, float] = dict(settings or {})
 
     def add_setting(self, stat: str, points: float):
         self.settings[stat] = points
@@ -11,6 +55,7 @@ class ScoringSettings:
     def get_points(self, stat: str) -> float:
         return self.settings.get(stat, 0.0)
 
+
 class Player:
     def __init__(self, name: str, position: str):
         self.name = name
@@ -23,6 +68,161 @@ class Player:
     def calculate_score(self, scoring: ScoringSettings) -> float:
         return sum(value * scoring.get_points(stat) for stat, value in self.stats.items())
 
+
+class ProjectionMatrix:
+    """
+    Projections of many players as one players x stats matrix.
+
+    Attributes:
+        names (List[str]): Player names, in row order.
+        positions (np.ndarray): Each player's position.
+        stats (List[str]): Stat names, in column order.
+        values (np.ndarray): Projected stats, shape (players, stats).
+    """
+
+    def __init__(self, names: Sequence[str], positions: Sequence[str], stats: Sequence[str], values: np.ndarray):
+        self.names = list(names)
+        self.positions = np.array(positions, dtype=str)
+        self.stats = list(stats)
+        self.values = np.asarray(values, dtype=float).reshape(len(self.names), len(self.stats))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_csv(cls, filenames: Iterable[str]) -> "ProjectionMatrix":
+        """Load and stack projection CSVs; stats a file lacks are 0 for its players."""
+        names, positions, stats, columns = [], [], {}, []
+        for filename in filenames:
+            with open(filename, 'r', newline='', encoding='utf-8-sig') as csvfile:
+                reader = csv.DictReader(csvfile)
+                name_column = next(column for column in NAME_COLUMNS if column in reader.fieldnames)
+                position_column = next(column for column in POSITION_COLUMNS if column in reader.fieldnames)
+                rows = list(reader)
+            file_columns = {}
+            for column in reader.fieldnames:
+                if column in IGNORED_COLUMNS or column in (name_column, position_column):
+                    continue
+                values = np.array([_parse_stat(row[column]) for row in rows])
+                # Skip columns with nothing numeric in them; other non-numeric values count as 0
+                if len(values) and np.isnan(values).all():
+                    continue
+                stat = STAT_COLUMNS.get(column, column)
+                stats.setdefault(stat, len(stats))
+                file_columns[stat] = np.nan_to_num(values)
+            names.extend(row[name_column] for row in rows)
+            positions.extend(row[position_column] for row in rows)
+            columns.append((len(rows), file_columns))
+
+        values = np.zeros((len(names), len(stats)))
+        start = 0
+        for count, file_columns in columns:
+            for stat, column in file_columns.items():
+                values[start:start + count, stats[stat]] = column
+            start += count
+        return cls(names, positions, list(stats), values)
+
+    @classmethod
+    def from_projection_table(cls, table) -> "ProjectionMatrix":
+        """Wrap a src.projection_table.ProjectionTable (or anything with names, position_of, STATS and stats)."""
+        return cls(table.names, [table.position_of(row) for row in range(len(table))], table.STATS, table.stats)
+
+    @classmethod
+    def from_players(cls, players: Sequence[Player]) -> "ProjectionMatrix":
+        stats = list(dict.fromkeys(stat for player in players for stat in player.stats))
+        index = {stat: i for i, stat in enumerate(stats)}
+        values = np.zeros((len(players), len(stats)))
+        for row, player in enumerate(players):
+            for stat, value in player.stats.items():
+                values[row, index[stat]] = value
+        return cls([player.name for player in players], [player.position for player in players], stats, values)
+
+
+class ScoringMatrix:
+    """
+    Many scoring systems as one stats x systems matrix of points per unit of each stat.
+
+    Attributes:
+        systems (List[str]): System names, in column order.
+        stats (List[str]): Stat names, in row order.
+        weights (np.ndarray): Points per stat, shape (stats, systems).
+    """
+
+    def __init__(self, systems: Mapping[str, ScoringSettings], stats: Sequence[str]):
+        self.systems = list(systems)
+        self.stats = list(stats)
+        self.weights = np.array([[scoring.get_points(stat) for scoring in systems.values()] for stat in self.stats],
+                                dtype=float).reshape(len(self.stats), len(self.systems))
+        unknown = {stat for scoring in systems.values() for stat in scoring.settings} - set(self.stats)
+        if unknown:
+            print(f"Warning: no projections for scored stats {', '.join(sorted(unknown))}")
+
+
+class FantasyPoints:
+    """
+    Every player's points under every scoring system, with per-position rankings.
+
+    Attributes:
+        projections (ProjectionMatrix): The scored players.
+        systems (List[str]): System names, in column order.
+        points (np.ndarray): Points, shape (players, systems).
+        ranks (np.ndarray): Each player's rank (1 = best) within their position, shape (players, systems).
+    """
+
+    def __init__(self, projections: ProjectionMatrix, systems: Sequence[str], points: np.ndarray):
+        self.projections = projections
+        self.systems = list(systems)
+        self.points = points
+        self.ranks = np.zeros(points.shape, dtype=np.int64)
+        for position in np.unique(projections.positions):
+            rows = np.flatnonzero(projections.positions == position)
+            order = np.argsort(-points[rows], axis=0, kind='stable')
+            self.ranks[rows] = np.argsort(order, axis=0) + 1
+
+    def ranking(self, system: str, position: Optional[str] = None, top: Optional[int] = None) -> List[Tuple[str, str, float]]:
+        """Return (name, position, points) best first, for one position if given."""
+        column = self.systems.index(system)
+        rows = np.arange(len(self.projections))
+        if position is not None:
+            rows = rows[self.projections.positions == position]
+        rows = rows[np.argsort(-self.points[rows, column], kind='stable')][:top]
+        return [(self.projections.names[row], str(self.projections.positions[row]), float(self.points[row, column]))
+                for row in rows]
+
+
+def score(projections: ProjectionMatrix, systems: Mapping[str, ScoringSettings]) -> FantasyPoints:
+    """Score every player under every system with one (players x stats) @ (stats x systems) product."""
+    scoring = ScoringMatrix(systems, projections.stats)
+    return FantasyPoints(projections, scoring.systems, projections.values @ scoring.weights)
+
+
+def load_scoring_systems(filename: str) -> Dict[str, ScoringSettings]:
+    """
+    Load league scoring systems from a JSON or YAML file mapping league name -> {stat: points}.
+
+    A league may set "base" to a built-in system (e.g. "half_ppr") and list only its differences.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        if os.path.splitext(filename)[1] in ('.yaml', '.yml'):
+            import yaml
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    systems = {}
+    for league, settings in data.items():
+        settings = dict(settings)
+        base = settings.pop("base", None)
+        systems[league] = ScoringSettings({**SCORING_SYSTEMS.get(base, {}), **settings})
+    return systems
+
+
+def _parse_stat(value: str) -> float:
+    try:
+        return float(value.replace(',', '')) if value else 0.0
+    except ValueError:
+        return np.nan
+
+
 def load_players_from_csv(filename: str) -> List[Player]:
     players = []
     with open(filename, 'r', newline='') as csvfile:
@@ -38,11 +238,12 @@ def load_players_from_csv(filename: str) -> List[Player]:
             players.append(player)
     return players
 
+
 def get_scoring_settings() -> ScoringSettings:
     scoring = ScoringSettings()
     print("Enter your scoring settings. Type 'done' when finished.")
     while True:
-        stat = input("Enter stat name (e.g., 'PassYds', 'RushTD'): ").strip()
+        stat = input("Enter stat name (e.g., 'PassYds', 'RushTDs'): ").strip()
         if stat.lower() == 'done':
             break
         try:
@@ -52,19 +253,37 @@ def get_scoring_settings() -> ScoringSettings:
             print("Invalid input. Please enter a number for points.")
     return scoring
 
-def main():
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score player projections under many fantasy scoring systems.")
+    parser.add_argument('files', nargs='*', help="Projection CSVs (prompted for if omitted)")
+    parser.add_argument('--system', nargs='+', default=[], choices=sorted(SCORING_SYSTEMS),
+                        help="Built-in scoring systems")
+    parser.add_argument('--scoring', nargs='+', default=[], help="JSON/YAML files of league scoring systems")
+    parser.add_argument('--position', nargs='+', help="Positions to rank (default: all)")
+    parser.add_argument('--top', type=int, default=24, help="Players to show per position and system")
+    args = parser.parse_args(argv)
+
     # Load players from CSV
-    filename = input("Enter the name of your CSV file with player stats: ")
-    players = load_players_from_csv(filename)
+    files = args.files or [input("Enter the name of your CSV file with player stats: ")]
+    projections = ProjectionMatrix.from_csv(files)
 
     # Get scoring settings
-    scoring = get_scoring_settings()
+    systems = {system: ScoringSettings(SCORING_SYSTEMS[system]) for system in args.system}
+    for filename in args.scoring:
+        systems.update(load_scoring_systems(filename))
+    if not systems:
+        systems["custom"] = get_scoring_settings()
 
     # Calculate and display scores
-    print("\nCalculated Scores:")
-    for player in players:
-        score = player.calculate_score(scoring)
-        print(f"{player.name} ({player.position}): {score:.2f} points")
+    points = score(projections, systems)
+    positions = args.position or list(dict.fromkeys(projections.positions.tolist()))
+    for system in points.systems:
+        for position in positions:
+            print(f"\n{system} - {position}")
+            for rank, (name, _, player_points) in enumerate(points.ranking(system, position, args.top), 1):
+                print(f"{rank:>3}. {name:<28} {player_points:7.2f}")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
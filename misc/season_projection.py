@@ -16,33 +16,27 @@ def project_season_records(matchups: List[Dict]) -> Dict[str, Dict[str, float]]:
     for matchup in matchups:
         teams.add(matchup['home'])
         teams.add(matchup['away'])
+    weeks = max((int(matchup['week']) for matchup in matchups), default=0)
 
-    records = {team: {0: {'wins': 0, 'losses': 0}} for team in teams}
-
+    # Expected wins and losses added in each week, accumulated once per team at the end
+    weekly_wins = {team: [0.0] * (weeks + 1) for team in teams}
+    weekly_losses = {team: [0.0] * (weeks + 1) for team in teams}
     for matchup in matchups:
         week = int(matchup['week'])
-        home_team = matchup['home']
-        away_team = matchup['away']
         home_win_prob = matchup['home_win_pct'] / 100  # Assuming home_win_pct is given as a percentage
-
-        # Update home team record
-        prev_home_record = records[home_team][week - 1]
-        records[home_team][week] = {
-            'wins': prev_home_record['wins'] + home_win_prob,
-            'losses': prev_home_record['losses'] + (1 - home_win_prob)
-        }
-
-        # Update away team record
-        prev_away_record = records[away_team][week - 1]
-        records[away_team][week] = {
-            'wins': prev_away_record['wins'] + (1 - home_win_prob),
-            'losses': prev_away_record['losses'] + home_win_prob
-        }
-
-        # Fill in records for teams not playing this week
-        for team in teams:
-            if team not in [home_team, away_team]:
-                records[team][week] = records[team][week - 1].copy()
+        weekly_wins[matchup['home']][week] += home_win_prob
+        weekly_losses[matchup['home']][week] += 1 - home_win_prob
+        weekly_wins[matchup['away']][week] += 1 - home_win_prob
+        weekly_losses[matchup['away']][week] += home_win_prob
+
+    records = {}
+    for team in teams:
+        wins = losses = 0
+        records[team] = {}
+        for week in range(weeks + 1):
+            wins += weekly_wins[team][week]
+            losses += weekly_losses[team][week]
+            records[team][week] = {'wins': wins, 'losses': losses}
 
     return records
 
@@ -0,0 +1,241 @@
+import numpy as np
+from typing import Dict, List, Sequence
+
+DIVISIONS: Dict[str, List[str]] = {
+    'AFC East': ['BUF', 'MIA', 'NE', 'NYJ'],
+    'AFC North': ['BAL', 'CIN', 'CLE', 'PIT'],
+    'AFC South': ['HOU', 'IND', 'JAC', 'TEN'],
+    'AFC West': ['DEN', 'KC', 'LAC', 'LV'],
+    'NFC East': ['DAL', 'NYG', 'PHI', 'WAS'],
+    'NFC North': ['CHI', 'DET', 'GB', 'MIN'],
+    'NFC South': ['ATL', 'CAR', 'NO', 'TB'],
+    'NFC West': ['ARI', 'LA', 'SEA', 'SF']
+}
+PLAYOFF_SEEDS = 7
+
+# Same point-difference slope Matchup uses to turn projected scores into a win percentage
+WIN_PCT_PER_POINT = 0.0303
+
+
+class SeasonSimulation:
+    """
+    Results of a Monte Carlo season simulation.
+
+    Attributes:
+        teams (List[str]): Team abbreviations, in column order.
+        wins (np.ndarray): Wins of each team in each simulated season, shape (seasons, teams).
+        division_winners (np.ndarray): Whether each team won its division, shape (seasons, teams).
+        seeds (np.ndarray): Each team's playoff seed (1-7, 0 if it missed), shape (seasons, teams).
+    """
+
+    def __init__(self, teams: List[str], wins: np.ndarray, division_winners: np.ndarray, seeds: np.ndarray):
+        self.teams = teams
+        self.wins = wins
+        self.division_winners = division_winners
+        self.seeds = seeds
+
+    def win_total_distribution(self) -> np.ndarray:
+        """Return P(team finishes with w wins), shape (teams, max wins + 1)."""
+        max_wins = int(self.wins.max())
+        return np.array([np.bincount(self.wins[:, t], minlength=max_wins + 1)
+                         for t in range(len(self.teams))]) / len(self.wins)
+
+    def expected_wins(self) -> np.ndarray:
+        return self.wins.mean(axis=0)
+
+    def division_odds(self) -> np.ndarray:
+        return self.division_winners.mean(axis=0)
+
+    def playoff_odds(self) -> np.ndarray:
+        return (self.seeds > 0).mean(axis=0)
+
+    def seed_probabilities(self) -> np.ndarray:
+        """Return P(team earns seed s), shape (teams, 7), column 0 being the 1 seed."""
+        return np.stack([(self.seeds == seed).mean(axis=0) for seed in range(1, PLAYOFF_SEEDS + 1)], axis=1)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Return each team's expected wins, division, playoff and first-seed odds."""
+        expected_wins = self.expected_wins()
+        division_odds = self.division_odds()
+        playoff_odds = self.playoff_odds()
+        first_seed = self.seed_probabilities()[:, 0]
+        return {team: {'wins': float(expected_wins[t]), 'division': float(division_odds[t]),
+                       'playoffs': float(playoff_odds[t]), 'first_seed': float(first_seed[t])}
+                for t, team in enumerate(self.teams)}
+
+
+def _home_win_probabilities(schedule: List[Dict]) -> np.ndarray:
+    """Return each game's home win probability from its win percentage or projected points."""
+    probabilities = np.empty(len(schedule))
+    for g, game in enumerate(schedule):
+        if 'home_win_pct' in game:
+            probabilities[g] = game['home_win_pct'] / 100
+        elif 'home_points' in game:
+            point_difference = game['away_points'] - game['home_points']
+            probabilities[g] = -WIN_PCT_PER_POINT * point_difference + 0.5
+        else:
+            probabilities[g] = 0.5
+    return np.clip(probabilities, 0.001, 0.999)
+
+
+def _simulate_results(schedule: List[Dict], probabilities: np.ndarray, seasons: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """Return each game's home result (1 win, 0.5 tie, 0 loss) in each season, shape (seasons, games)."""
+    results = (rng.random((seasons, len(schedule))) < probabilities).astype(np.float32)
+    for g, game in enumerate(schedule):
+        if 'home_score' in game and 'away_score' in game:
+            margin = game['home_score'] - game['away_score']
+            results[:, g] = 1.0 if margin > 0 else 0.0 if margin < 0 else 0.5
+        elif 'home_margins' in game:
+            # Sampled score distribution, e.g. SimulationResult.margins from rile_batch
+            margins = np.asarray(game['home_margins'])
+            margins = margins[rng.integers(0, len(margins), seasons)]
+            results[:, g] = np.where(margins > 0, 1.0, np.where(margins < 0, 0.0, 0.5))
+    return results
+
+
+def _head_to_head(results, home_wins_pct, away_wins_pct, same_group, home_games, away_games):
+    """Win percentage of each team in games against same-group teams with the same record (0.5 if none)."""
+    tied = ((home_wins_pct == away_wins_pct) & same_group).astype(np.float32)
+    wins = (results * tied) @ home_games + ((1 - results) * tied) @ away_games
+    games = tied @ (home_games + away_games)
+    return np.where(games > 0, wins / np.maximum(games, 1), 0.5)
+
+
+def _rank(keys: Sequence[np.ndarray]) -> np.ndarray:
+    """Return column indices ordered best first; the last key is the most significant."""
+    return np.lexsort(keys, axis=-1)[:, ::-1]
+
+
+def _simulate_chunk(schedule, probabilities, seasons, rng, team_index, divisions):
+    """Simulate a block of seasons and return (wins, division winners, seeds)."""
+    teams = len(team_index)
+    home = np.array([team_index[game['home']] for game in schedule])
+    away = np.array([team_index[game['away']] for game in schedule])
+    home_games = np.zeros((len(schedule), teams), dtype=np.float32)
+    away_games = np.zeros((len(schedule), teams), dtype=np.float32)
+    home_games[np.arange(len(schedule)), home] = 1
+    away_games[np.arange(len(schedule)), away] = 1
+
+    division = np.empty(teams, dtype=np.int64)
+    for d, division_teams in enumerate(divisions.values()):
+        division[[team_index[team] for team in division_teams]] = d
+    conference = division // (len(divisions) // 2)
+    division_game = division[home] == division[away]
+    conference_game = conference[home] == conference[away]
+
+    results = _simulate_results(schedule, probabilities, seasons, rng)
+
+    def record(mask=None):
+        """Win percentage (ties counting half) in all games or in the masked games."""
+        weight = np.ones(len(schedule), dtype=np.float32) if mask is None else mask.astype(np.float32)
+        won = (results * weight) @ home_games + ((1 - results) * weight) @ away_games
+        played = weight @ (home_games + away_games)
+        return np.where(played > 0, won / np.maximum(played, 1), 0.5), won
+
+    win_pct, win_points = record()
+    division_pct, _ = record(division_game)
+    conference_pct, _ = record(conference_game)
+    wins = ((results == 1).astype(np.float32) @ home_games
+            + (results == 0).astype(np.float32) @ away_games).astype(np.int64)
+
+    # Strength of victory: combined win percentage of the teams each team beat
+    beaten = (results * win_pct[:, away]) @ home_games + ((1 - results) * win_pct[:, home]) @ away_games
+    victory = np.where(win_points > 0, beaten / np.where(win_points > 0, win_points, 1), 0)
+    coin_toss = rng.random((seasons, teams))
+
+    home_pct, away_pct = win_pct[:, home], win_pct[:, away]
+    division_h2h = _head_to_head(results, home_pct, away_pct, division_game, home_games, away_games)
+    conference_h2h = _head_to_head(results, home_pct, away_pct, conference_game, home_games, away_games)
+
+    rows = np.arange(seasons)[:, None]
+    division_winners = np.zeros((seasons, teams), dtype=bool)
+    for d in range(len(divisions)):
+        members = np.flatnonzero(division == d)
+        order = _rank([key[:, members] for key in
+                       (coin_toss, victory, conference_pct, division_pct, division_h2h, win_pct)])
+        division_winners[np.arange(seasons), members[order[:, 0]]] = True
+
+    seeds = np.zeros((seasons, teams), dtype=np.int8)
+    for c in range(2):
+        members = np.flatnonzero(conference == c)
+        order = _rank([key[:, members] for key in
+                       (coin_toss, victory, conference_pct, conference_h2h, win_pct, division_winners)])
+        seeds[rows, members[order[:, :PLAYOFF_SEEDS]]] = np.arange(1, PLAYOFF_SEEDS + 1)
+
+    return wins, division_winners, seeds
+
+
+def simulate_season(schedule: List[Dict], seasons: int = 100_000, seed: int = None,
+                    divisions: Dict[str, List[str]] = DIVISIONS, chunk_size: int = 20_000) -> SeasonSimulation:
+    """
+    Simulate the rest of a season many times and derive standings and playoff odds.
+
+    Division winners and playoff seeds (four division winners then three wild cards
+    per conference) are ranked by win percentage, then simplified NFL tiebreakers:
+    head-to-head record among the tied teams, division record (division races only),
+    conference record, strength of victory and a coin toss.
+
+    Args:
+        schedule (List[Dict]): Every game of the season with 'home' and 'away', plus one of
+            'home_score'/'away_score' (already played), 'home_margins' (sampled home
+            margins, e.g. from rile_batch), 'home_win_pct' or 'home_points'/'away_points'
+            (projected score from Matchup). Games with none of these are coin flips.
+        seasons (int): Number of seasons to simulate.
+        seed (int): Seed for the random generator.
+        divisions (Dict[str, List[str]]): Teams of each division, AFC divisions first.
+        chunk_size (int): Seasons simulated per block, bounding memory use.
+
+    Returns:
+        SeasonSimulation: Win totals, division winners and seeds of every simulated season.
+    """
+    rng = np.random.default_rng(seed)
+    teams = [team for division_teams in divisions.values() for team in division_teams]
+    team_index = {team: t for t, team in enumerate(teams)}
+    probabilities = _home_win_probabilities(schedule)
+
+    chunks = [_simulate_chunk(schedule, probabilities, min(chunk_size, seasons - start), rng, team_index, divisions)
+              for start in range(0, seasons, chunk_size)]
+    wins, division_winners, seeds = (np.concatenate(arrays) for arrays in zip(*chunks))
+    return SeasonSimulation(teams, wins, division_winners, seeds)
+
+
+def print_season_odds(simulation: SeasonSimulation, divisions: Dict[str, List[str]] = DIVISIONS):
+    """
+    Print each division's expected wins, division, playoff and first-seed odds.
+
+    Args:
+        simulation (SeasonSimulation): Results from simulate_season.
+        divisions (Dict[str, List[str]]): Teams of each division.
+    """
+    odds = simulation.to_dict()
+    for division_name, division_teams in divisions.items():
+        print(f"\n{division_name:<10} {'Wins':>6} {'Div':>7} {'Playoff':>8} {'#1 Seed':>8}")
+        for team in sorted(division_teams, key=lambda team: -odds[team]['wins']):
+            team_odds = odds[team]
+            print(f"{team:<10} {team_odds['wins']:>6.1f} {team_odds['division']:>7.1%} "
+                  f"{team_odds['playoffs']:>8.1%} {team_odds['first_seed']:>8.1%}")
+
+
+# Example usage:
+if __name__ == "__main__":
+    import time
+
+    # Each team plays its division rivals twice and eleven random opponents
+    rng = np.random.default_rng(0)
+    example_schedule = []
+    for division_teams in DIVISIONS.values():
+        for home in division_teams:
+            for away in division_teams:
+                if home != away:
+                    example_schedule.append({'home': home, 'away': away, 'home_win_pct': 55})
+    all_teams = [team for division_teams in DIVISIONS.values() for team in division_teams]
+    for week in range(11):
+        order = rng.permutation(all_teams)
+        for home, away in zip(order[::2], order[1::2]):
+            example_schedule.append({'home': home, 'away': away, 'home_win_pct': rng.uniform(25, 75)})
+
+    started = time.perf_counter()
+    simulation = simulate_season(example_schedule, seed=1)
+    print(f"Simulated {len(simulation.wins):,} seasons in {time.perf_counter() - started:.2f}s")
+    print_season_odds(simulation)
@@ -0,0 +1,223 @@
+"""
+Backtest Module
+---------------
+This module runs the projection model over every historical week that has a
+matchup file, joins each game to its final score and reports how the model did:
+against the spread, on totals and moneylines, its Brier score and the ROI of the
+bets Matchup recommends. Data is loaded once per season and the matchups are
+kept between runs, so the backtest can be re-run cheaply inside calibration loops.
+DVOA and PFF are read only for the years before each backtested season; a season
+with no earlier DVOA is skipped, and one with no earlier PFF runs without grades.
+"""
+
+import argparse
+import logging
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import config
+from context import SeasonDataContext
+from data_loader import ParsedDataCache
+from dvoa import prior_years
+from matchup import Matchup
+
+logger = logging.getLogger(__name__)
+
+MATCHUP_FILE_PATTERN = re.compile(r"matchups_week_(\d+)\.(yaml|json)$")
+
+
+class GameResult(NamedTuple):
+    """Model projection and final score for one historical game."""
+    season: str
+    week: int
+    home: str
+    away: str
+    proj_home: float
+    proj_away: float
+    home_score: float
+    away_score: float
+    home_win_pct: float
+    betting_lines: Optional[Dict]
+    bets: List[Dict]
+
+
+class BacktestReport:
+    """Accuracy and betting results accumulated over backtested games."""
+
+    def __init__(self, games: List[GameResult], skipped: List[Tuple[str, Optional[int], str]]):
+        self.games = games
+        self.skipped = skipped
+        self.ats = [0, 0, 0]
+        self.totals = [0, 0, 0]
+        self.moneyline = [0, 0, 0]
+        self.brier = 0.0
+        self.bets = 0
+        self.staked = 0.0
+        self.profit = 0.0
+        for game in games:
+            self._score_game(game)
+        if games:
+            self.brier /= len(games)
+
+    @staticmethod
+    def _record(tally: List[int], model_side: float, actual_side: float):
+        """Add a win, loss or push (index 0, 1, 2) for a pick against an outcome."""
+        if actual_side == 0 or model_side == 0:
+            tally[2] += 1
+        elif (model_side > 0) == (actual_side > 0):
+            tally[0] += 1
+        else:
+            tally[1] += 1
+
+    def _score_game(self, game: GameResult):
+        """Score one game's picks, win probability and bets."""
+        actual_margin = game.home_score - game.away_score
+        actual_total = game.home_score + game.away_score
+        proj_margin = game.proj_home - game.proj_away
+        self._record(self.moneyline, proj_margin, actual_margin)
+        if game.betting_lines:
+            spread = game.betting_lines['home_spread']
+            self._record(self.ats, proj_margin + spread, actual_margin + spread)
+            total = game.betting_lines['total']
+            self._record(self.totals, game.proj_home + game.proj_away - total, actual_total - total)
+
+        home_won = 1.0 if actual_margin > 0 else 0.0 if actual_margin < 0 else 0.5
+        self.brier += (game.home_win_pct / 100 - home_won) ** 2
+
+        for bet in game.bets:
+            self.bets += 1
+            won = self._bet_outcome(bet, actual_margin, actual_total)
+            if won is None:
+                continue
+            self.staked += bet['stake']
+            payout = bet['odds'] / 100 if bet['odds'] > 0 else 100 / -bet['odds']
+            self.profit += bet['stake'] * payout if won else -bet['stake']
+
+    @staticmethod
+    def _bet_outcome(bet: Dict, actual_margin: float, actual_total: float) -> Optional[bool]:
+        """Return whether a bet won, or None for a push."""
+        if bet['market'] == 'moneyline':
+            if actual_margin == 0:
+                return None
+            return (actual_margin > 0) == (bet['bet'] == 'home_ml')
+        if actual_total == bet['line']:
+            return None
+        return (actual_total > bet['line']) == (bet['bet'] == 'over')
+
+    @property
+    def roi(self) -> float:
+        """Return profit as a fraction of the amount staked on decided bets."""
+        return self.profit / self.staked if self.staked else 0.0
+
+    def summary(self) -> str:
+        """Return a printable summary of the backtest."""
+        def pct(tally: List[int]) -> str:
+            decided = tally[0] + tally[1]
+            return f"{tally[0]}-{tally[1]}-{tally[2]} ({tally[0] / decided * 100:.1f}%)" if decided else "n/a"
+
+        lines = [
+            f"{'Games:':<15} {len(self.games)}",
+            f"{'ATS:':<15} {pct(self.ats)}",
+            f"{'Totals:':<15} {pct(self.totals)}",
+            f"{'Moneyline:':<15} {pct(self.moneyline)}",
+            f"{'Brier score:':<15} {self.brier:.4f}",
+            f"{'Bets:':<15} {self.bets} (${self.staked:,.0f} staked, ${self.profit:,.0f} profit)",
+            f"{'ROI:':<15} {self.roi * 100:.1f}%"
+        ]
+        for season, week, reason in self.skipped:
+            label = f"{season} week {week}" if week is not None else season
+            lines.append(f"Skipped {label}: {reason}")
+        return "\n".join(lines)
+
+
+class Backtest:
+    """Runs the model over every historical week of the given seasons."""
+
+    def __init__(self, seasons: Sequence[str] = None, data_dir: str = config.DATA_DIR,
+                 cache: Optional[ParsedDataCache] = None):
+        """Load every season's data and build each scored game's Matchup once."""
+        self.data_dir = data_dir
+        self.seasons = list(seasons or self.discover_seasons(data_dir))
+        self.skipped: List[Tuple[str, Optional[int], str]] = []
+        # (season, week, matchup data, Matchup, final score)
+        self.matchups: List[Tuple[str, int, Dict, Matchup, Tuple[float, float]]] = []
+        for season in self.seasons:
+            self._load_season(season, cache)
+
+    @staticmethod
+    def discover_seasons(data_dir: str = config.DATA_DIR) -> List[str]:
+        """Return every season with a matchup directory."""
+        return sorted(name for name in os.listdir(f"{data_dir}matchups")
+                      if os.path.isdir(f"{data_dir}matchups/{name}"))
+
+    @staticmethod
+    def discover_weeks(season: str, data_dir: str = config.DATA_DIR) -> List[int]:
+        """Return every numbered week of a season with a matchup file."""
+        weeks = set()
+        for filename in os.listdir(f"{data_dir}matchups/{season}"):
+            match = MATCHUP_FILE_PATTERN.match(filename)
+            if match:
+                weeks.add(int(match.group(1)))
+        return sorted(weeks)
+
+    def _load_season(self, season: str, cache: Optional[ParsedDataCache]):
+        """Build the Matchups of every scored game in a season, from data published before it."""
+        data_years = prior_years(season, self.data_dir)
+        if not data_years:
+            self.skipped.append((season, None, "no DVOA from before the season"))
+            return
+        season_context = None
+        for week in self.discover_weeks(season, self.data_dir):
+            if season_context is None:
+                context = season_context = SeasonDataContext(week, season, self.data_dir, cache, data_years)
+                if context.pff_season is None:
+                    logger.warning("No PFF grades from before %s; backtesting it without them", season)
+                try:
+                    season_context.results
+                except FileNotFoundError:
+                    self.skipped.append((season, None, "no results file"))
+                    return
+            else:
+                context = season_context.for_week(week)
+
+            try:
+                context.projections.get_players()
+            except FileNotFoundError:
+                self.skipped.append((season, week, "no projections"))
+                continue
+
+            for matchup_data in context.matchups:
+                score = context.results.get((week, matchup_data['home'], matchup_data['away']))
+                if score is None:
+                    self.skipped.append((season, week, f"no result for {matchup_data['away']} at {matchup_data['home']}"))
+                    continue
+                try:
+                    matchup = Matchup(matchup_data, context)
+                except KeyError as e:
+                    self.skipped.append((season, week, f"missing data for {e}"))
+                    continue
+                self.matchups.append((season, week, matchup_data, matchup, score))
+
+    def run(self) -> BacktestReport:
+        """Project every scored game with the current calibration and score the results."""
+        games = []
+        for season, week, matchup_data, matchup, (home_score, away_score) in self.matchups:
+            projection = matchup.project()
+            games.append(GameResult(
+                season, week, matchup_data['home'], matchup_data['away'], projection.home_points,
+                projection.away_points, home_score, away_score, projection.home_win_pct,
+                matchup_data.get('betting_lines'), projection.bets
+            ))
+        return BacktestReport(games, list(self.skipped))
+
+def main(argv=None):
+    """Run the backtest from the command line."""
+    parser = argparse.ArgumentParser(description="Backtest the NFL projection model.")
+    parser.add_argument('--seasons', nargs='+', help="Seasons to backtest (default: every season with matchups)")
+    args = parser.parse_args(argv)
+    print(Backtest(args.seasons, cache=ParsedDataCache()).run().summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Calibration Module
+------------------
+This module defines the calibration registry, the single source of the named linear
+maps the projection model uses to normalize raw inputs ("Pass", "OLPF", "DAVE DEF",
+"PFF Pass", ...), to turn offensive value into points and point differences into
+win percentages, plus the weights it combines a team's value components with. Maps
+are stored as slope/intercept arrays so they can be applied to a scalar or to a
+whole array of teams in one call.
+"""
+
+from typing import Dict, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+from data_loader import load_yaml_data
+
+ArrayLike = Union[float, np.ndarray]
+
+# Each map is defined by two points (x1, y1, x2, y2) on the line
+DEFAULT_POINTS: Dict[str, Tuple[float, float, float, float]] = {
+    "Pass": (-.35, 0, .40, 10),
+    "Rush": (-.20, 0, .20, 10),
+    "Rec": (-.22, 0, .25, 10),
+    "OLPF": (.88, 0, .25, 10),
+    "OLRF": (24, 0, 35, 10),
+    "DPF": (3.10, 0, -1.4, 10),
+    "DRF": (0.09, 0, -1.75, 10),
+    "DAVE DEF": (9.5, 0, -10.5, 10),
+    "DAVE OFF": (-17, 0, 17, 10),
+    "PFF Pass": (45, 0, 87.5, 10)
+}
+
+# Maps defined directly as (slope, intercept)
+DEFAULT_LINES: Dict[str, Tuple[float, float]] = {
+    "Points Turf": (2.5, 24.333),
+    "Points Grass": (2.5, 23.667),
+    # Home win probability from (away points - home points)
+    "Win Pct": (-0.0303, 0.5)
+}
+
+# Weights of a team's offensive passing (qb, rec, ol) and rushing (rushing, ol_rush) value components
+DEFAULT_WEIGHTS: Dict[str, float] = {'qb': 0.50, 'rec': 0.30, 'ol': 0.20, 'rushing': 0.60, 'ol_rush': 0.40}
+
+
+class CalibrationRegistry:
+    """Named linear maps stored as slope/intercept arrays, and named component weights."""
+
+    __slots__ = ['names', 'slopes', 'intercepts', 'weights', '_index']
+
+    def __init__(self, lines: Mapping[str, Tuple[float, float]], weights: Mapping[str, float] = None):
+        """Create a registry from a mapping of name -> (slope, intercept) and of name -> weight
+        (the built-in weights if not given)."""
+        self.names = tuple(lines)
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.slopes = np.array([lines[name][0] for name in self.names], dtype=float)
+        self.intercepts = np.array([lines[name][1] for name in self.names], dtype=float)
+
+    @staticmethod
+    def line_from_points(x1: float, y1: float, x2: float, y2: float) -> Tuple[float, float]:
+        """Return the (slope, intercept) of the line through two points."""
+        slope = (y2 - y1) / (x2 - x1)
+        return slope, y1 - slope * x1
+
+    @classmethod
+    def default(cls) -> "CalibrationRegistry":
+        """Create a registry holding the model's built-in calibration."""
+        lines = {name: cls.line_from_points(*points) for name, points in DEFAULT_POINTS.items()}
+        lines.update(DEFAULT_LINES)
+        return cls(lines)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def lines(self) -> Dict[str, Tuple[float, float]]:
+        """Return the registry as a mapping of name -> (slope, intercept)."""
+        return {name: (float(self.slopes[i]), float(self.intercepts[i])) for i, name in enumerate(self.names)}
+
+    def updated(self, lines: Mapping[str, Tuple[float, float]],
+                weights: Mapping[str, float] = None) -> "CalibrationRegistry":
+        """Return a new registry with some maps and weights replaced or added."""
+        merged = self.lines()
+        merged.update(lines)
+        return CalibrationRegistry(merged, {**self.weights, **(weights or {})})
+
+    def weight(self, name: str) -> float:
+        """Return one named component weight."""
+        return self.weights[name]
+
+    def apply(self, name: str, x: ArrayLike) -> ArrayLike:
+        """Apply one named map to a scalar or to an array of values."""
+        i = self._index[name]
+        slope = self.slopes[i].item()
+        intercept = self.intercepts[i].item()
+        return slope * x + intercept
+
+    def apply_many(self, names: Sequence[str], x: np.ndarray) -> np.ndarray:
+        """Apply a different named map to each column of x.
+
+        Args:
+            names: One map name per column (the last axis) of x.
+            x: Values to normalize, e.g. a teams x components array.
+        """
+        ids = np.array([self._index[name] for name in names])
+        return self.slopes[ids] * x + self.intercepts[ids]
+
+
+def load_calibration(file_path: str, base: CalibrationRegistry = None) -> CalibrationRegistry:
+    """
+    Load calibration overrides from a YAML file.
+
+    Each entry is either a map, ``{points: [x1, y1, x2, y2]}`` or ``{slope: m, intercept: b}``,
+    or a component weight, ``{weight: w}``. Maps and weights not listed in the file keep
+    their value from ``base`` (the built-in defaults if not given).
+
+    Raises:
+        ValueError: If an entry defines neither points, slope/intercept nor a weight.
+    """
+    base = base or CalibrationRegistry.default()
+    lines, weights = {}, {}
+    for name, entry in (load_yaml_data(file_path) or {}).items():
+        if 'points' in entry:
+            lines[name] = CalibrationRegistry.line_from_points(*entry['points'])
+        elif 'slope' in entry and 'intercept' in entry:
+            lines[name] = (float(entry['slope']), float(entry['intercept']))
+        elif 'weight' in entry:
+            weights[name] = float(entry['weight'])
+        else:
+            raise ValueError(f"Invalid calibration entry for {name}: {entry}")
+    return base.updated(lines, weights)
+
+
+_active = CalibrationRegistry.default()
+
+
+def get_calibration() -> CalibrationRegistry:
+    """Return the calibration registry currently used by the model."""
+    return _active
+
+
+def use_calibration(registry: CalibrationRegistry):
+    """Make a registry the one used by the model."""
+    global _active
+    _active = registry
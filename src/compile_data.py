@@ -0,0 +1,88 @@
+"""
+Compile Data Module
+-------------------
+This module is the build step for the memory-mapped data store: it parses every
+source under the raw data tree (DVOA, DAVE, PFF, projections, matchups, pass rates,
+home advantage, and Elo, results and historical stats where present) for the given
+seasons and weeks into the ParsedDataCache. Every later run, worker process or
+server then maps the compiled entries instead of re-reading the text files, and
+processes on the same machine share one page-cache copy of each.
+"""
+
+import argparse
+import logging
+import os
+from typing import Dict, List, Optional, Sequence
+
+import config
+from backtest import Backtest
+from context import SeasonDataContext
+from data_loader import ENTRY_SUFFIX, ParsedDataCache
+
+logger = logging.getLogger(__name__)
+
+# Sources compiled only when their files exist
+OPTIONAL_SOURCES = ('elo', 'results', 'historical_stats')
+
+
+def compile_data(seasons: Sequence[str], weeks: Optional[Sequence[int]] = None, data_dir: str = config.DATA_DIR,
+                 cache: Optional[ParsedDataCache] = None) -> Dict[str, List[int]]:
+    """
+    Compile every source of the given seasons and weeks into the cache.
+
+    Args:
+        seasons (Sequence[str]): Seasons to compile.
+        weeks (Optional[Sequence[int]]): Weeks to compile (default: every week with a matchup file).
+        data_dir (str): Root of the raw data tree.
+        cache (Optional[ParsedDataCache]): The cache to compile into.
+
+    Returns:
+        Dict[str, List[int]]: The weeks compiled for each season.
+    """
+    cache = cache or ParsedDataCache()
+    compiled = {}
+    for season in seasons:
+        season_context, compiled[season] = None, []
+        for week in weeks or Backtest.discover_weeks(season, data_dir):
+            if season_context is None:
+                context = season_context = SeasonDataContext(week, season, data_dir, cache)
+                for source in OPTIONAL_SOURCES:
+                    try:
+                        getattr(context, source)
+                    except FileNotFoundError:
+                        logger.info("No %s for %s; skipping it", source, season)
+            else:
+                context = season_context.for_week(week)
+            try:
+                context.preload()
+            except FileNotFoundError as e:
+                logger.warning("Skipping %s week %d: %s", season, week, e)
+                continue
+            compiled[season].append(week)
+    return compiled
+
+
+def main(argv=None):
+    """Compile the raw data tree into the memory-mapped cache from the command line."""
+    parser = argparse.ArgumentParser(description="Compile the raw data into the memory-mapped data store.")
+    parser.add_argument('--seasons', nargs='+', default=[config.SEASON], help="Seasons to compile")
+    parser.add_argument('--weeks', nargs='+', type=int,
+                        help="Weeks to compile (default: every week with a matchup file)")
+    parser.add_argument('--cache-dir', default=config.CACHE_DIR, help="Where to write the compiled store")
+    parser.add_argument('--clear', action='store_true', help="Remove every existing entry first")
+    args = parser.parse_args(argv)
+
+    cache = ParsedDataCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+    compiled = compile_data(args.seasons, args.weeks, cache=cache)
+    entries = [os.path.join(args.cache_dir, filename) for filename in os.listdir(args.cache_dir)
+               if filename.endswith(ENTRY_SUFFIX)]
+    size = sum(os.path.getsize(path) for path in entries)
+    for season, weeks in compiled.items():
+        print(f"{season}: weeks {', '.join(map(str, weeks)) or 'none'}")
+    print(f"{len(entries)} entries, {size / 1024:,.0f} KB in {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,20 +14,29 @@
 
 # Data directory
 DATA_DIR = "../data/raw/"
+# Parsed-data cache directory
+CACHE_DIR = "../data/cache/"
+# Historical box-score stats, one directory per season
+STATS_DIR = "../stats/"
 
-# Define Week
+# Define Season and Week
+SEASON = "2024"
 WEEK_NUM = 5
 
 # File paths
 FTN_PROJECTIONS_FILE = f"../data/raw/projections/2024/week3/ftn_all_projections.csv"
 PLAY_RATES_FILE = f"{DATA_DIR}misc/play_rates.csv"
 HOME_ADV_FILE = f"{DATA_DIR}misc/home_adv.csv"
+# Optional overrides for the model's linear maps (see calibration.py)
+CALIBRATION_FILE = f"{DATA_DIR}misc/calibration.yaml"
 # AVERAGE_TEMPERATURE_FILE = f"{DATA_DIR}misc/avg_tmp.csv"
-MATCHUPS_FILE = f"{DATA_DIR}matchups/2024/matchups_week_{WEEK_NUM}.yaml"
+MATCHUPS_FILE = f"{DATA_DIR}matchups/{SEASON}/matchups_week_{WEEK_NUM}.yaml"
 # PROJECTED_OLINE_VALUE_FILE = f"{DATA_DIR}dvoa/oline_delta.csv"
 ELO_FILE = f"{DATA_DIR}elo/nfelo-power-rankings.csv"
 
 # Constants
 # POSITIONS = ['QB', 'WR', 'RB', 'TE']
 YEARS = ["2024", "2023", "2022", "2021"]
+# Divisor applied to each year's attempts when weighting player DVOA
+YEARLY_WEIGHTS = {"2024": 1, "2023": 2, "2022": 4, "2021": 8}
 
@@ -0,0 +1,213 @@
+"""
+Season Data Context Module
+--------------------------
+This module defines the SeasonDataContext class, which owns every data source the
+projection model reads for one season and week (DVOA, DAVE, PFF, projections,
+pass rates, home field advantage, Elo, the week's matchups, final scores and
+historical box-score stats). Each source is loaded lazily on first access and
+exactly once, and the context is shared by every Matchup and Team built for that
+week. Projected players and historical stats rows are given ids from the
+process-wide player crosswalk, which joins them to DVOA and PFF. When given a
+ParsedDataCache, each source is read from the on-disk cache unless its files have changed.
+
+DVOA and PFF are read for the context's data years. The live season uses
+config.YEARS, which includes the season itself; any other season defaults to the
+years before it, and Backtest always asks for those, so no past week is projected
+with data from later in or after its season.
+"""
+
+import os
+from functools import cached_property, wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import config
+from data_loader import (ParsedDataCache, load_elo_data, load_home_field_advantage, load_pass_rates,
+                         load_results, load_yaml_data)
+from dvoa import DVOA, prior_years
+from dvoa_store import DVOAStore
+from historical_stats import HistoricalStats
+from pff import PFF, PFFGrades, PassingGrades
+from player_ids import PlayerCrosswalk, get_crosswalk
+from profiling import span
+from projections import Projections
+from stats_store import StatsStore
+from weighted_dvoa import WeightedDVOA
+
+
+def _week_independent(method: Callable[["SeasonDataContext"], Any]) -> cached_property:
+    """Cache a source that is shared by every week of a season."""
+    @wraps(method)
+    def wrapper(self: "SeasonDataContext") -> Any:
+        if self._season_context is not None:
+            return getattr(self._season_context, method.__name__)
+        return method(self)
+    return cached_property(wrapper)
+
+
+class SeasonDataContext:
+    """Lazily loaded, shared data sources for one season and week."""
+
+    # Sources the projection model reads; Elo, results and historical stats are loaded only when asked for
+    SOURCES = ('dvoa', 'dave', 'pff', 'projections', 'weighted_dvoa', 'passing_grades', 'pass_rates',
+               'home_field_advantage', 'matchups')
+
+    def __init__(self, week: int = config.WEEK_NUM, season: str = config.SEASON, data_dir: str = config.DATA_DIR,
+                 cache: Optional[ParsedDataCache] = None, data_years: Optional[Sequence[str]] = None):
+        """
+        Args:
+            week (int): The week to project.
+            season (str): The season to project.
+            data_dir (str): Root of the raw data tree.
+            cache (Optional[ParsedDataCache]): Cache the sources are read through.
+            data_years (Optional[Sequence[str]]): Years of DVOA and PFF data to read, most recent first
+                (default: config.YEARS for the live season, the years before it for any other).
+        """
+        self.week = week
+        self.season = season
+        self.data_dir = data_dir
+        self.cache = cache
+        if data_years is None:
+            data_years = config.YEARS if season == config.SEASON else prior_years(season, data_dir)
+        self.data_years = tuple(data_years)
+        self._season_context: Optional[SeasonDataContext] = None
+
+    def for_week(self, week: int) -> "SeasonDataContext":
+        """Return a context for another week of the season.
+
+        The new context shares every week-independent source (DVOA, DAVE, PFF, pass
+        rates, home advantage, Elo, results) with this one, so each is loaded once
+        per season no matter how many weeks are run.
+        """
+        context = SeasonDataContext(week, self.season, self.data_dir, self.cache, self.data_years)
+        context._season_context = self._season_context or self
+        return context
+
+    def _load(self, name: str, source_files: List[str], loader: Callable[[], Any]) -> Any:
+        """Run a loader, going through the parsed-data cache when one is configured."""
+        with span(f"load.{name}"):
+            if self.cache is None:
+                return loader()
+            return self.cache.load(name, source_files, loader)
+
+    @_week_independent
+    def _dvoa_source(self) -> DVOA:
+        """Return the DVOA loader, which reads both DVOA and DAVE files."""
+        return DVOA(self.data_dir, self.data_years)
+
+    @_week_independent
+    def dvoa(self) -> DVOAStore:
+        """Return the columnar DVOA store."""
+        source = self._dvoa_source
+        return self._load('dvoa', source.get_source_files(), source.get_data)
+
+    @_week_independent
+    def dave(self) -> Dict:
+        """Return DAVE data keyed by team."""
+        source = self._dvoa_source
+        return self._load('dave', [source.get_dave_file()], source.get_dave)
+
+    @property
+    def pff_season(self) -> Optional[str]:
+        """Return the season PFF grades are read from: the latest data year, if PFF has it."""
+        season = self.data_years[0] if self.data_years else None
+        return season if season is not None and os.path.isdir(f"{self.data_dir}pff/{season}") else None
+
+    @_week_independent
+    def pff(self) -> Dict:
+        """Return PFF grades keyed by season and category (empty without a PFF season)."""
+        source = PFF(self.data_dir, self.pff_season)
+        return self._load('pff', source.get_source_files(), source.get_data)
+
+    @property
+    def pff_passing(self) -> PFFGrades:
+        """Return the PFF passing grades of the PFF season (an empty table without one)."""
+        return self.pff.get(self.pff_season, {}).get("Passing", PFFGrades())
+
+    @_week_independent
+    def player_ids(self) -> PlayerCrosswalk:
+        """Return the player crosswalk, with every DVOA and PFF player registered."""
+        crosswalk = get_crosswalk(f"{self.data_dir}misc/player_ids.json")
+        dvoa, pff_passing = self.dvoa, self.pff_passing
+        with span("load.player_ids"):
+            crosswalk.register_all("dvoa", dvoa.players.names)
+            crosswalk.register_all("pff", pff_passing.names)
+            crosswalk.save_if_changed()
+        return crosswalk
+
+    @cached_property
+    def projections(self) -> Projections:
+        """Return the week's player projections, each player carrying its crosswalk id."""
+        source = Projections(self.week, self.season, self.data_dir)
+        projections = self._load('projections', source.get_source_files(), source.load)
+        players, crosswalk = projections.get_players(), self.player_ids
+        projections.table.assign_ids(crosswalk.register_all("projections", (player.name for player in players)))
+        crosswalk.save_if_changed()
+        return projections
+
+    @cached_property
+    def weighted_dvoa(self) -> WeightedDVOA:
+        """Return weighted DVOA for every projected player."""
+        players, dvoa = self.projections.get_players(), self.dvoa
+        with span("load.weighted_dvoa"):
+            return WeightedDVOA(players, dvoa, self.player_ids)
+
+    @cached_property
+    def passing_grades(self) -> PassingGrades:
+        """Return the PFF passing grade of every projected player."""
+        players, pff_passing = self.projections.get_players(), self.pff_passing
+        with span("load.passing_grades"):
+            return PassingGrades(players, pff_passing, self.player_ids)
+
+    @_week_independent
+    def pass_rates(self) -> Dict[str, List[Tuple[float, float]]]:
+        """Return offensive and defensive pass rates keyed by team."""
+        file_path = f"{self.data_dir}misc/play_rates.csv"
+        return self._load('pass_rates', [file_path], lambda: load_pass_rates(file_path))
+
+    @_week_independent
+    def home_field_advantage(self) -> Dict[str, List[str]]:
+        """Return home field advantage keyed by team."""
+        file_path = f"{self.data_dir}misc/home_adv.csv"
+        return self._load('home_adv', [file_path], lambda: load_home_field_advantage(file_path))
+
+    @_week_independent
+    def elo(self) -> Dict[str, Dict[str, str]]:
+        """Return Elo power rankings keyed by team."""
+        file_path = f"{self.data_dir}elo/nfelo-power-rankings.csv"
+        return self._load('elo', [file_path], lambda: load_elo_data(file_path))
+
+    @property
+    def matchups_file(self) -> str:
+        """Return the week's matchup file (YAML, or JSON for older seasons)."""
+        file_path = f"{self.data_dir}matchups/{self.season}/matchups_week_{self.week}.yaml"
+        json_path = f"{file_path[:-len('.yaml')]}.json"
+        return json_path if not os.path.exists(file_path) and os.path.exists(json_path) else file_path
+
+    @cached_property
+    def matchups(self) -> List[Dict]:
+        """Return the week's matchups."""
+        file_path = self.matchups_file
+        return self._load('matchups', [file_path], lambda: load_yaml_data(file_path))
+
+    @_week_independent
+    def results(self) -> Dict[Tuple[int, str, str], Tuple[float, float]]:
+        """Return the season's final scores keyed by (week, home, away)."""
+        file_path = f"{self.data_dir}results/{self.season}/results.csv"
+        return self._load('results', [file_path], lambda: load_results(file_path))
+
+    @_week_independent
+    def historical_stats(self) -> StatsStore:
+        """Return every season's box-score stats, each row carrying its crosswalk id."""
+        source = HistoricalStats(config.STATS_DIR)
+        store = self._load('historical_stats', source.get_source_files(), source.get_data)
+        crosswalk = self.player_ids
+        with span("load.historical_stats.ids"):
+            for table in store.tables:
+                table.assign_ids(crosswalk.register_all("stats", table.names))
+            crosswalk.save_if_changed()
+        return store
+
+    def preload(self, sources: Tuple[str, ...] = None):
+        """Load the given sources (all of them by default) up front."""
+        for source in sources or self.SOURCES:
+            getattr(self, source)
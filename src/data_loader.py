@@ -6,13 +6,39 @@ It provides functions to:
 * Load CSV and JSON data
 * Process player data for specific positions
 * Load and process data for all positions, merging weekly and season projections
+* Cache parsed loader results on disk, keyed by the source files they came from, as
+  memory-mapped entries whose array columns are shared zero-copy between processes
 
 """
 
 import csv
-from typing import Dict, List, Callable, Tuple
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+from typing import Any, Dict, List, Callable, Optional, Sequence, Tuple
 import config
 import yaml
+from utils import safe_float
+
+logger = logging.getLogger(__name__)
+
+# Bump when the structure of any cached loader result changes
+CACHE_VERSION = 6
+
+# Cache entry file layout: magic, header length, pickled header, then the data region
+ENTRY_SUFFIX = ".map"
+ENTRY_MAGIC = b"NFLCACHE"
+ENTRY_HEADER = struct.Struct("<Q")
+# Alignment of the data region and of every mapped buffer within it
+ENTRY_ALIGNMENT = 64
+# Array buffers smaller than this are kept inside the pickle stream rather than mapped
+MIN_MAPPED_BYTES = 1024
+
+# (path, size, mtime in ns, content hash)
+SourceStamp = Tuple[str, int, int, str]
 
 
 def load_yaml_data(file_path: str) -> List[Dict]:
@@ -33,10 +59,10 @@ def load_yaml_data(file_path: str) -> List[Dict]:
         with open(file_path, 'r', encoding='utf-8') as file:
             return yaml.safe_load(file)
     except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
+        logger.error("File '%s' not found.", file_path)
         raise
     except yaml.YAMLError as e:
-        print(f"Error parsing YAML file: {e}")
+        logger.error("Error parsing YAML file: %s", e)
         raise
 
 
@@ -52,3 +78,248 @@ def load_ftn_data(file_path: str) -> Dict[str, List[Tuple[str, Dict]]]:
             player = row['Player']
             team_data.setdefault(team, []).append((player, row))
     return team_data
+
+
+def load_pass_rates(file_path: str = config.PLAY_RATES_FILE) -> Dict[str, List[Tuple[float, float]]]:
+    """Load pass rates for each team from a CSV file."""
+    team_data = {}
+    with open(file_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            try:
+                team = row['Team']
+                off_pass_rate = safe_float(row['OffPassRate'])
+                def_pass_rate = safe_float(row['DefPassRate'])
+                team_data.setdefault(team, []).append(
+                    (off_pass_rate, def_pass_rate))
+            except KeyError:
+                continue
+    return team_data
+
+
+def load_home_field_advantage(file_path: str = config.HOME_ADV_FILE) -> Dict[str, List[str]]:
+    """Load home field advantage data from a CSV file."""
+    with open(file_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        return {row['Team']: [row['Adv']] for row in reader}
+
+
+def load_elo_data(file_path: str = config.ELO_FILE) -> Dict[str, Dict[str, str]]:
+    """Load Elo power rankings from a CSV file, keyed by team."""
+    with open(file_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        return {row['Team']: row for row in reader}
+
+
+def load_results(file_path: str) -> Dict[Tuple[int, str, str], Tuple[float, float]]:
+    """
+    Load final scores from a CSV file with week, home, away, home_score and away_score columns.
+
+    Returns:
+        Dict[Tuple[int, str, str], Tuple[float, float]]: (home_score, away_score) keyed by (week, home, away).
+    """
+    results = {}
+    with open(file_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            try:
+                key = (int(row['week']), row['home'], row['away'])
+                results[key] = (float(row['home_score']), float(row['away_score']))
+            except (KeyError, ValueError):
+                continue
+    return results
+
+
+def _aligned(offset: int) -> int:
+    """Round an offset up to the entry alignment."""
+    return -(-offset // ENTRY_ALIGNMENT) * ENTRY_ALIGNMENT
+
+
+def write_mapped(file_path: str, header: Dict[str, Any], data: Any):
+    """
+    Write an object as a memory-mappable entry.
+
+    The object is pickled with protocol 5, which hands every contiguous array
+    buffer to the writer instead of copying it into the stream. Buffers of at
+    least MIN_MAPPED_BYTES are written to their own aligned region after the
+    stream, so read_mapped() can rebuild the arrays directly over the mapped file.
+
+    Args:
+        file_path (str): Where to write the entry.
+        header (Dict[str, Any]): Small metadata stored ahead of the data.
+        data (Any): The object to store.
+    """
+    buffers: List[pickle.PickleBuffer] = []
+
+    def out_of_band(buffer: pickle.PickleBuffer) -> bool:
+        if buffer.raw().nbytes < MIN_MAPPED_BYTES:
+            return True
+        buffers.append(buffer)
+        return False
+
+    stream = pickle.dumps(data, protocol=5, buffer_callback=out_of_band)
+    layout, offset = [], _aligned(len(stream))
+    for buffer in buffers:
+        layout.append((offset, buffer.raw().nbytes))
+        offset = _aligned(offset + buffer.raw().nbytes)
+    header_bytes = pickle.dumps(dict(header, stream=len(stream), buffers=layout), protocol=5)
+    data_start = _aligned(len(ENTRY_MAGIC) + ENTRY_HEADER.size + len(header_bytes))
+
+    with open(file_path, 'wb') as file:
+        file.write(ENTRY_MAGIC)
+        file.write(ENTRY_HEADER.pack(len(header_bytes)))
+        file.write(header_bytes)
+        file.seek(data_start)
+        file.write(stream)
+        for (buffer_offset, _), buffer in zip(layout, buffers):
+            file.seek(data_start + buffer_offset)
+            file.write(buffer.raw())
+
+
+def read_mapped(file_path: str) -> Tuple[Dict[str, Any], Callable[[], Any]]:
+    """
+    Map an entry written by write_mapped() and read its header.
+
+    The file is mapped copy-on-write: pages are read lazily and shared through
+    the page cache by every process mapping the same entry, and an array written
+    in place only copies the pages it touches.
+
+    Returns:
+        Tuple[Dict[str, Any], Callable[[], Any]]: The header, and a function that
+        unpickles the data with its large arrays as zero-copy views of the file.
+
+    Raises:
+        OSError: If the file cannot be opened or mapped.
+        ValueError: If the file is not a mapped entry.
+    """
+    with open(file_path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    view = memoryview(mapped)
+    header_start = len(ENTRY_MAGIC) + ENTRY_HEADER.size
+    if len(view) < header_start or view[:len(ENTRY_MAGIC)] != ENTRY_MAGIC:
+        raise ValueError(f"{file_path} is not a mapped cache entry")
+    (header_length,) = ENTRY_HEADER.unpack_from(view, len(ENTRY_MAGIC))
+    header = pickle.loads(view[header_start:header_start + header_length])
+    data_start = _aligned(header_start + header_length)
+
+    def load() -> Any:
+        stream = view[data_start:data_start + header['stream']]
+        buffers = [view[data_start + offset:data_start + offset + length] for offset, length in header['buffers']]
+        return pickle.loads(stream, buffers=buffers)
+
+    return header, load
+
+
+class ParsedDataCache:
+    """
+    On-disk cache of parsed loader results.
+
+    Each entry holds one loader's typed result together with a stamp of every
+    source file it was parsed from: path, size, mtime and content hash. An entry is
+    reused while each source keeps its size and mtime, or, when those change, still
+    hashes to the same content. Any other change re-runs the loader.
+
+    Entries are written with write_mapped() and opened with read_mapped(), so the
+    array columns of a cached result (DVOA tables, projection tables, historical
+    stats) are views of the mapped file rather than copies: every process reading
+    the same entry shares one page-cache copy of them.
+    """
+
+    def __init__(self, cache_dir: str = config.CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def load(self, name: str, source_files: Sequence[str], loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for a loader, re-running it if any source changed.
+
+        Args:
+            name (str): The loader's name, e.g. 'dvoa' or 'projections'.
+            source_files (Sequence[str]): Every file the loader reads.
+            loader (Callable[[], Any]): Parses the sources and returns the result.
+        """
+        entry_path = self._entry_path(name, source_files)
+        entry = self._read_entry(entry_path)
+        if entry is not None:
+            header, load_data = entry
+            stamps = self._revalidate(header['sources'])
+            data = self._load_data(entry_path, load_data) if stamps is not None else None
+            if data is not None:
+                logger.debug("Cache hit for %s", name)
+                if stamps != header['sources']:
+                    self._write_entry(entry_path, stamps, data)
+                return data
+
+        logger.debug("Cache miss for %s; parsing %d source files", name, len(source_files))
+        stamps = [self._stamp(path) for path in source_files]
+        data = loader()
+        self._write_entry(entry_path, stamps, data)
+        return data
+
+    def clear(self):
+        """Remove every cache entry."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for filename in os.listdir(self.cache_dir):
+            # .pkl entries were written by earlier versions of the cache
+            if filename.endswith((ENTRY_SUFFIX, '.pkl')):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    def _entry_path(self, name: str, source_files: Sequence[str]) -> str:
+        """Return the cache file for a loader and its set of sources."""
+        sources_key = hashlib.blake2b('\n'.join(os.path.abspath(path) for path in source_files).encode(),
+                                      digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}-{sources_key}{ENTRY_SUFFIX}")
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """Return the content hash of a file."""
+        with open(path, 'rb') as file:
+            return hashlib.blake2b(file.read(), digest_size=16).hexdigest()
+
+    def _stamp(self, path: str) -> SourceStamp:
+        """Return the current stamp of a source file."""
+        stat = os.stat(path)
+        return path, stat.st_size, stat.st_mtime_ns, self._hash_file(path)
+
+    def _revalidate(self, stamps: List[SourceStamp]) -> Optional[List[SourceStamp]]:
+        """Return refreshed stamps if every source is unchanged, or None if any changed."""
+        refreshed = []
+        for path, size, mtime_ns, digest in stamps:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return None
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                refreshed.append((path, size, mtime_ns, digest))
+            elif stat.st_size == size and self._hash_file(path) == digest:
+                refreshed.append((path, size, stat.st_mtime_ns, digest))
+            else:
+                return None
+        return refreshed
+
+    @staticmethod
+    def _read_entry(entry_path: str) -> Optional[Tuple[Dict[str, Any], Callable[[], Any]]]:
+        """Map a cache entry, returning None if it is missing, from another version or unreadable."""
+        try:
+            header, load_data = read_mapped(entry_path)
+        except (OSError, ValueError, struct.error, pickle.UnpicklingError, EOFError):
+            return None
+        if header.get('version') != CACHE_VERSION:
+            return None
+        return header, load_data
+
+    @staticmethod
+    def _load_data(entry_path: str, load_data: Callable[[], Any]) -> Optional[Any]:
+        """Unpickle a mapped entry's data, returning None if it no longer matches the code."""
+        try:
+            return load_data()
+        except (ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as exc:
+            logger.debug("Ignoring unreadable cache entry %s: %s", entry_path, exc)
+            return None
+
+    def _write_entry(self, entry_path: str, stamps: List[SourceStamp], data: Any):
+        """Atomically write a cache entry."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        write_mapped(temp_path, {'version': CACHE_VERSION, 'sources': stamps}, data)
+        os.replace(temp_path, entry_path)
@@ -6,19 +6,36 @@ for NFL teams and players across multiple years and categories.
 """
 
 import csv
-from typing import Dict, List, Tuple
+import os
+from functools import cached_property
+from typing import Dict, List, Sequence, Tuple
 import config
 import utils
+from dvoa_store import DVOARecord, DVOAStore, DVOATable, PLAYER_CATEGORIES, TEAM_CATEGORIES
+from player_ids import normalize_name
 
 class DVOA:
     """Manages DVOA data for NFL teams and players."""
 
-    def __init__(self):
-        """Initialize DVOA instance with all DVOA data and DAVE data."""
-        self.data = self._load_all_dvoa_data()
-        self.dave = self._load_dave_data()
+    PLAYER_FILES = ("passing_dvoa.csv", "rushing_dvoa.csv", "receiving_dvoa.csv")
+    TEAM_FILES = ("dvoa_adjusted_line_yards.csv", "team_defense_dvoa.csv")
 
-    def get_data(self) -> Dict:
+    def __init__(self, data_dir: str = config.DATA_DIR, years: Sequence[str] = config.YEARS):
+        """Initialize DVOA instance for the given years (most recent first); data is loaded on first access."""
+        self.data_dir = data_dir
+        self.years = list(years)
+
+    @cached_property
+    def data(self) -> DVOAStore:
+        """All DVOA data, loaded on first access."""
+        return self._load_all_dvoa_data()
+
+    @cached_property
+    def dave(self) -> Dict[str, List[Tuple[str, str, str]]]:
+        """DAVE data, loaded on first access."""
+        return self._load_dave_data()
+
+    def get_data(self) -> DVOAStore:
         """Return all DVOA data."""
         return self.data
 
@@ -26,10 +43,23 @@ class DVOA:
         """Return DAVE (DVOA Adjusted for Variation Early) data."""
         return self.dave
 
+    def get_source_files(self) -> List[str]:
+        """Return every file the DVOA data is loaded from."""
+        return [self._dvoa_file(year, filename) for year in self.years
+                for filename in self.PLAYER_FILES + self.TEAM_FILES]
+
+    def get_dave_file(self) -> str:
+        """Return the file the DAVE data is loaded from."""
+        return f"{self.data_dir}dvoa/dave.csv"
+
+    def _dvoa_file(self, year: str, filename: str) -> str:
+        """Return the path of a DVOA file for a specific year."""
+        return f"{self.data_dir}dvoa/{year}/{filename}"
+
     def _load_dave_data(self) -> Dict[str, List[Tuple[str, str, str]]]:
         """Load DAVE data from CSV file."""
         team_data = {}
-        file_path = "../data/raw/dvoa/dave.csv"
+        file_path = self.get_dave_file()
         with open(file_path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -38,25 +68,33 @@ class DVOA:
                 team_data.setdefault(team, []).append(dave_values)
         return team_data 
 
-    def _load_all_dvoa_data(self) -> Dict[int, Dict[str, Dict]]:
-        """Load all DVOA data for configured years."""
-        data = {}
-        for year in config.YEARS:
-            data[year] = {
-                "Passing": self._get_passing_dvoa(year),
-                "Rushing": self._get_rush_dvoa(year),
-                "Receiving": self._get_rec_dvoa(year),
-                "OL Pass": self._get_ol_dvoa(year, "Pass"),
-                "OL Run": self._get_ol_dvoa(year, "Rush"),
-                "Defense Pass": self._get_def_dvoa(year, "Pass"),
-                "Defense Rush": self._get_def_dvoa(year, "Rush")
-            }
-        return data
-
-    def _get_def_dvoa(self, year: int, group: str) -> Dict[str, List[float]]:
+    def _load_all_dvoa_data(self) -> DVOAStore:
+        """Load all DVOA data for the loader's years into columnar player and team tables."""
+        player_records: List[DVOARecord] = []
+        team_records: List[DVOARecord] = []
+        for year in self.years:
+            for category, rows in (
+                ("Passing", self._get_passing_dvoa(year)),
+                ("Rushing", self._get_rush_dvoa(year)),
+                ("Receiving", self._get_rec_dvoa(year))
+            ):
+                player_records.extend((name, year, category, dvoa, att) for name, dvoa, att in rows)
+            for category, rows in (
+                ("OL Pass", self._get_ol_dvoa(year, "Pass")),
+                ("OL Run", self._get_ol_dvoa(year, "Rush")),
+                ("Defense Pass", self._get_def_dvoa(year, "Pass")),
+                ("Defense Rush", self._get_def_dvoa(year, "Rush"))
+            ):
+                team_records.extend((team, year, category, value, 1.0) for team, value in rows)
+        return DVOAStore(
+            players=DVOATable(self.years, PLAYER_CATEGORIES, player_records),
+            teams=DVOATable(self.years, TEAM_CATEGORIES, team_records)
+        )
+
+    def _get_def_dvoa(self, year: str, group: str) -> List[Tuple[str, float]]:
         """Load defensive DVOA data for a specific year and group (Pass/Rush)."""
-        team_data = {}
-        file_path = f"../data/raw/dvoa/{year}/team_defense_dvoa.csv"
+        team_data = []
+        file_path = self._dvoa_file(year, "team_defense_dvoa.csv")
         with open(file_path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -70,13 +108,13 @@ class DVOA:
                     def_dvoa = self._convert_strpct_to_float(row['RUSH'])
                 else:
                     raise ValueError(f"Invalid group type for DEF: {group}")
-                team_data.setdefault(team, []).append(def_dvoa)
-        return team_data 
+                team_data.append((team, def_dvoa))
+        return team_data
 
-    def _get_ol_dvoa(self, year: int, group: str) -> Dict[str, List[float]]:
+    def _get_ol_dvoa(self, year: str, group: str) -> List[Tuple[str, float]]:
         """Load offensive line DVOA data for a specific year and group (Pass/Rush)."""
-        team_data = {}
-        file_path = f"../data/raw/dvoa/{year}/dvoa_adjusted_line_yards.csv"
+        team_data = []
+        file_path = self._dvoa_file(year, "dvoa_adjusted_line_yards.csv")
         with open(file_path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
@@ -87,38 +125,46 @@ class DVOA:
                     ol_dvoa = utils.safe_float(row['ALYards'])
                 else:
                     raise ValueError(f"Invalid group type for OL: {group}")
-                team_data.setdefault(team, []).append(ol_dvoa)
-        return team_data 
+                team_data.append((team, ol_dvoa))
+        return team_data
 
-    def _get_rec_dvoa(self, year: int) -> Dict[str, List[Tuple[float, float]]]:
+    def _get_rec_dvoa(self, year: str) -> List[Tuple[str, float, float]]:
         """Load receiving DVOA data for a specific year."""
         return self._load_player_dvoa(year, "receiving_dvoa.csv", 'DVOA', 'TAR')
 
-    def _get_rush_dvoa(self, year: int) -> Dict[str, List[Tuple[float, float]]]:
+    def _get_rush_dvoa(self, year: str) -> List[Tuple[str, float, float]]:
         """Load rushing DVOA data for a specific year."""
         return self._load_player_dvoa(year, "rushing_dvoa.csv", 'DVOA', 'ATT')
 
-    def _get_passing_dvoa(self, year: int) -> Dict[str, List[Tuple[float, float]]]:
+    def _get_passing_dvoa(self, year: str) -> List[Tuple[str, float, float]]:
         """Load passing DVOA data for a specific year."""
         return self._load_player_dvoa(year, "passing_dvoa.csv", 'DVOA', 'ATT')
 
-    def _load_player_dvoa(self, year: int, filename: str, dvoa_col: str, att_col: str) -> Dict[str, List[Tuple[float, float]]]:
-        """Generic method to load player DVOA data."""
-        player_data = {}
-        file_path = f"../data/raw/dvoa/{year}/{filename}"
+    def _load_player_dvoa(self, year: str, filename: str, dvoa_col: str, att_col: str) -> List[Tuple[str, float, float]]:
+        """Generic method to load (player, dvoa, attempts) rows from a DVOA file."""
+        player_data = []
+        file_path = self._dvoa_file(year, filename)
         with open(file_path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
-                player_name = row['Player'].lower()
+                player_name = normalize_name(row['Player'])
                 try:
                     dvoa = self._convert_strpct_to_float(row[dvoa_col])
                     attempts = float(row[att_col])
                 except ValueError:
                     dvoa, attempts = 0, 1
-                player_data.setdefault(player_name, []).append((dvoa, attempts))
+                player_data.append((player_name, dvoa, attempts))
         return player_data
 
     @staticmethod
     def _convert_strpct_to_float(str_pct: str) -> float:
         """Convert string percentage to float."""
-        return float(str_pct.strip('%"\'')) / 100
\ No newline at end of file
+        return float(str_pct.strip('%"\'')) / 100
+
+
+def prior_years(season: str, data_dir: str = config.DATA_DIR, count: int = len(config.YEARS)) -> List[str]:
+    """Return up to count years before the season with every DVOA file present, most recent first."""
+    years = [str(year) for year in range(int(season) - 1, int(season) - 1 - count, -1)]
+    return [year for year in years
+            if all(os.path.exists(f"{data_dir}dvoa/{year}/{filename}")
+                   for filename in DVOA.PLAYER_FILES + DVOA.TEAM_FILES)]
@@ -0,0 +1,139 @@
+"""
+DVOA Store Module
+-----------------
+This module defines the columnar, NumPy-backed storage used for DVOA data.
+Each DVOATable holds one kind of entity (players or teams) as
+entity x year x category arrays of values and attempts, so the same data can be
+read as point lookups or as whole-league array views.
+"""
+
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+import config
+
+PLAYER_CATEGORIES = ("Passing", "Rushing", "Receiving")
+TEAM_CATEGORIES = ("OL Pass", "OL Run", "Defense Pass", "Defense Rush")
+
+# (entity name, year, category, value, attempts)
+DVOARecord = Tuple[str, str, str, float, float]
+
+
+class DVOATable:
+    """Columnar DVOA values and attempts for one kind of entity."""
+
+    __slots__ = ['years', 'categories', 'names', 'values', 'attempts', 'present',
+                 '_index', '_year_index', '_category_index']
+
+    def __init__(self, years: Sequence[str], categories: Sequence[str], records: Iterable[DVOARecord]):
+        """Build the table from (name, year, category, value, attempts) records.
+
+        The first record seen for a given name/year/category wins, matching the
+        order the source CSVs list players in.
+        """
+        self.years = tuple(years)
+        self.categories = tuple(categories)
+        self._year_index = {year: i for i, year in enumerate(self.years)}
+        self._category_index = {category: i for i, category in enumerate(self.categories)}
+        self._index: Dict[str, int] = {}
+
+        coords, values, attempts = [], [], []
+        seen = set()
+        for name, year, category, value, attempt in records:
+            entity_id = self._index.setdefault(name, len(self._index))
+            coord = (entity_id, self._year_index[year], self._category_index[category])
+            if coord in seen:
+                continue
+            seen.add(coord)
+            coords.append(coord)
+            values.append(value)
+            attempts.append(attempt)
+
+        self.names = tuple(self._index)
+        shape = (len(self.names), len(self.years), len(self.categories))
+        self.values = np.zeros(shape)
+        self.attempts = np.zeros(shape)
+        self.present = np.zeros(shape, dtype=bool)
+        if coords:
+            index = tuple(np.array(coords).T)
+            self.values[index] = values
+            self.attempts[index] = attempts
+            self.present[index] = True
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def id_of(self, name: str) -> int:
+        """Return the row id for an entity, or -1 if it is not in the table."""
+        return self._index.get(name, -1)
+
+    def ids_of(self, names: Iterable[str]) -> np.ndarray:
+        """Return row ids for many entities at once (-1 for unknown names)."""
+        return np.array([self._index.get(name, -1) for name in names], dtype=np.int64)
+
+    def get(self, name: str, year: str, category: str) -> Tuple[float, float]:
+        """Return the (value, attempts) pair for one entity, year and category.
+
+        Raises:
+            KeyError: If the entity has no entry for that year and category.
+        """
+        coord = (self._index[name], self._year_index[year], self._category_index[category])
+        if not self.present[coord]:
+            raise KeyError(f"No {category} DVOA for {name} in {year}")
+        return float(self.values[coord]), float(self.attempts[coord])
+
+    def values_of(self, name: str, category: str) -> np.ndarray:
+        """Return one entity's values across all years (missing years are 0).
+
+        Raises:
+            KeyError: If the entity is not in the table.
+        """
+        return self.values[self._index[name], :, self._category_index[category]]
+
+    def attempts_of(self, name: str, category: str) -> np.ndarray:
+        """Return one entity's attempts across all years (missing years are 0)."""
+        return self.attempts[self._index[name], :, self._category_index[category]]
+
+    def column(self, category: str) -> np.ndarray:
+        """Return a league-wide entity x year view of values for a category."""
+        return self.values[:, :, self._category_index[category]]
+
+    def attempts_column(self, category: str) -> np.ndarray:
+        """Return a league-wide entity x year view of attempts for a category."""
+        return self.attempts[:, :, self._category_index[category]]
+
+    def weighted_average(self, category: str, year_divisors: np.ndarray) -> np.ndarray:
+        """Return every entity's attempt-weighted average across years.
+
+        Each year's attempts are divided by its entry in year_divisors (ordered like
+        self.years) before weighting. Entities without attempts get 0.
+        """
+        weighted_attempts = self.attempts_column(category) / year_divisors
+        total_attempts = weighted_attempts.sum(axis=1)
+        total_contribution = (self.column(category) * weighted_attempts).sum(axis=1)
+        return np.divide(total_contribution, total_attempts,
+                         out=np.zeros_like(total_attempts), where=total_attempts != 0)
+
+
+class DVOAStore:
+    """Player and team DVOA tables loaded for a set of years."""
+
+    __slots__ = ['players', 'teams']
+
+    def __init__(self, players: DVOATable, teams: DVOATable):
+        self.players = players
+        self.teams = teams
+
+    @property
+    def years(self) -> Tuple[str, ...]:
+        """Return the years covered by the store, most recent first."""
+        return self.players.years
+
+    @property
+    def year_divisors(self) -> np.ndarray:
+        """Return the divisor of each year's attempts by recency (config.YEARLY_WEIGHTS in order)."""
+        return np.array(list(config.YEARLY_WEIGHTS.values())[:len(self.years)], dtype=float)
@@ -0,0 +1,381 @@
+"""
+Calibration Fitting Module
+--------------------------
+This module fits the model's calibration (the linear maps that normalize each
+team value component, the component weights, the points maps and the win
+percentage slope) to final scores. HistoricalGames gathers, once, the raw input
+every map is applied to for both teams of every backtested game, so the whole
+model becomes a closed-form function of the calibration parameters. Evaluating it
+for a batch of parameter vectors is a few numpy operations over all games, which
+lets CalibrationFitter take thousands of BFGS steps (finite-difference gradients
+and line searches are each one batched evaluation) in well under a second. Fits
+minimize the squared error of the projected scores or the log-loss of the win
+percentages, shrunk toward the starting calibration, and can be cross-validated
+by holding out one week at a time.
+"""
+
+import argparse
+import fnmatch
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+import config
+from backtest import Backtest
+from calibration import CalibrationRegistry, get_calibration, load_calibration, use_calibration
+from data_loader import ParsedDataCache
+from matchup import WIN_PCT_BOUNDS
+
+# Maps applied to each team's raw inputs, in the column order of HistoricalGames.inputs
+INPUT_MAPS = ("Pass", "PFF Pass", "Rec", "OLPF", "Rush", "OLRF", "DPF", "DRF")
+FIT_MAPS = INPUT_MAPS + ("Points Turf", "Points Grass", "Win Pct")
+FIT_WEIGHTS = ('qb', 'rec', 'ol', 'rushing', 'ol_rush')
+# Parameter names: '<map>.slope', '<map>.intercept' and '<component>.weight'
+PARAMETERS = tuple(f"{name}.{part}" for name in FIT_MAPS for part in ('slope', 'intercept')) + \
+    tuple(f"{name}.weight" for name in FIT_WEIGHTS)
+PARAMETER_INDEX = {name: i for i, name in enumerate(PARAMETERS)}
+INPUT_SLOPES = [PARAMETER_INDEX[f"{name}.slope"] for name in INPUT_MAPS]
+INPUT_INTERCEPTS = [PARAMETER_INDEX[f"{name}.intercept"] for name in INPUT_MAPS]
+WEIGHTS = [PARAMETER_INDEX[f"{name}.weight"] for name in FIT_WEIGHTS]
+# Which parameters each objective depends on by default
+OBJECTIVES = {
+    'squared_error': tuple(name for name in PARAMETERS if not name.startswith("Win Pct")),
+    'log_loss': PARAMETERS
+}
+
+DEFAULT_REGULARIZATION = 0.01
+MAX_STEPS = 2000
+TOLERANCE = 1e-10
+
+
+def parameters_of(registry: CalibrationRegistry) -> np.ndarray:
+    """Return a calibration's values of PARAMETERS."""
+    lines = registry.lines()
+    values = []
+    for name in PARAMETERS:
+        key, part = name.rsplit('.', 1)
+        values.append(registry.weight(key) if part == 'weight' else lines[key][part == 'intercept'])
+    return np.array(values)
+
+
+def registry_of(parameters: np.ndarray, base: CalibrationRegistry) -> CalibrationRegistry:
+    """Return base with its PARAMETERS replaced by the given values."""
+    values = dict(zip(PARAMETERS, parameters.tolist()))
+    lines = {name: (values[f"{name}.slope"], values[f"{name}.intercept"]) for name in FIT_MAPS}
+    return base.updated(lines, {name: values[f"{name}.weight"] for name in FIT_WEIGHTS})
+
+
+class HistoricalGames:
+    """Every calibration-independent input of the model for a set of scored games, as arrays."""
+
+    __slots__ = ['seasons', 'weeks', 'inputs', 'pass_rates', 'home_advantage', 'precipitation_impact', 'turf',
+                 'home_score', 'away_score']
+
+    def __init__(self, seasons: np.ndarray, weeks: np.ndarray, inputs: np.ndarray, pass_rates: np.ndarray,
+                 home_advantage: np.ndarray, precipitation_impact: np.ndarray, turf: np.ndarray,
+                 home_score: np.ndarray, away_score: np.ndarray):
+        self.seasons = seasons
+        self.weeks = weeks
+        # (home, away) × games × INPUT_MAPS raw inputs
+        self.inputs = inputs
+        # (home, away) × games adjusted pass rates
+        self.pass_rates = pass_rates
+        self.home_advantage = home_advantage
+        self.precipitation_impact = precipitation_impact
+        self.turf = turf
+        self.home_score = home_score
+        self.away_score = away_score
+
+    @classmethod
+    def from_backtest(cls, backtest: Backtest) -> "HistoricalGames":
+        """Gather the inputs of every game a backtest has a Matchup and a final score for."""
+        seasons, weeks, inputs, pass_rates, conditions, scores = [], [], ([], []), [], [], []
+        for season, week, _, matchup, score in backtest.matchups:
+            seasons.append(season)
+            weeks.append(week)
+            for side, team in zip(inputs, (matchup.home_team, matchup.away_team)):
+                team_inputs = team.get_calibration_inputs()
+                side.append([team_inputs[name] for name in INPUT_MAPS])
+            pass_rates.append(matchup._get_adjusted_pass_rates())
+            conditions.append((float(matchup.home_adv[matchup.home_team.team_name][0]),
+                               matchup.weather_obj.calculate_precipitation_impact(), matchup.field_type == 'turf'))
+            scores.append(score)
+        conditions = np.array(conditions, dtype=float).reshape(-1, 3)
+        scores = np.array(scores, dtype=float).reshape(-1, 2)
+        return cls(np.array(seasons, dtype=str), np.array(weeks, dtype=int),
+                   np.array(inputs, dtype=float).reshape(2, -1, len(INPUT_MAPS)),
+                   np.array(pass_rates, dtype=float).reshape(-1, 2).T, conditions[:, 0], conditions[:, 1],
+                   conditions[:, 2].astype(bool), scores[:, 0], scores[:, 1])
+
+    def __len__(self) -> int:
+        return len(self.weeks)
+
+    def subset(self, mask: np.ndarray) -> "HistoricalGames":
+        """Return the games a boolean mask selects."""
+        return HistoricalGames(self.seasons[mask], self.weeks[mask], self.inputs[:, mask], self.pass_rates[:, mask],
+                               self.home_advantage[mask], self.precipitation_impact[mask], self.turf[mask],
+                               self.home_score[mask], self.away_score[mask])
+
+    def folds(self) -> List[Tuple[str, int]]:
+        """Return the distinct (season, week) pairs, in order."""
+        return sorted(set(zip(self.seasons.tolist(), self.weeks.tolist())))
+
+    def project(self, parameters: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Project every game under each of a batch of parameter vectors.
+
+        Args:
+            parameters (np.ndarray): batch × PARAMETERS values.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: batch × games home points, away
+            points and home win probabilities.
+        """
+        def apply(name: str, x: np.ndarray) -> np.ndarray:
+            """Apply a map to batch × ... values, each with its own parameter vector."""
+            shape = (-1,) + (1,) * (x.ndim - 1)
+            return (parameters[:, PARAMETER_INDEX[f"{name}.slope"]].reshape(shape) * x
+                    + parameters[:, PARAMETER_INDEX[f"{name}.intercept"]].reshape(shape))
+
+        # batch × (home, away) × games × INPUT_MAPS
+        mapped = (self.inputs * parameters[:, None, None, INPUT_SLOPES]
+                  + parameters[:, None, None, INPUT_INTERCEPTS])
+        weights = parameters[:, None, None, WEIGHTS]
+        off_pass = ((mapped[..., 0] + mapped[..., 1]) / 2 * weights[..., 0] + mapped[..., 2] * weights[..., 1]
+                    + mapped[..., 3] * weights[..., 2])
+        off_rush = mapped[..., 4] * weights[..., 3] + mapped[..., 5] * weights[..., 4]
+        # Each side against the other side's defense
+        def_pass, def_rush = mapped[:, ::-1, :, 6], mapped[:, ::-1, :, 7]
+        offensive_value = ((off_pass - def_pass) * self.pass_rates / 100
+                           + (off_rush - def_rush) * (100 - self.pass_rates) / 100 - self.precipitation_impact)
+        points = np.where(self.turf, apply("Points Turf", offensive_value), apply("Points Grass", offensive_value))
+        home_points = points[:, 0] + self.home_advantage / 2
+        away_points = points[:, 1] - self.home_advantage / 2
+        home_win = np.clip(apply("Win Pct", away_points - home_points) * 100, *WIN_PCT_BOUNDS) / 100
+        return home_points, away_points, home_win
+
+    def losses(self, parameters: np.ndarray, objective: str) -> np.ndarray:
+        """Return the mean loss over the games of each of a batch of parameter vectors.
+
+        'squared_error' is the mean squared error of both teams' projected points;
+        'log_loss' that of the home win probabilities (ties count as half a win).
+        """
+        home_points, away_points, home_win = self.project(parameters)
+        if objective == 'squared_error':
+            return (((home_points - self.home_score) ** 2 + (away_points - self.away_score) ** 2) / 2).mean(axis=1)
+        if objective == 'log_loss':
+            home_won = np.sign(self.home_score - self.away_score) / 2 + 0.5
+            return -(home_won * np.log(home_win) + (1 - home_won) * np.log(1 - home_win)).mean(axis=1)
+        raise ValueError(f"Unknown objective '{objective}'; expected one of {', '.join(OBJECTIVES)}")
+
+
+def minimize(function, start: np.ndarray, max_steps: int = MAX_STEPS,
+             tolerance: float = TOLERANCE) -> Tuple[np.ndarray, float, int, int]:
+    """
+    Minimize a batched function with BFGS.
+
+    function maps a batch × n array of points to their n values. Central-difference
+    gradients and the backtracking line search are each evaluated as one batch.
+
+    Returns:
+        Tuple[np.ndarray, float, int, int]: The minimum, its value, the steps taken and
+        the batched evaluations made.
+    """
+    size = len(start)
+    offsets = np.vstack([np.eye(size), -np.eye(size)]) * 1e-6
+    step_sizes = 0.5 ** np.arange(30)
+    evaluations = 0
+
+    def gradient(point: np.ndarray) -> np.ndarray:
+        nonlocal evaluations
+        evaluations += 1
+        values = function(point + offsets)
+        return (values[:size] - values[size:]) / 2e-6
+
+    point, value = start.astype(float), float(function(start[None, :])[0])
+    slope, inverse_hessian = gradient(point), np.eye(size)
+    steps = 0
+    for steps in range(1, max_steps + 1):
+        direction = -inverse_hessian @ slope
+        if slope @ direction >= 0:
+            inverse_hessian, direction = np.eye(size), -slope
+        values = function(point + step_sizes[:, None] * direction)
+        evaluations += 1
+        accepted = np.nonzero(values <= value + 1e-4 * step_sizes * (slope @ direction))[0]
+        if not len(accepted):
+            break
+        new_point, new_value = point + step_sizes[accepted[0]] * direction, float(values[accepted[0]])
+        new_slope = gradient(new_point)
+        moved, change = new_point - point, new_slope - slope
+        if moved @ change > 1e-12:
+            scale = 1 / (moved @ change)
+            update = np.eye(size) - scale * np.outer(moved, change)
+            inverse_hessian = update @ inverse_hessian @ update.T + scale * np.outer(moved, moved)
+        converged = value - new_value <= tolerance * (1 + abs(value))
+        point, value, slope = new_point, new_value, new_slope
+        if converged:
+            break
+    return point, value, steps, evaluations + 1
+
+
+class FitResult(NamedTuple):
+    """A fitted calibration and how it did on the games it was fitted to."""
+    calibration: CalibrationRegistry
+    # Fitted parameters that moved, as (before, after)
+    changes: Dict[str, Tuple[float, float]]
+    objective: str
+    games: int
+    base_loss: float
+    loss: float
+    steps: int
+    evaluations: int
+    seconds: float
+
+    def describe(self) -> str:
+        """Return a printable summary of the fit."""
+        lines = [f"{self.objective} over {self.games} games: {self.base_loss:.4f} -> {self.loss:.4f} "
+                 f"({self.steps} steps, {self.evaluations} batched evaluations, {self.seconds * 1000:.0f} ms)"]
+        lines.extend(f"  {name:<22} {before:>10.4f} -> {after:>10.4f}" for name, (before, after) in self.changes.items())
+        return "\n".join(lines)
+
+    def save(self, file_path: str):
+        """Write every fitted map and weight as a calibration file load_calibration can read."""
+        lines = self.calibration.lines()
+        entries = {name: {'slope': lines[name][0], 'intercept': lines[name][1]} for name in FIT_MAPS}
+        entries.update({name: {'weight': self.calibration.weight(name)} for name in FIT_WEIGHTS})
+        with open(file_path, 'w', encoding='utf-8') as file:
+            yaml.safe_dump(entries, file, sort_keys=False)
+
+
+class FoldResult(NamedTuple):
+    """Held-out loss of one week, before and after fitting to every other week."""
+    season: str
+    week: int
+    games: int
+    base_loss: float
+    loss: float
+
+
+class CalibrationFitter:
+    """Fits calibration parameters to historical games."""
+
+    def __init__(self, games: HistoricalGames, objective: str = 'squared_error',
+                 parameters: Optional[Sequence[str]] = None, base: Optional[CalibrationRegistry] = None,
+                 regularization: float = DEFAULT_REGULARIZATION):
+        """
+        Args:
+            games (HistoricalGames): Games to fit to.
+            objective (str): 'squared_error' (projected scores) or 'log_loss' (win percentages).
+            parameters (Sequence[str]): Names or fnmatch patterns of the PARAMETERS to fit
+                (default: every parameter the objective depends on).
+            base (CalibrationRegistry): Calibration to start from and shrink toward
+                (default: the model's current one).
+            regularization (float): Penalty, as a fraction of the starting loss, for moving a
+                parameter by its own magnitude; keeps redundant intercepts near the base.
+
+        Raises:
+            ValueError: If the objective is unknown or a pattern matches no parameter.
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective '{objective}'; expected one of {', '.join(OBJECTIVES)}")
+        self.games = games
+        self.objective = objective
+        self.base = base or get_calibration()
+        self.regularization = regularization
+        self.free = self._select(parameters or OBJECTIVES[objective])
+        self.start = parameters_of(self.base)
+        self.scale = np.maximum(np.abs(self.start[self.free]), 0.1)
+
+    @staticmethod
+    def _select(patterns: Sequence[str]) -> np.ndarray:
+        selected = []
+        for pattern in patterns:
+            matches = fnmatch.filter(PARAMETERS, pattern)
+            if not matches:
+                raise ValueError(f"No calibration parameter matches '{pattern}'")
+            selected.extend(match for match in matches if PARAMETER_INDEX[match] not in selected)
+        return np.array(sorted(PARAMETER_INDEX[name] for name in set(selected)))
+
+    def loss(self, registry: Optional[CalibrationRegistry] = None, games: Optional[HistoricalGames] = None) -> float:
+        """Return the unpenalized loss of a calibration (the base by default) over the games."""
+        parameters = parameters_of(registry or self.base)
+        return float((games or self.games).losses(parameters[None, :], self.objective)[0])
+
+    def fit(self, games: Optional[HistoricalGames] = None) -> FitResult:
+        """Fit the free parameters to the games (all of the fitter's games by default)."""
+        games = games or self.games
+        started = time.perf_counter()
+        base_loss = self.loss(games=games)
+        penalty = self.regularization * base_loss
+
+        def penalized(steps: np.ndarray) -> np.ndarray:
+            parameters = np.repeat(self.start[None, :], len(steps), axis=0)
+            parameters[:, self.free] += steps * self.scale
+            return games.losses(parameters, self.objective) + penalty * (steps ** 2).sum(axis=1)
+
+        steps, _, iterations, evaluations = minimize(penalized, np.zeros(len(self.free)))
+        fitted = self.start.copy()
+        fitted[self.free] += steps * self.scale
+        registry = registry_of(fitted, self.base)
+        changes = {PARAMETERS[i]: (float(self.start[i]), float(fitted[i])) for i in self.free.tolist()
+                   if fitted[i] != self.start[i]}
+        return FitResult(registry, changes, self.objective, len(games), base_loss, self.loss(registry, games),
+                         iterations, evaluations, time.perf_counter() - started)
+
+    def cross_validate(self) -> List[FoldResult]:
+        """Hold out each week in turn, fit to the rest and score the held-out week."""
+        results = []
+        for season, week in self.games.folds():
+            held_out = (self.games.seasons == season) & (self.games.weeks == week)
+            if held_out.all():
+                continue
+            fitted = self.fit(self.games.subset(~held_out)).calibration
+            test = self.games.subset(held_out)
+            results.append(FoldResult(season, week, len(test), self.loss(games=test), self.loss(fitted, test)))
+        return results
+
+
+def main(argv=None):
+    """Fit the calibration to backtested games from the command line."""
+    parser = argparse.ArgumentParser(description="Fit the model's calibration to final scores.")
+    parser.add_argument('--seasons', nargs='+', help="Seasons to fit to (default: every season with matchups)")
+    parser.add_argument('--objective', choices=list(OBJECTIVES), default='squared_error',
+                        help="Loss to minimize (default: squared_error)")
+    parser.add_argument('--parameters', nargs='+', metavar='NAME',
+                        help="Parameters to fit, e.g. 'Points*' 'qb.weight' (default: all the objective uses)")
+    parser.add_argument('--regularization', type=float, default=DEFAULT_REGULARIZATION,
+                        help=f"Shrinkage toward the starting calibration (default: {DEFAULT_REGULARIZATION})")
+    parser.add_argument('--cross-validate', action='store_true', help="Also report leave-one-week-out losses")
+    parser.add_argument('--output', help="Write the fitted calibration to this YAML file")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(config.CALIBRATION_FILE):
+        use_calibration(load_calibration(config.CALIBRATION_FILE))
+    games = HistoricalGames.from_backtest(Backtest(args.seasons, cache=ParsedDataCache()))
+    if not len(games):
+        parser.error("no scored games to fit to (see README: Backtest the Model)")
+    try:
+        fitter = CalibrationFitter(games, args.objective, args.parameters, regularization=args.regularization)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    result = fitter.fit()
+    print(result.describe())
+    if args.cross_validate:
+        folds = fitter.cross_validate()
+        for fold in folds:
+            print(f"  held out {fold.season} week {fold.week:<3} ({fold.games} games): "
+                  f"{fold.base_loss:.4f} -> {fold.loss:.4f}")
+        total = sum(fold.games for fold in folds)
+        if total:
+            print(f"Cross-validated {args.objective}: {sum(f.base_loss * f.games for f in folds) / total:.4f} -> "
+                  f"{sum(f.loss * f.games for f in folds) / total:.4f}")
+    if args.output:
+        result.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Game Projection Module
+----------------------
+This module defines GameProjection, the structured record a Matchup produces for
+one game: projected scores, win percentage, game conditions, starting lineups,
+the model's edge on each betting market and the recommended bets. Records are
+plain, picklable tuples, so they can be returned from worker processes and
+handed to any output sink (see sinks.py) after the computation is done.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Market edges in the order they are flattened into rows
+EDGE_KEYS = ('home_ml', 'away_ml', 'spread', 'total')
+BETTING_LINE_KEYS = ('home_spread', 'away_spread', 'total', 'home_ml', 'away_ml')
+
+
+class GameProjection(NamedTuple):
+    """Projection and betting analysis for one game."""
+    season: str
+    week: int
+    index: int
+    home: str
+    away: str
+    home_points: float
+    away_points: float
+    home_win_pct: float
+    field: str
+    dome: str
+    temperature: float
+    wind: float
+    precipitation: float
+    home_lineup: List[Tuple[str, str]]
+    away_lineup: List[Tuple[str, str]]
+    betting_lines: Optional[Dict[str, float]]
+    edges: Dict[str, float]
+    bets: List[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the projection as nested plain data (for JSON)."""
+        return self._asdict()
+
+    def to_row(self) -> Dict[str, Any]:
+        """Return the projection as one flat row of scalars (for CSV and columnar output).
+
+        Lineups are left out; betting lines, edges and the moneyline and total bets are
+        spread over their own columns, empty when the game has no line or no bet.
+        """
+        row = {
+            'season': self.season,
+            'week': self.week,
+            'home': self.home,
+            'away': self.away,
+            'home_points': self.home_points,
+            'away_points': self.away_points,
+            'home_win_pct': self.home_win_pct,
+            'field': self.field,
+            'dome': self.dome,
+            'temperature': self.temperature,
+            'wind': self.wind,
+            'precipitation': self.precipitation
+        }
+        for key in BETTING_LINE_KEYS:
+            row[key] = self.betting_lines[key] if self.betting_lines else None
+        for key in EDGE_KEYS:
+            row[f"{key}_edge"] = self.edges.get(key)
+        for market in ('moneyline', 'total'):
+            bet = next((bet for bet in self.bets if bet['market'] == market), None)
+            row[f"{market}_bet"] = bet['bet'] if bet else None
+            row[f"{market}_stake"] = bet['stake'] if bet else None
+        return row
@@ -0,0 +1,96 @@
+"""
+Historical Stats Module
+-----------------------
+This module defines the HistoricalStats class, which loads the season box-score
+files under the stats directory (one directory per season, each holding
+basic_passing_stats, basic_receiving_stats and basic_rushing_stats CSVs) into a
+columnar StatsStore. Files may or may not start with a header row; headerless
+files are read in the category's standard column order.
+"""
+
+import csv
+import glob
+import logging
+import os
+from typing import List, Optional
+
+import config
+from stats_store import CATEGORY_STATS, StatsRow, StatsStore, StatsTable
+from utils import safe_float
+
+logger = logging.getLogger(__name__)
+
+# Columns every stats file starts with
+ID_COLUMNS = ("Player", "Team", "Pos")
+# Placeholder the source lists in the Player column for unattributed rows
+MISSING_PLAYER = "-"
+
+
+class HistoricalStats:
+    """Loads historical passing, receiving and rushing box-score stats."""
+
+    def __init__(self, stats_dir: str = config.STATS_DIR):
+        self.stats_dir = stats_dir
+
+    def get_seasons(self) -> List[str]:
+        """Return every season with a stats directory, oldest first."""
+        if not os.path.isdir(self.stats_dir):
+            return []
+        return sorted(name for name in os.listdir(self.stats_dir)
+                      if name.isdigit() and os.path.isdir(os.path.join(self.stats_dir, name)))
+
+    def get_source_files(self) -> List[str]:
+        """Return every file the stats are loaded from."""
+        files = (self._stats_file(season, category) for season in self.get_seasons() for category in CATEGORY_STATS)
+        return [file_path for file_path in files if file_path is not None]
+
+    def get_data(self) -> StatsStore:
+        """Parse every season's files into a StatsStore."""
+        seasons = self.get_seasons()
+        return StatsStore(**{category: StatsTable(category, self._load_category(seasons, category))
+                             for category in CATEGORY_STATS})
+
+    def _stats_file(self, season: str, category: str) -> Optional[str]:
+        """Return a season's file for a category, or None if it has none.
+
+        Downloads are often saved with a copy suffix ("basic_passing_stats (2).csv");
+        when a season has several copies, the last in name order is used.
+        """
+        matches = sorted(glob.glob(os.path.join(glob.escape(self.stats_dir), season,
+                                                f"basic_{category}_stats*.csv")))
+        if len(matches) > 1:
+            logger.warning("Several %s stats files for %s; using %s", category, season, matches[-1])
+        return matches[-1] if matches else None
+
+    def _load_category(self, seasons: List[str], category: str) -> List[StatsRow]:
+        """Load (season, player, team, position, stats) rows for a category across seasons."""
+        rows: List[StatsRow] = []
+        for season in seasons:
+            file_path = self._stats_file(season, category)
+            if file_path is None:
+                logger.warning("No %s stats for %s", category, season)
+                continue
+            rows.extend(self._load_file(file_path, season, category))
+        return rows
+
+    @staticmethod
+    def _load_file(file_path: str, season: str, category: str) -> List[StatsRow]:
+        """Load one stats file, reading columns by header when it has one."""
+        stats = CATEGORY_STATS[category]
+        columns = ID_COLUMNS + stats
+        rows: List[StatsRow] = []
+        with open(file_path, newline='', encoding='utf-8-sig') as csvfile:
+            reader = csv.reader(csvfile)
+            for record in reader:
+                if record and record[0] == ID_COLUMNS[0]:
+                    missing = set(columns) - set(record)
+                    if missing:
+                        raise ValueError(f"{file_path} is missing columns: {', '.join(sorted(missing))}")
+                    columns = tuple(record)
+                    continue
+                if len(record) != len(columns) or record[0] in ('', MISSING_PLAYER):
+                    continue
+                row = dict(zip(columns, record))
+                rows.append((season, row["Player"], row["Team"], row["Pos"],
+                             [safe_float(row[stat]) for stat in stats]))
+        return rows
@@ -0,0 +1,257 @@
+"""
+Incremental Projection Module
+-----------------------------
+This module defines a small dependency graph engine and IncrementalSlate, which
+holds one week's projections as a graph from per-team inputs (DVOA, DAVE, PFF and
+projections gathered into a TeamInputs snapshot, pass rates, home field
+advantage) and per-game inputs (conditions, betting lines) to derived values
+(team values, projected points, the full GameProjection). Every derived value is
+memoized; after an update only the nodes that depend on a changed input are
+recomputed, and a node whose recomputed value is unchanged does not invalidate
+the nodes below it. A betting line move re-prices one game's edges without
+touching any team, and a new weather report recomputes only that game's points.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+from calibration import CalibrationRegistry, get_calibration, use_calibration
+from context import SeasonDataContext
+from game_projection import GameProjection
+from matchup import Matchup, TeamValues
+from team import Team, TeamInputs
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION = "calibration"
+
+# (home, away)
+GameKey = Tuple[str, str]
+
+
+def _same(old: Any, new: Any) -> bool:
+    """Return whether a recomputed value equals the memoized one."""
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+class _Node:
+    """One input or derived value of a DependencyGraph."""
+
+    __slots__ = ['compute', 'deps', 'value', 'changed_at', 'verified_at']
+
+    def __init__(self, compute: Optional[Callable[..., Any]] = None, deps: Sequence[Hashable] = ()):
+        self.compute = compute
+        self.deps = tuple(deps)
+        self.value = None
+        # Revision the value last changed at (0: never computed) and was last checked at
+        self.changed_at = 0
+        self.verified_at = 0
+
+
+class DependencyGraph:
+    """Named inputs and memoized derived values, recomputed only when an input they depend on changes."""
+
+    def __init__(self):
+        self.revision = 0
+        self._nodes: Dict[Hashable, _Node] = {}
+        # Derived keys recomputed since the last reset_stats()
+        self.recomputed: List[Hashable] = []
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._nodes
+
+    def set_input(self, key: Hashable, value: Any) -> bool:
+        """Set an input's value; returns False (and invalidates nothing) if it is unchanged."""
+        node = self._nodes.get(key)
+        if node is None:
+            node = self._nodes[key] = _Node()
+        elif node.compute is not None:
+            raise ValueError(f"{key!r} is a derived value, not an input")
+        elif node.changed_at and _same(node.value, value):
+            return False
+        self.revision += 1
+        node.value = value
+        node.changed_at = node.verified_at = self.revision
+        return True
+
+    def add_node(self, key: Hashable, compute: Callable[..., Any], deps: Sequence[Hashable]):
+        """Define a derived value computed as compute(*values of deps)."""
+        self._nodes[key] = _Node(compute, deps)
+
+    def get(self, key: Hashable) -> Any:
+        """Return a value, recomputing it (and what it depends on) only if an input changed.
+
+        Raises:
+            KeyError: If the key is neither an input nor a derived value.
+        """
+        self._refresh(key)
+        return self._nodes[key].value
+
+    def input_keys(self) -> List[Hashable]:
+        return [key for key, node in self._nodes.items() if node.compute is None]
+
+    def reset_stats(self):
+        self.recomputed.clear()
+
+    def _refresh(self, key: Hashable) -> int:
+        """Bring a node up to date and return the revision its value last changed at."""
+        node = self._nodes[key]
+        if node.compute is None or node.verified_at == self.revision:
+            return node.changed_at
+        dep_changes = [self._refresh(dep) for dep in node.deps]
+        if node.changed_at and max(dep_changes, default=0) <= node.verified_at:
+            node.verified_at = self.revision
+            return node.changed_at
+
+        value = node.compute(*(self._nodes[dep].value for dep in node.deps))
+        self.recomputed.append(key)
+        if not node.changed_at or not _same(node.value, value):
+            node.value = value
+            node.changed_at = self.revision
+        node.verified_at = self.revision
+        return node.changed_at
+
+
+class IncrementalSlate:
+    """One week's game projections, kept up to date input by input."""
+
+    def __init__(self, context: SeasonDataContext):
+        """Gather every input from the week's context and define the graph over it."""
+        self.season = context.season
+        self.week = context.week
+        self.graph = DependencyGraph()
+        self.games: List[GameKey] = []
+        self.graph.set_input(CALIBRATION, get_calibration())
+        self.refresh(context)
+
+    def refresh(self, context: SeasonDataContext) -> Set[Hashable]:
+        """
+        Re-gather every input from a (reloaded) context.
+
+        Only inputs whose value differs from the current one invalidate anything, so
+        refreshing after one team's projections change recomputes only that team's
+        games. Games new to the context are added to the slate.
+
+        Returns:
+            Set[Hashable]: The input keys that changed.
+        """
+        changed = set()
+        for matchup_data in context.matchups:
+            game = (matchup_data['home'], matchup_data['away'])
+            if game not in self.games:
+                self._add_game(game)
+            conditions = {key: value for key, value in matchup_data.items() if key != 'betting_lines'}
+            betting_lines = matchup_data.get('betting_lines')
+            changed |= self._set_inputs({
+                ('game', game): conditions,
+                ('lines', game): dict(betting_lines) if betting_lines else None
+            })
+            for team in game:
+                changed |= self._set_inputs({
+                    ('team', team): TeamInputs.from_context(team, context),
+                    ('pass_rates', team): tuple(context.pass_rates[team][0]),
+                    ('home_adv', team): context.home_field_advantage[team][0]
+                })
+        logger.debug("Refreshed week %s: %d inputs changed", self.week, len(changed))
+        return changed
+
+    def projections(self) -> List[GameProjection]:
+        """Return every game's projection, recomputing only what changed since the last call."""
+        return [self.graph.get(('projection', game)) for game in self.games]
+
+    def projection(self, home: str, away: str) -> GameProjection:
+        """Return one game's projection."""
+        return self.graph.get(('projection', (home, away)))
+
+    def update_betting_lines(self, home: str, away: str, **lines: float) -> bool:
+        """Move one game's betting lines (home_ml, away_ml, home_spread, away_spread, total)."""
+        key = ('lines', (home, away))
+        return self.graph.set_input(key, {**(self.graph.get(key) or {}), **lines})
+
+    def replace_betting_lines(self, home: str, away: str, lines: Optional[Dict[str, float]]) -> bool:
+        """Set one game's whole set of betting lines (None for no posted lines)."""
+        return self.graph.set_input(('lines', (home, away)), dict(lines) if lines else None)
+
+    def update_game(self, home: str, away: str, **conditions: Any) -> bool:
+        """Change one game's conditions (temp, wind, weather, dome, field)."""
+        key = ('game', (home, away))
+        return self.graph.set_input(key, {**self.graph.get(key), **conditions})
+
+    def update_weather(self, home: str, away: str, temperature: Optional[float] = None,
+                       wind: Optional[float] = None, precipitation: Optional[float] = None) -> bool:
+        """Apply a weather report to one game; conditions left as None keep their value."""
+        conditions = {key: value for key, value in
+                      (('temp', temperature), ('wind', wind), ('weather', precipitation)) if value is not None}
+        return self.update_game(home, away, **conditions)
+
+    def update_pass_rates(self, team: str, offense: float, defense: float) -> bool:
+        return self.graph.set_input(('pass_rates', team), (offense, defense))
+
+    def update_home_field_advantage(self, team: str, advantage: float) -> bool:
+        return self.graph.set_input(('home_adv', team), advantage)
+
+    def update_team(self, team: str, inputs: TeamInputs) -> bool:
+        """Replace a team's projections, DVOA, PFF and DAVE inputs."""
+        return self.graph.set_input(('team', team), inputs)
+
+    def update_calibration(self, registry: CalibrationRegistry) -> bool:
+        """Make a calibration the model's and recompute everything that reads it."""
+        use_calibration(registry)
+        return self.graph.set_input(CALIBRATION, registry)
+
+    def _set_inputs(self, inputs: Dict[Hashable, Any]) -> Set[Hashable]:
+        return {key for key, value in inputs.items() if self.graph.set_input(key, value)}
+
+    def _add_game(self, game: GameKey):
+        """Define a game's derived values, and its teams' if they are new."""
+        index = len(self.games)
+        self.games.append(game)
+        home, away = game
+        for team in game:
+            if ('team_values', team) not in self.graph:
+                self.graph.add_node(('team_values', team), self._team_values(team), [('team', team), CALIBRATION])
+
+        matchup_inputs = [('game', game), ('team', home), ('team', away), ('pass_rates', home),
+                          ('pass_rates', away), ('home_adv', home)]
+        self.graph.add_node(('points', game), self._points(game),
+                            matchup_inputs + [('team_values', home), ('team_values', away), CALIBRATION])
+        self.graph.add_node(('projection', game), self._projection(game, index),
+                            matchup_inputs + [('lines', game), ('points', game), CALIBRATION])
+
+    @staticmethod
+    def _team_values(team: str) -> Callable[[TeamInputs, CalibrationRegistry], TeamValues]:
+        return lambda inputs, _: Matchup.get_team_values(Team(team, inputs=inputs))
+
+    def _matchup(self, game: GameKey, conditions: Dict, betting_lines: Optional[Dict],
+                 home_inputs: TeamInputs, away_inputs: TeamInputs, home_rates: Tuple[float, float],
+                 away_rates: Tuple[float, float], home_adv: Any) -> Matchup:
+        """Build a matchup over the given inputs (building it computes nothing)."""
+        home, away = game
+        return Matchup.from_teams({**conditions, 'betting_lines': betting_lines},
+                                  Team(home, inputs=home_inputs), Team(away, inputs=away_inputs),
+                                  {home: [home_rates], away: [away_rates]}, {home: [home_adv]},
+                                  self.season, self.week)
+
+    def _points(self, game: GameKey) -> Callable[..., Tuple[float, float]]:
+        def compute(conditions, home_inputs, away_inputs, home_rates, away_rates, home_adv,
+                    home_values, away_values, _):
+            matchup = self._matchup(game, conditions, None, home_inputs, away_inputs, home_rates, away_rates,
+                                    home_adv)
+            return matchup.points_from_team_values(home_values, away_values)
+        return compute
+
+    def _projection(self, game: GameKey, index: int) -> Callable[..., GameProjection]:
+        def compute(conditions, home_inputs, away_inputs, home_rates, away_rates, home_adv, betting_lines, points, _):
+            matchup = self._matchup(game, conditions, betting_lines, home_inputs, away_inputs, home_rates,
+                                    away_rates, home_adv)
+            return matchup.build_projection(*points, index=index)
+        return compute
+
+
+def changed_games(before: Iterable[GameProjection], after: Iterable[GameProjection]) -> List[GameProjection]:
+    """Return the projections in `after` that differ from the same game in `before`."""
+    previous = {(projection.home, projection.away): projection for projection in before}
+    return [projection for projection in after if previous.get((projection.home, projection.away)) != projection]
@@ -2,19 +2,22 @@
 NFL Projection Model
 --------------------
 This module contains the main logic for the NFL projection model.
-It loads and processes data, creates matchups, and runs projections.
+It loads and processes data, creates matchups, and runs projections,
+optionally across several weeks and worker processes.
 """
 
-import csv
+import argparse
+import cProfile
 import logging
-from typing import Dict, List, Tuple
+import os
+import sys
+import time
 
-from data_loader import load_yaml_data
-from dvoa import DVOA
-from matchup import Matchup
-from projections import Projections
-from utils import safe_float
-from pff import PFF
+from calibration import load_calibration, use_calibration
+from portfolio import SlatePortfolio
+import profiling
+from sinks import TerminalSink, get_sink
+from slate import project_slate, write_slate
 
 import config
 
@@ -26,32 +29,60 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def _load_pass_rates() -> Dict[str, List[Tuple[float, float]]]:
-    """Load pass rates for each team from a CSV file."""
-    team_data = {}
-    with open(config.PLAY_RATES_FILE, newline='', encoding='utf-8') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            try:
-                team = row['Team']
-                off_pass_rate = safe_float(row['OffPassRate'])
-                def_pass_rate = safe_float(row['DefPassRate'])
-                team_data.setdefault(team, []).append(
-                    (off_pass_rate, def_pass_rate))
-            except KeyError:
-                continue
-    return team_data
-
-def main():
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the NFL projection model.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes to project games with (default: 1)")
+    parser.add_argument('--weeks', type=int, nargs='+', default=[config.WEEK_NUM],
+                        help=f"Weeks to project (default: {config.WEEK_NUM})")
+    parser.add_argument('--season', default=config.SEASON,
+                        help=f"Season the weeks belong to (default: {config.SEASON})")
+    parser.add_argument('--output', nargs='+', default=[],
+                        help="Also write the slate to these files (.csv, .jsonl or .npz)")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Print nothing: no game reports and only warnings from the log")
+    parser.add_argument('--portfolio', action='store_true',
+                        help="Also size every recommended bet of the slate together (simultaneous "
+                             "fractional Kelly with exposure caps) and print the stakes (not with --quiet)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Print a per-stage wall/CPU time breakdown to stderr (stages run in "
+                             "worker processes are not included)")
+    parser.add_argument('--profile-output', metavar='FILE',
+                        help="Also dump cProfile statistics to FILE (pstats format, readable by "
+                             "snakeviz, flameprof or gprof2dot); implies --profile")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function to run the NFL projection model."""
-    projections = Projections()
-    dvoa = DVOA()
-    pass_rates = _load_pass_rates()      
-    pff = PFF()  
-    for matchup in load_yaml_data(config.MATCHUPS_FILE):
-        Matchup(matchup, projections, dvoa.get_data(), dvoa.get_dave(),
-                pass_rates, pff.get_data()).project_outcome()
+    args = _parse_args(argv)
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
+    sinks = [get_sink(file_path) for file_path in args.output]
+    if not args.quiet:
+        sinks.insert(0, TerminalSink())
+
+    profiler = cProfile.Profile() if args.profile_output else None
+    if args.profile or profiler:
+        profiling.enable()
+    started = time.perf_counter()
+    if profiler:
+        profiler.enable()
+
+    if os.path.exists(config.CALIBRATION_FILE):
+        use_calibration(load_calibration(config.CALIBRATION_FILE))
+    projections = project_slate(args.weeks, args.season, workers=args.workers)
+    write_slate(projections, sinks)
+    if args.portfolio and not args.quiet:
+        print(f"\nSlate Portfolio:\n{SlatePortfolio().optimize(projections).describe()}")
 
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile_output)
+    if profiling.is_enabled():
+        total_wall = time.perf_counter() - started
+        print(f"\nProfile (total {total_wall:.3f}s wall)\n{profiling.report(total_wall)}", file=sys.stderr)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,32 +5,53 @@ This module defines the Matchup class, which represents a matchup between two te
 It provides methods to calculate projected points and win percentages based on various factors.
 """
 
-import csv
 import logging
 from typing import Dict, List, Tuple
-from colorama import Fore, Style
 
+from calibration import get_calibration
+from context import SeasonDataContext
+from game_projection import GameProjection
+from profiling import profiled
+from sinks import TerminalSink
 from team import Team
 from weather import WeatherConditions
-import config
 import math
 
 logger = logging.getLogger(__name__)
 
+# A team's ({'pass', 'rush'} offense, {'pass', 'rush'} defense) values
+TeamValues = Tuple[Dict[str, float], Dict[str, float]]
+# Bounds home win percentages are clipped to
+WIN_PCT_BOUNDS = (0.1, 99.9)
+
 class Matchup:
     """Represents a matchup between two teams."""
 
-    def __init__(self, matchup_data: Dict, projections: object, dvoa: Dict, dave: Dict, pass_rates: Dict, pff_data: Dict):
-        """Initialize a Matchup instance with game data and team statistics."""
-        self.home_team = Team(matchup_data['home'], projections, dvoa, dave, pff_data)
-        self.away_team = Team(matchup_data['away'], projections, dvoa, dave, pff_data)
+    def __init__(self, matchup_data: Dict, context: SeasonDataContext):
+        """Initialize a Matchup instance with game data and the shared season data."""
+        self._init_game(matchup_data, Team(matchup_data['home'], context), Team(matchup_data['away'], context),
+                        context.pass_rates, context.home_field_advantage, context.season, context.week)
+
+    @classmethod
+    def from_teams(cls, matchup_data: Dict, home_team: Team, away_team: Team, pass_rates: Dict,
+                   home_field_advantage: Dict, season: str, week: int) -> "Matchup":
+        """Create a matchup from already built teams and the pass rate and home advantage tables."""
+        matchup = cls.__new__(cls)
+        matchup._init_game(matchup_data, home_team, away_team, pass_rates, home_field_advantage, season, week)
+        return matchup
+
+    def _init_game(self, matchup_data: Dict, home_team: Team, away_team: Team, pass_rates: Dict,
+                   home_field_advantage: Dict, season: str, week: int):
+        self.season = season
+        self.week = week
+        self.home_team = home_team
+        self.away_team = away_team
         self.field_type = matchup_data['field']
         self.dome = matchup_data['dome']
         self.betting_data = matchup_data['betting_lines']
         self.pass_rates_data = pass_rates
         self.weather_obj = self._init_weather(matchup_data)
-        self.home_adv = self._load_home_field_advantage()
-        self.pff = pff_data
+        self.home_adv = home_field_advantage
 
     def _init_weather(self, matchup_data: Dict) -> WeatherConditions:
         """Initialize weather conditions, adjusting for dome if necessary."""
@@ -38,58 +59,81 @@ class Matchup:
             return WeatherConditions(72.5, 0, 0)
         return WeatherConditions(matchup_data['temp'], matchup_data['wind'], matchup_data['weather'])
 
-    def _load_home_field_advantage(self) -> Dict[str, List[str]]:
-        """Load home field advantage data from a CSV file."""
-        with open(config.HOME_ADV_FILE, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            return {row['Team']: [row['Adv']] for row in reader}
-
     def project_outcome(self) -> Tuple[float, float]:
-        """Project the outcome of the matchup."""
-        home_points, away_points = self._calculate_projected_points()
-        self._print_game_analysis(home_points, away_points)
+        """Project the outcome of the matchup and print the game analysis."""
+        home_points, away_points = self.project_points()
+        self.report(home_points, away_points)
         return home_points, away_points
 
+    @profiled("matchup.project_points")
+    def project_points(self) -> Tuple[float, float]:
+        """Project home and away points without printing anything."""
+        return self._calculate_projected_points()
+
+    def project(self, index: int = 0) -> GameProjection:
+        """Project the matchup and return the full structured result without printing anything."""
+        return self.build_projection(*self.project_points(), index=index)
+
+    @profiled("matchup.build_projection")
+    def build_projection(self, home_points: float, away_points: float, index: int = 0) -> GameProjection:
+        """Build the structured result for already projected points.
+
+        Args:
+            home_points (float): Projected home points.
+            away_points (float): Projected away points.
+            index (int): Position of the game in its week's slate.
+        """
+        if self.betting_data:
+            edges, game_data = self._calculate_edges(home_points, away_points)
+            bets = self._get_bet_recommendations(edges, game_data, bankroll=1000)
+        else:
+            edges, bets = {}, []
+        return GameProjection(
+            self.season, self.week, index, self.home_team.team_name, self.away_team.team_name,
+            home_points, away_points, self._calculate_win_percentage(away_points - home_points),
+            self.field_type, self.dome, self.weather_obj.temperature, self.weather_obj.wind_speed,
+            self.weather_obj.precipitation_chance,
+            self.home_team.lineup, self.away_team.lineup,
+            self.betting_data, edges, bets
+        )
+
+    def report(self, home_points: float, away_points: float):
+        """Print the game analysis for already projected points."""
+        TerminalSink().write([self.build_projection(home_points, away_points)])
+
     def _calculate_projected_points(self) -> Tuple[float, float]:
         """Calculate projected points for home and away teams."""
-        home_off, home_def = self._get_adjusted_team_values(self.home_team)
+        return self.points_from_team_values(self.get_team_values(self.home_team),
+                                            self.get_team_values(self.away_team))
 
-        print()
-        away_off, away_def = self._get_adjusted_team_values(self.away_team)
-        # print(f"{self.home_team.team_name} Off: {home_off}")
-        # print(f"{self.away_team.team_name} Off: {away_off}")
-        # print("-")
-        # print(f"{self.home_team.team_name} Def: {home_def}")
-        # print(f"{self.away_team.team_name} Def: {away_def}")
-        # print("-")
+    def points_from_team_values(self, home_values: TeamValues, away_values: TeamValues) -> Tuple[float, float]:
+        """Project home and away points from both teams' (offense, defense) values."""
+        home_off, home_def = home_values
+        away_off, away_def = away_values
 
         home_pass_rate, away_pass_rate = self._get_adjusted_pass_rates()
 
         home_adv = float(self.home_adv[self.home_team.team_name][0])
 
         home_off_value = self._calculate_offensive_value(home_off, away_def, home_pass_rate)
-        # home_off_value += home_adv / 2
-        #print(f"Home Off Value: {home_off_value}")
         away_off_value = self._calculate_offensive_value(away_off, home_def, away_pass_rate)
-        # away_off_value -= home_adv / 2
-        #print(f"Away Off Value: {away_off_value}")
 
         home_points = self._calculate_points(home_off_value) + (home_adv / 2)
         away_points = self._calculate_points(away_off_value) - (home_adv / 2)
 
         return home_points, away_points
 
-    def _get_adjusted_team_values(self, team: Team) -> Tuple[Dict[str, float], Dict[str, float]]:
+    @staticmethod
+    def get_team_values(team: Team) -> TeamValues:
         """Get adjusted offensive and defensive values for a team."""
         off_values = {
-            'pass': (team.get_total_passing_value()),# + team.get_off_dave_normalized()) / 2,
-            'rush': (team.get_total_rushing_value()),# + team.get_off_dave_normalized()) / 2
+            'pass': team.get_total_passing_value(),
+            'rush': team.get_total_rushing_value()
         }
         def_values = {
-            'pass': (team.get_total_passing_value_def()),# + team.get_def_dave_normalized()) / 2,
-            'rush': (team.get_total_rushing_value_def()),# + team.get_def_dave_normalized()) / 2
+            'pass': team.get_total_passing_value_def(),
+            'rush': team.get_total_rushing_value_def()
         }
-        #print(team.get_total_rushing_value_def())
         return off_values, def_values
 
     def _get_adjusted_pass_rates(self) -> Tuple[float, float]:
@@ -107,76 +151,12 @@ class Matchup:
     def _calculate_points(self, offensive_value: float) -> float:
         """Calculate projected points based on offensive value and field type."""
         if self.field_type == 'turf':
-            return 2.5 * offensive_value + 24.333
+            return get_calibration().apply("Points Turf", offensive_value)
         else:
-            return 2.5 * offensive_value + 23.667
-
-    def _print_game_analysis(self, home_points: float, away_points: float):
-        """Print comprehensive game analysis including projections and betting recommendations."""
-        self._print_game_header()
-        self._print_game_details()
-        self._print_starting_lineups()
-        self._print_projected_scores(home_points, away_points)
-        self._print_win_percentages(home_points, away_points)
-        self._print_betting_info(home_points, away_points)
-
-    def _print_game_header(self):
-        """Print the game header."""
-        print("\n" + "=" * 60)
-        print(f"{Fore.CYAN}{Style.BRIGHT}Game Analysis: {self.away_team.team_name} vs {self.home_team.team_name}{Style.RESET_ALL}")
-        print("=" * 60)
-
-    def _print_game_details(self):
-        """Print game details including weather and field conditions."""
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}Game Details:{Style.RESET_ALL}")
-        details = [
-            ('Home Team:', self.home_team.team_name),
-            ('Away Team:', self.away_team.team_name),
-            ('Field Type:', self.field_type),
-            ('Dome:', self.dome),
-            ('Temperature:', f"{self.weather_obj.temperature}°F"),
-            ('Wind:', f"{self.weather_obj.wind_speed} mph"),
-            ('Precipitation:', self.weather_obj.precipitation_chance)
-        ]
-        for label, value in details:
-            print(f"{label:<15} {value}")
-
-    def _print_starting_lineups(self):
-        """Print starting lineups for both teams."""
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}Starting Lineups:{Style.RESET_ALL}")
-        for team in [self.home_team, self.away_team]:
-            print(f"\n{team.team_name}:")
-            for player, position, _ in team.team_projections:
-                print(f"{player:<20} ({position})")
-
-    def _print_projected_scores(self, home_score: float, away_score: float):
-        """Print projected scores for both teams."""
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}Projected Scores:{Style.RESET_ALL}")
-        print(f"{self.home_team.team_name:<20} {home_score:.0f}")
-        print(f"{self.away_team.team_name:<20} {away_score:.0f}")
-
-    def _print_win_percentages(self, home_score: float, away_score: float):
-        """Print win percentages for both teams."""
-        home_win_pct = self._calculate_win_percentage(away_score - home_score)
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}Win Percentages:{Style.RESET_ALL}")
-        print(f"{self.home_team.team_name:<20} {home_win_pct:.0f}%")
-        print(f"{self.away_team.team_name:<20} {100 - home_win_pct:.0f}%")
-
-    def _print_betting_info(self, home_score: float, away_score: float):
-        """Print betting information and recommendations."""
-        if not self.betting_data:
-            return
-
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}Betting Lines:{Style.RESET_ALL}")
-        for label, key in [
-            ('Home Team Spread:', 'home_spread'),
-            ('Away Team Spread:', 'away_spread'),
-            ('Over/Under:', 'total'),
-            ('Home Team Moneyline:', 'home_ml'),
-            ('Away Team Moneyline:', 'away_ml')
-        ]:
-            print(f"{label:<20} {self.betting_data[key]}")
+            return get_calibration().apply("Points Grass", offensive_value)
 
+    def _calculate_edges(self, home_score: float, away_score: float) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Calculate the model's edge on each market, plus the implied data bets are sized from."""
         home_implied_win_pct = self._calculate_implied_win_pct(self.betting_data["home_ml"])
         home_win_pct = self._calculate_win_percentage(away_score - home_score)
         
@@ -192,19 +172,23 @@ class Matchup:
             'h_impl_win': home_implied_win_pct,
             'a_impl_win': 100 - home_implied_win_pct
         }
+        return edges, other_data
 
-        self._print_bet_recommendations(edges, other_data)
-
-    def _print_bet_recommendations(self, edges: Dict[str, float], game_data: Dict[str, float]):
-        """Print bet recommendations based on calculated edges."""
-        print(f"\n{Fore.GREEN}{Style.BRIGHT}Bet Recommendations:{Style.RESET_ALL}")
-        bankroll = 1000
-        recommendations = []
+    def get_bet_recommendations(self, home_score: float, away_score: float, bankroll: float = 1000) -> List[Dict]:
+        """Return the bets the model recommends for projected scores (empty without betting lines)."""
+        if not self.betting_data:
+            return []
+        edges, game_data = self._calculate_edges(home_score, away_score)
+        return self._get_bet_recommendations(edges, game_data, bankroll)
 
-        def format_recommendation(team, bet_type, odds, edge, bet_size, impl_win):
-            odds_str = f"+{odds}" if odds > 0 else str(odds)
-            return f"{"Moneyline:":<10} {team:<5} ({odds_str}) ${bet_size:<3.0f}  | Implied Win% ({impl_win:.1f}) | Edge: {edge:.1f}%"
+    def _get_bet_recommendations(self, edges: Dict[str, float], game_data: Dict[str, float],
+                                 bankroll: float) -> List[Dict]:
+        """Size a bet for every market with an edge.
 
+        Moneyline bets are keyed 'home_ml'/'away_ml' and totals 'over'/'under'; each
+        bet records its American odds, edge and stake.
+        """
+        bets = []
         for bet_type, edge in edges.items():
             if bet_type in ('home_ml', 'away_ml'):
                 if edge <= 0:
@@ -214,26 +198,19 @@ class Matchup:
                 edge_decimal = edge / 100
                 bet_size = self._calculate_bet_size(edge_decimal, self._american_to_decimal(odds), bankroll)
                 impl_win = game_data['h_impl_win'] if bet_type == 'home_ml' else game_data['a_impl_win']
-                recommendations.append(format_recommendation(team, "moneyline", odds, edge, bet_size, impl_win))
+                bets.append({'market': 'moneyline', 'bet': bet_type, 'team': team, 'odds': odds,
+                             'edge': edge, 'stake': bet_size, 'impl_win': impl_win})
             # elif bet_type == 'spread':
             #     team = self.home_team.team_name if edge < 0 else self.away_team.team_name
             #     spread = self.betting_data['home_spread'] if edge < 0 else self.betting_data['away_spread']
             #     edge_decimal = abs(edge) / 100
             #     bet_size = self._calculate_bet_size(edge_decimal, self._american_to_decimal(-110), bankroll)
-            #     recommendations.append(f"{"Spread:":<10} {team:<5} ({spread})  ${bet_size:<4.0f} | Proj Spread ({}) | Edge: {abs(edge):.1f}%")
             elif bet_type == 'total':
-                over_under = "o" if edge > 0 else "u"
                 edge_decimal = abs(edge) / 100
                 bet_size = self._calculate_bet_size(edge_decimal, self._american_to_decimal(-110), bankroll)
-                recommendations.append(f"{"Total:":<10} {over_under}{self.betting_data['total']:<11} ${bet_size:<4.0f} | Proj Total   ({game_data['proj_tot']:.1f}) | Edge: {abs(edge):.1f}%")
-
-        if recommendations:
-            print(*recommendations, sep='\n')
-        else:
-            print("No strong betting recommendations for this game.")
-
-        print("\n" + "=" * 60)
-
+                bets.append({'market': 'total', 'bet': 'over' if edge > 0 else 'under', 'line': self.betting_data['total'],
+                             'odds': -110, 'edge': abs(edge), 'stake': bet_size, 'proj_total': game_data['proj_tot']})
+        return bets
 
     def _american_to_decimal(self, american_odds):
         """
@@ -283,7 +260,8 @@ class Matchup:
     @staticmethod
     def _calculate_win_percentage(point_difference: float) -> float:
         """Calculate win percentage based on point difference."""
-        return max(min((-0.0303 * point_difference + 0.5) * 100, 99.9), 0.1)
+        return max(min(get_calibration().apply("Win Pct", point_difference) * 100, WIN_PCT_BOUNDS[1]),
+                   WIN_PCT_BOUNDS[0])
 
     @staticmethod
     def _calculate_implied_win_pct(money_line: int) -> float:
@@ -0,0 +1,404 @@
+"""
+Odds Watcher Module
+-------------------
+This module watches for betting line moves and re-prices the model's edges as
+they arrive. Line updates come from pluggable asyncio sources (a directory of
+drop files, or a local HTTP feed polled for changes) and are applied to an
+IncrementalSlate, whose projected scores stay memoized: a move recomputes only
+the moved game's implied win percentage, edges and Kelly stakes, which takes well
+under a millisecond. An alert is emitted when a moved market's edge crosses its
+threshold in either direction. Given a SlatePortfolio, the watcher also re-sizes
+the whole slate's bets together whenever a move changes a game's bets, and alerts
+carry those stakes. The solve takes a tenth of a second or more, so the watcher runs
+it in an executor, once for all the updates that queued up meanwhile, and alert
+latencies include it.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.request
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import yaml
+
+import config
+from context import SeasonDataContext
+from data_loader import ParsedDataCache
+from game_projection import GameProjection
+from incremental import IncrementalSlate
+from portfolio import Allocation, SlatePortfolio
+
+logger = logging.getLogger(__name__)
+
+LINE_KEYS = ('home_ml', 'away_ml', 'home_spread', 'away_spread', 'total')
+# Markets whose edge a line moves
+MARKETS_BY_LINE = {
+    'home_ml': ('home_ml', 'away_ml'),
+    'away_ml': ('home_ml', 'away_ml'),
+    'home_spread': ('spread',),
+    'away_spread': ('spread',),
+    'total': ('total',)
+}
+# Edge that makes a market worth a bet: win percentage points for moneylines, points otherwise
+DEFAULT_THRESHOLDS = {'home_ml': 3.0, 'away_ml': 3.0, 'spread': 3.0, 'total': 3.0}
+
+
+class LineUpdate(NamedTuple):
+    """New betting lines for one game; only the lines that moved need to be given."""
+    home: str
+    away: str
+    lines: Dict[str, float]
+    source: str = ""
+
+
+class EdgeAlert(NamedTuple):
+    """A market whose edge crossed its threshold after a line move."""
+    home: str
+    away: str
+    market: str
+    # True when the edge rose to the threshold, False when it fell back below it
+    opened: bool
+    edge: float
+    previous_edge: float
+    lines: Dict[str, float]
+    stake: Optional[float]
+    latency_ms: float
+
+    def describe(self) -> str:
+        state = "OPEN " if self.opened else "CLOSE"
+        stake = f", stake ${self.stake:.2f}" if self.stake is not None else ""
+        return (f"{state} {self.away} @ {self.home} {self.market}: edge {self.previous_edge:+.2f} -> "
+                f"{self.edge:+.2f}{stake} ({self.latency_ms:.2f} ms)")
+
+
+def parse_line_updates(data, source: str = "") -> List[LineUpdate]:
+    """
+    Read line updates from a decoded drop file or feed response.
+
+    Accepts one game or a list of games (optionally under a 'games' key); each game
+    has 'home' and 'away' plus its lines, either at the top level or under
+    'betting_lines' as in the matchup files.
+
+    Raises:
+        ValueError: If a game has no teams.
+    """
+    if isinstance(data, Mapping) and 'games' in data:
+        data = data['games']
+    if isinstance(data, Mapping):
+        data = [data]
+    updates = []
+    for game in data or []:
+        if 'home' not in game or 'away' not in game:
+            raise ValueError(f"Line update without home and away teams: {game}")
+        lines = {**game, **(game.get('betting_lines') or {})}
+        updates.append(LineUpdate(game['home'], game['away'],
+                                  {key: float(lines[key]) for key in LINE_KEYS if lines.get(key) is not None},
+                                  source))
+    return updates
+
+
+class LineSource:
+    """A stream of line updates."""
+
+    name = "source"
+
+    def updates(self) -> AsyncIterator[LineUpdate]:
+        """Return an async iterator over the source's updates, running until cancelled."""
+        raise NotImplementedError
+
+
+class DropDirectorySource(LineSource):
+    """Line updates dropped as .json or .yaml files into a directory.
+
+    Files are read in name order and moved to a 'processed' subdirectory (or
+    'failed' if they cannot be parsed) so each is applied once.
+    """
+
+    EXTENSIONS = ('.json', '.yaml', '.yml')
+
+    def __init__(self, directory: str, poll_interval: float = 0.1):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.name = f"dir:{directory}"
+
+    async def updates(self) -> AsyncIterator[LineUpdate]:
+        os.makedirs(self.directory, exist_ok=True)
+        while True:
+            for file_path in await asyncio.to_thread(self._pending_files):
+                for update in self._read(file_path):
+                    yield update
+            await asyncio.sleep(self.poll_interval)
+
+    def _pending_files(self) -> List[str]:
+        return sorted(entry.path for entry in os.scandir(self.directory)
+                      if entry.is_file() and entry.name.endswith(self.EXTENSIONS))
+
+    def _read(self, file_path: str) -> List[LineUpdate]:
+        """Parse one drop file and move it out of the way."""
+        try:
+            with open(file_path, encoding="utf-8") as file:
+                data = json.load(file) if file_path.endswith('.json') else yaml.safe_load(file)
+            updates, outcome = parse_line_updates(data, os.path.basename(file_path)), "processed"
+        except (OSError, ValueError, TypeError, yaml.YAMLError) as exc:
+            logger.error("Could not read line update %s: %s", file_path, exc)
+            updates, outcome = [], "failed"
+        target_dir = os.path.join(self.directory, outcome)
+        os.makedirs(target_dir, exist_ok=True)
+        os.replace(file_path, os.path.join(target_dir, os.path.basename(file_path)))
+        return updates
+
+
+class HTTPFeedSource(LineSource):
+    """A local HTTP feed serving the current lines as JSON, polled for changes.
+
+    Only games whose lines differ from the previous poll are emitted; the first poll
+    emits every game. Requests send the last ETag, so an unchanged feed can answer
+    304 Not Modified.
+    """
+
+    def __init__(self, url: str, poll_interval: float = 1.0, timeout: float = 5.0):
+        self.url = url
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.name = f"http:{url}"
+        self._etag: Optional[str] = None
+        self._last: Dict[tuple, Dict[str, float]] = {}
+
+    async def updates(self) -> AsyncIterator[LineUpdate]:
+        while True:
+            try:
+                data = await asyncio.to_thread(self._fetch)
+                updates = parse_line_updates(data, self.name) if data is not None else []
+            except (OSError, ValueError, TypeError) as exc:
+                logger.warning("Line feed %s unavailable: %s", self.url, exc)
+                updates = []
+            for update in updates:
+                key = (update.home, update.away)
+                if self._last.get(key) != update.lines:
+                    self._last[key] = update.lines
+                    yield update
+            await asyncio.sleep(self.poll_interval)
+
+    def _fetch(self):
+        """Return the decoded feed, or None if it has not changed since the last poll."""
+        request = urllib.request.Request(self.url, headers={'If-None-Match': self._etag} if self._etag else {})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                self._etag = response.headers.get('ETag')
+                return json.load(response)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return None
+            raise
+
+
+class _Repriced(NamedTuple):
+    """A game re-priced by a line update, waiting for its alerts to be built."""
+    update: LineUpdate
+    previous: GameProjection
+    projection: GameProjection
+    markets: Tuple[str, ...]
+    # Whether the move changed the game's recommended bets, and so the slate's allocation
+    bets_changed: bool
+    started: float
+
+
+class OddsWatcher:
+    """Applies line updates to a slate and alerts when a moved market's edge crosses its threshold."""
+
+    def __init__(self, slate: IncrementalSlate, thresholds: Mapping[str, float] = None,
+                 on_alert: Callable[[EdgeAlert], None] = None, portfolio: Optional[SlatePortfolio] = None):
+        self.slate = slate
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.on_alert = on_alert or (lambda alert: logger.warning(alert.describe()))
+        self.portfolio = portfolio
+        self._projections = {(projection.home, projection.away): projection for projection in slate.projections()}
+        self.allocation: Optional[Allocation] = portfolio.optimize(self.projections) if portfolio else None
+
+    def apply(self, update: LineUpdate) -> List[EdgeAlert]:
+        """Apply one line update and return the alerts it raised.
+
+        An update that would leave its game without a full set of lines is ignored.
+        If re-pricing fails, the game's previous lines are restored and the error raised.
+        With a portfolio, the slate is re-sized before the alerts are built whenever the
+        move changed the game's bets; the reported latency includes that solve.
+        """
+        repriced = self._reprice(update)
+        if repriced is None:
+            return []
+        if self.portfolio and repriced.bets_changed:
+            self.allocation = self.portfolio.optimize(self.projections)
+        return self._emit(repriced)
+
+    def apply_all(self, updates: Iterable[LineUpdate]) -> List[EdgeAlert]:
+        return [alert for update in updates for alert in self.apply(update)]
+
+    async def run(self, sources: Sequence[LineSource], max_updates: Optional[int] = None):
+        """Consume every source until cancelled (or until max_updates have been applied).
+
+        Updates that queue up while the consumer is busy are re-priced together, and
+        with a portfolio the slate is re-sized once for the batch in an executor, so
+        the sources keep polling while it solves.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+
+        async def pump(source: LineSource):
+            try:
+                async for update in source.updates():
+                    await queue.put(update)
+            except Exception:
+                logger.exception("Line source %s stopped", source.name)
+                raise
+
+        tasks = [asyncio.create_task(pump(source)) for source in sources]
+        try:
+            applied = 0
+            while max_updates is None or applied < max_updates:
+                updates = [await queue.get()]
+                while not queue.empty() and (max_updates is None or applied + len(updates) < max_updates):
+                    updates.append(queue.get_nowait())
+                applied += len(updates)
+                batch = []
+                for update in updates:
+                    try:
+                        repriced = self._reprice(update)
+                    except Exception:
+                        logger.exception("Could not apply lines for %s @ %s from %s", update.away, update.home,
+                                         update.source or "update")
+                        continue
+                    if repriced is not None:
+                        batch.append(repriced)
+                if self.portfolio and any(repriced.bets_changed for repriced in batch):
+                    try:
+                        self.allocation = await loop.run_in_executor(None, self.portfolio.optimize,
+                                                                     self.projections)
+                    except Exception:
+                        logger.exception("Could not re-size the slate; keeping the previous allocation")
+                for repriced in batch:
+                    self._emit(repriced)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _reprice(self, update: LineUpdate) -> Optional[_Repriced]:
+        """Apply an update's lines to the slate and re-price its game, or return None if it is ignored."""
+        started = time.perf_counter()
+        key = (update.home, update.away)
+        previous = self._projections.get(key)
+        if previous is None:
+            logger.warning("Ignoring lines for %s @ %s: not on the slate", update.away, update.home)
+            return None
+        missing = [line for line in LINE_KEYS if line not in {**(previous.betting_lines or {}), **update.lines}]
+        if missing:
+            logger.warning("Ignoring lines for %s @ %s from %s: no %s posted yet", update.away, update.home,
+                           update.source or "update", ", ".join(missing))
+            return None
+        if not self.slate.update_betting_lines(update.home, update.away, **update.lines):
+            return None
+        try:
+            projection = self.slate.projection(update.home, update.away)
+        except Exception:
+            self.slate.replace_betting_lines(update.home, update.away, previous.betting_lines)
+            raise
+        self._projections[key] = projection
+        markets = tuple(dict.fromkeys(market for line in update.lines for market in MARKETS_BY_LINE[line]))
+        return _Repriced(update, previous, projection, markets, projection.bets != previous.bets, started)
+
+    def _emit(self, repriced: _Repriced) -> List[EdgeAlert]:
+        """Build and send the alerts of a re-priced game, timed from when its update was taken."""
+        update, previous, projection = repriced.update, repriced.previous, repriced.projection
+        latency_ms = (time.perf_counter() - repriced.started) * 1000
+        alerts = []
+        for market in repriced.markets:
+            edge, previous_edge = self._bet_edge(projection, market), self._bet_edge(previous, market)
+            threshold = self.thresholds[market]
+            if (edge >= threshold) != (previous_edge >= threshold):
+                alerts.append(EdgeAlert(update.home, update.away, market, edge >= threshold, edge, previous_edge,
+                                        dict(projection.betting_lines), self._stake(projection, market),
+                                        latency_ms))
+        logger.debug("Re-priced %s @ %s (%s) in %.3f ms", update.away, update.home, ", ".join(repriced.markets),
+                     latency_ms)
+        for alert in alerts:
+            self.on_alert(alert)
+        return alerts
+
+    @property
+    def projections(self) -> List[GameProjection]:
+        return list(self._projections.values())
+
+    @staticmethod
+    def _bet_edge(projection: GameProjection, market: str) -> float:
+        """Return the edge of the best bet in a market: moneyline edges are one-sided, spread and total two-sided.
+
+        The spread edge is the projected home margin plus the home spread (negative for a
+        home favourite), the form the backtest scores against the spread with.
+        """
+        if market == 'spread':
+            lines = projection.betting_lines or {}
+            edge = projection.home_points - projection.away_points + lines['home_spread'] if lines else 0.0
+        else:
+            edge = projection.edges.get(market, 0.0)
+        return edge if market in ('home_ml', 'away_ml') else abs(edge)
+
+    def _stake(self, projection: GameProjection, market: str) -> Optional[float]:
+        """Return the stake recommended in a market, if any (spreads are not bet).
+
+        With a portfolio this is the bet's stake in the slate allocation, otherwise the
+        Kelly stake Matchup gives it alone.
+        """
+        for bet in projection.bets:
+            if bet['bet'] == market or bet['market'] == market:
+                if self.allocation:
+                    return self.allocation.stake_of(projection.home, projection.away, bet['bet'])
+                return bet['stake']
+        return None
+
+
+def main(argv=None):
+    """Watch line sources from the command line and print edge alerts."""
+    parser = argparse.ArgumentParser(description="Re-price the model's edges as betting lines move.")
+    parser.add_argument('--drop-dir', help="Directory to watch for .json/.yaml line update files")
+    parser.add_argument('--feed', help="URL of a local HTTP line feed to poll")
+    parser.add_argument('--feed-interval', type=float, default=1.0, help="Seconds between feed polls")
+    parser.add_argument('--week', type=int, default=config.WEEK_NUM, help=f"Week (default: {config.WEEK_NUM})")
+    parser.add_argument('--season', default=config.SEASON, help=f"Season (default: {config.SEASON})")
+    parser.add_argument('--threshold', nargs='+', metavar='MARKET=EDGE', default=[],
+                        help="Alert thresholds, e.g. total=2.5 home_ml=4 (default: 3 for every market)")
+    parser.add_argument('--portfolio', action='store_true',
+                        help="Re-size the slate's bets together after every move and alert with those stakes")
+    args = parser.parse_args(argv)
+    thresholds = {}
+    for item in args.threshold:
+        market, _, edge = item.partition('=')
+        if market not in DEFAULT_THRESHOLDS:
+            parser.error(f"unknown market '{market}' (choose from {', '.join(DEFAULT_THRESHOLDS)})")
+        thresholds[market] = float(edge)
+
+    sources = []
+    if args.drop_dir:
+        sources.append(DropDirectorySource(args.drop_dir))
+    if args.feed:
+        sources.append(HTTPFeedSource(args.feed, args.feed_interval))
+    if not sources:
+        parser.error("give --drop-dir and/or --feed")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    slate = IncrementalSlate(SeasonDataContext(args.week, args.season, cache=ParsedDataCache()))
+    watcher = OddsWatcher(slate, thresholds, on_alert=lambda alert: print(alert.describe(), flush=True),
+                          portfolio=SlatePortfolio() if args.portfolio else None)
+    logger.info("Watching %d games: %s", len(slate.games), ", ".join(source.name for source in sources))
+    try:
+        asyncio.run(watcher.run(sources))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,58 +1,129 @@
 """
-DVOA Module
------------
-This module defines the DVOA class, which loads and manages DVOA (Defense-adjusted Value Over Average) data
-for NFL teams and players across multiple years and categories.
+PFF Module
+----------
+This module defines the PFF class, which loads one season's PFF passing grades into
+a columnar PFFGrades table, and PassingGrades, which joins those grades to the
+projected players by player id.
 """
 
 import csv
-from typing import Dict, List, Tuple
+import logging
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 import config
 import utils
+from player import Player
+from player_ids import PlayerCrosswalk, normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+class PFFGrades:
+    """Columnar PFF grades and attempts, one row per player."""
+
+    __slots__ = ['names', 'values']
+
+    def __init__(self, records: Iterable[Tuple[str, float, float]] = ()):
+        """Build the table from (normalized name, grade, attempts) records.
+
+        The first record seen for a name wins, matching the order the source CSV
+        lists players in.
+        """
+        rows: Dict[str, Tuple[float, float]] = {}
+        for name, grade, attempts in records:
+            rows.setdefault(name, (grade, attempts))
+        self.names = tuple(rows)
+        self.values = np.array(list(rows.values()), dtype=float).reshape(len(self.names), 2)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
 
 class PFF:
-    """Manages DVOA data for NFL teams and players."""
+    """Loads one season's PFF player grades."""
 
-    def __init__(self):
-        """Initialize DVOA instance with all DVOA data and DAVE data."""
-        self.pff = self._load_pff_data()
+    def __init__(self, data_dir: str = config.DATA_DIR, season: Optional[str] = config.SEASON):
+        """Initialize PFF instance for one season's grades (None for none); grades are loaded on first access."""
+        self.data_dir = data_dir
+        self.season = season
+
+    @cached_property
+    def pff(self) -> Dict[str, Dict[str, PFFGrades]]:
+        """All PFF grades, loaded on first access."""
+        return self._load_pff_data()
 
     def get_data(self) -> Dict:
-        """Return all DVOA data."""
+        """Return every PFF grade table, keyed by season and category."""
         return self.pff
 
-    def _load_pff_data(self) -> Dict[int, Dict[str, Dict]]:
-        """Load all DVOA data for configured years."""
+    def get_source_files(self) -> List[str]:
+        """Return every file the PFF data is loaded from."""
+        if self.season is None:
+            return []
+        return [self._grade_file(self.season, "passing_grades.csv")]
+
+    def _grade_file(self, year: str, filename: str) -> str:
+        """Return the path of a PFF grade file for a specific year."""
+        return f"{self.data_dir}pff/{year}/{filename}"
+
+    def _load_pff_data(self) -> Dict[str, Dict[str, PFFGrades]]:
+        """Load the grades of the configured season (none without one)."""
         data = {}
-        # for year in config.YEARS:
-        data["2024"] = {
-            "Passing": self._get_passing_grade("2024")
-            # "Rushing": self._get_rush_dvoa(year),
-            # "Receiving": self._get_rec_dvoa(year),
-            # "OL Pass": self._get_ol_dvoa(year, "Pass"),
-            # "OL Run": self._get_ol_dvoa(year, "Rush"),
-            # "Defense Pass": self._get_def_dvoa(year, "Pass"),
-            # "Defense Rush": self._get_def_dvoa(year, "Rush")
+        if self.season is None:
+            return data
+        data[self.season] = {
+            "Passing": self._get_passing_grade(self.season)
         }
         return data
 
-    def _get_passing_grade(self, year: int) -> Dict[str, List[Tuple[float, float]]]:
-        """Load passing DVOA data for a specific year."""
+    def _get_passing_grade(self, year: str) -> PFFGrades:
+        """Load passing grades for a specific year."""
         return self._load_player_grade(year, "passing_grades.csv")
 
-    def _load_player_grade(self, year: int, filename: str):
-        """Generic method to load player DVOA data."""
-        player_data = {}
-        file_path = f"../data/raw/pff/{year}/{filename}"
+    def _load_player_grade(self, year: str, filename: str) -> PFFGrades:
+        """Load a player grade file into a PFFGrades table."""
+        records = []
+        file_path = self._grade_file(year, filename)
         with open(file_path, newline='', encoding='utf-8') as csvfile:
             reader = csv.DictReader(csvfile)
             for row in reader:
-                player_name = row['player'].lower()
+                player_name = normalize_name(row['player'])
                 try:
-                    dvoa = utils.safe_float(row["grades_pass"])
+                    grade = utils.safe_float(row["grades_pass"])
                     att = utils.safe_float(row["attempts"])
                 except ValueError:
-                    dvoa = 0
+                    grade = 0
                     att = 1
-                player_data.setdefault(player_name, []).append((dvoa, att))
-        return player_data
\ No newline at end of file
+                records.append((player_name, grade, att))
+        return PFFGrades(records)
+
+
+class PassingGrades:
+    """The first PFF passing grade and attempts of every projected player, indexed by projection row."""
+
+    __slots__ = ['values']
+
+    def __init__(self, players: Sequence[Player], passing_data: PFFGrades, crosswalk: PlayerCrosswalk):
+        """Join the PFF grades to the projected players by player id.
+
+        Args:
+            players: Projected players, ordered by their projection row.
+            passing_data: PFF passing grades, one row per normalized name.
+            crosswalk: The crosswalk the players' ids were assigned from.
+        """
+        pff_rows = crosswalk.rows_by_id("pff", passing_data.names)[[player.player_id for player in players]]
+        self.values = np.full((len(players), 2), np.nan)
+        found = pff_rows >= 0
+        if found.any():
+            self.values[found] = passing_data.values[pff_rows[found]]
+        missing = [player.name for player, has_grade in zip(players, found)
+                   if not has_grade and player.position == "QB"]
+        if missing:
+            logger.debug("No PFF passing grade for %d quarterbacks: %s", len(missing), ", ".join(missing))
+
+    def values_of(self, rows: np.ndarray) -> np.ndarray:
+        """Return the (grade, attempts) rows of many players at once; NaN where PFF has no grade."""
+        return self.values[rows]
@@ -1,145 +1,47 @@
 """
 Player Module
 -------------
-This module defines the Player class, which represents an NFL player
-and provides methods to calculate various DVOA statistics and load player projections.
+This module defines the Player class, a lightweight view of one row of a
+ProjectionTable, which exposes an NFL player's name, position, team, crosswalk id
+and projections. Weighted DVOA is precomputed for every player by WeightedDVOA.
 """
 
-from typing import Dict, Any
-import config
-import utils
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:
+    from projection_table import ProjectionTable
 
 class Player:
     """Represents an NFL player with associated statistics and projections."""
 
-    def __init__(self, name: str, pos: str, team: str):
-        """Initialize a Player instance."""
-        self.name = name.lower()
-        self.position = pos
-        self.team = team
-        self.yearly_weights = {
-            "2024": 1,
-            "2023": 2,
-            "2022": 4,
-            "2021": 8
-        }
-        self.projections: Dict[str, float] = {}
-        self.dvoa_player_map = {
-            "tank dell": "nathaniel dell",
-            "velus jones jr.": "velus jones",
-            "scotty miller": "scott miller",
-            "calvin austin iii": "calvin austin",
-            "marvin mims jr.": "marvin mims",
-            "pierre strong jr.": "pierre strong",
-            "gabe davis": "gabriel davis",
-            "travis etienne jr.": "travis etienne",
-            "joshua palmer": "josh palmer",
-            "brian robinson jr.": "brian robinson",
-            "dk metcalf": "d.k. metcalf",
-            "kenneth walker iii": "kenneth walker",
-            "nick westbrook-ikhine": "nick westbrook",
-            "chig okonkwo": "chigoziem okonkwo",
-            "michael pittman jr.": "michael pittman",
-            "de'von achane": "devon achane",
-
-        }
-
-    def get_passing_dvoa(self, dvoa: Dict[str, Dict[str, Dict[str, Any]]]) -> float:
-        """Calculate weighted passing DVOA across years."""
-        # print(f"QB: {self.name}")
-        # print(f"Weighted DVOA: {round(self._calculate_weighted_dvoa(dvoa, "Passing", "pass_attempts") * 100)}%")
-        return self._calculate_weighted_dvoa(dvoa, "Passing", "pass_attempts")
-
-    def get_receiving_dvoa(self, dvoa: Dict[str, Dict[str, Dict[str, Any]]]) -> float:
-        """Calculate weighted receiving DVOA across years."""
-        #print(f"{self.name} Weighted DVOA: {round(self._calculate_weighted_dvoa(dvoa, "Receiving", "targets") * 100)}%")
-        # if self._calculate_weighted_dvoa(dvoa, "Receiving", "targets") == 0:
-        #     print(f"\n=== Couln't find {self.name}\n")
-        return self._calculate_weighted_dvoa(dvoa, "Receiving", "targets")
-
-    def get_rushing_dvoa(self, dvoa: Dict[str, Dict[str, Dict[str, Any]]]) -> float:
-        """Calculate weighted rushing DVOA across years."""
-        # if self._calculate_weighted_dvoa(dvoa, "Rushing", "attempts") == 0 and self.position == "RB":
-        #     print(f"\n=== Couln't find {self.name}\n")
-        return self._calculate_weighted_dvoa(dvoa, "Rushing", "attempts")
-
-    def _calculate_weighted_dvoa(self, dvoa: Dict[str, Dict[str, Dict[str, Any]]], 
-                                 category: str, attempt_type: str) -> float:
-        """Generic method to calculate weighted DVOA for a given category."""
-        total_attempts = 0
-        total_contribution = 0
-        for year in config.YEARS:
-            yearly_dvoa = dvoa[year][category]
-            mapped_name = self.dvoa_player_map.get(self.name, self.name)
-            try:
-                player_dvoa, player_attempts = yearly_dvoa[mapped_name][0]
-            except KeyError:
-                player_dvoa, player_attempts = 0, 0
+    __slots__ = ['table', 'row']
 
-            weighted_attempts = player_attempts / self.yearly_weights[year]
-            yearly_contribution = player_dvoa * weighted_attempts
-            total_attempts += weighted_attempts
-            total_contribution += yearly_contribution
+    def __init__(self, table: "ProjectionTable", row: int):
+        """Initialize a view of one row of a projection table."""
+        self.table = table
+        self.row = row
 
-        return total_contribution / total_attempts if total_attempts else 0
+    @property
+    def name(self) -> str:
+        return self.table.names[self.row].lower()
 
-    def get_proj_passing_att(self) -> float:
-        """Get projected passing attempts."""
-        return self.projections.get("PassAtt", 0)
+    @property
+    def position(self) -> str:
+        return self.table.position_of(self.row)
 
-    def get_proj_targets(self) -> float:
-        """Get projected targets."""
-        #print(f"{self.name} proj targets: {self.projections.get("Targets", 0)}")
-        return self.projections.get("Targets", 0)
+    @property
+    def team(self) -> str:
+        return self.table.team_of(self.row)
 
-    def get_proj_attempts(self) -> float:
-        """Get projected rushing attempts."""
-        return self.projections.get("RushAtt", 0)
+    @property
+    def player_id(self) -> int:
+        """Return the player's crosswalk id (-1 until ids are assigned)."""
+        return int(self.table.player_ids[self.row])
 
-    def load_ftn_data(self, player_data: Dict[str, str]):
-        """Load player projections from FTN data."""
-        projection_mappings = {
-            "PassAtt": "Pass Att.",
-            "PassComp": "Pass Cmp.",
-            "PassTDs": "Pass TD",
-            "PassYds": "Pass Yd.",
-            "PassInt": "Int.",
-            "RushAtt": "Rush Att.",
-            "RushYds": "Rush Yd.",
-            "RushTDs": "Rush TD",
-            "Targets": "Tgt",
-            "Receptions": "Rec.",
-            "RecYards": "Rec Yd.",
-            "RecTDs": "Rec TD"
-        }
+    @property
+    def projections(self) -> Dict[str, float]:
+        """Return every projected stat of the player by name."""
+        return dict(zip(self.table.STATS, self.table.stats[self.row].tolist()))
 
-        for proj_key, ftn_key in projection_mappings.items():
-            try:
-                self.projections[proj_key] = utils.safe_float(player_data[ftn_key])
-            except:
-                self.projections[proj_key] = 0.0
-            
-    
-    def load_fd_data(self, player_data: Dict[str, str]):
-        """Load player projections from FTN data."""
-        projection_mappings = {
-            "PassAtt": "pass_att",
-            "PassComp": "pass_cmp",
-            "PassTDs": "pass_td",
-            "PassYds": "pass_yds",
-            "PassInt": "pass_int",
-            "RushAtt": "rush_att",
-            "RushYds": "rush_yds",
-            "RushTDs": "rush_td",
-            "Targets": "rec_tgt",
-            "Receptions": "rec",
-            "RecYards": "rec_yds",
-            "RecTDs": "rec_td",
-            "Fumbles": "fum"
-        }
-            
-        for proj_key, ftn_key in projection_mappings.items():
-            try:
-                self.projections[proj_key] = utils.safe_float(player_data[ftn_key])
-            except:
-                self.projections[proj_key] = 0.0
\ No newline at end of file
+    def __repr__(self) -> str:
+        return f"Player({self.table.names[self.row]!r}, {self.position}, {self.team})"
@@ -0,0 +1,202 @@
+"""
+Player Identity Module
+----------------------
+This module defines the PlayerCrosswalk, the single identity index every data
+source joins through. Names are normalized once (case, accents, punctuation,
+Jr./Sr./II-V suffixes, nicknames) and each normalized name gets a stable integer
+player id; the raw key every source (DVOA, PFF, projections) lists a player under
+is recorded against that id, so joins between sources are integer lookups. The
+crosswalk is saved next to the raw data and extended when a refresh brings new
+names, keeping ids stable from run to run, and one crosswalk per file is shared
+by the whole process.
+"""
+
+import json
+import logging
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Generational suffixes dropped from the end of a name
+NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+
+# First names some sources shorten or spell out, mapped to one canonical form
+FIRST_NAME_ALIASES = {
+    "gabe": "gabriel",
+    "scotty": "scott",
+    "joshua": "josh"
+}
+
+# Whole-name aliases for players listed under a nickname or a shortened surname,
+# keyed and valued by normalized name
+PLAYER_ALIASES = {
+    "tank dell": "nathaniel dell",
+    "chig okonkwo": "chigoziem okonkwo",
+    "nick westbrook ikhine": "nick westbrook"
+}
+
+_PUNCTUATION = re.compile(r"[.,'’`\"]")
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Return the key a player's name is matched on across sources.
+
+    "D.K. Metcalf", "DK Metcalf" and "dk metcalf" all become "dk metcalf";
+    "Kenneth Walker III" becomes "kenneth walker" and "Gabe Davis" becomes
+    "gabriel davis".
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(char for char in name if not unicodedata.combining(char)).lower()
+    tokens = _SEPARATORS.sub(" ", _PUNCTUATION.sub("", name)).split()
+    while len(tokens) > 2 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    if tokens:
+        tokens[0] = FIRST_NAME_ALIASES.get(tokens[0], tokens[0])
+    key = " ".join(tokens)
+    return PLAYER_ALIASES.get(key, key)
+
+
+class PlayerCrosswalk:
+    """Stable integer ids for normalized player names and every source's key for each."""
+
+    __slots__ = ['keys', 'sources', 'file_path', 'changed', '_ids']
+
+    def __init__(self, keys: Iterable[str] = (), sources: Optional[Dict[str, Dict[str, int]]] = None,
+                 file_path: Optional[str] = None):
+        """
+        Create a crosswalk.
+
+        Args:
+            keys: Normalized names, ordered by player id.
+            sources: Source name -> {raw key: player id}.
+            file_path: Where save() writes the crosswalk.
+        """
+        self.keys: List[str] = list(keys)
+        self._ids: Dict[str, int] = {key: player_id for player_id, key in enumerate(self.keys)}
+        self.sources: Dict[str, Dict[str, int]] = sources or {}
+        self.file_path = file_path
+        self.changed = False
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._ids
+
+    def register(self, source: str, raw_key: str) -> int:
+        """Return the player id for a source's key, assigning a new id to unseen players."""
+        source_keys = self.sources.setdefault(source, {})
+        player_id = source_keys.get(raw_key)
+        if player_id is not None:
+            return player_id
+        key = normalize_name(raw_key)
+        player_id = self._ids.get(key)
+        if player_id is None:
+            player_id = self._ids[key] = len(self.keys)
+            self.keys.append(key)
+        source_keys[raw_key] = player_id
+        self.changed = True
+        return player_id
+
+    def register_all(self, source: str, raw_keys: Iterable[str]) -> np.ndarray:
+        """Register many of a source's keys at once and return their player ids."""
+        return np.array([self.register(source, raw_key) for raw_key in raw_keys], dtype=np.int64)
+
+    def id_of(self, name: str, source: Optional[str] = None) -> int:
+        """Return the player id for a name (a source's raw key if source is given), or -1."""
+        if source is not None and name in self.sources.get(source, ()):
+            return self.sources[source][name]
+        return self._ids.get(normalize_name(name), -1)
+
+    def ids_of(self, names: Iterable[str], source: Optional[str] = None) -> np.ndarray:
+        """Return player ids for many names at once (-1 for unknown players)."""
+        return np.array([self.id_of(name, source) for name in names], dtype=np.int64)
+
+    def source_keys(self, source: str) -> Dict[int, str]:
+        """Return player id -> the first key a source lists that player under."""
+        keys: Dict[int, str] = {}
+        for raw_key, player_id in self.sources.get(source, {}).items():
+            keys.setdefault(player_id, raw_key)
+        return keys
+
+    def rows_by_id(self, source: str, raw_keys: Iterable[str]) -> np.ndarray:
+        """
+        Return an array mapping every player id to its row in a source's table.
+
+        Args:
+            source: The source the table came from.
+            raw_keys: The table's keys, ordered by row; they are registered if new.
+
+        Returns:
+            np.ndarray: Row index per player id, -1 where the table has no row. When
+            several keys normalize to the same player, the first row wins.
+        """
+        player_ids = self.register_all(source, raw_keys)
+        rows = np.full(len(self.keys), -1, dtype=np.int64)
+        rows[player_ids[::-1]] = np.arange(len(player_ids))[::-1]
+        return rows
+
+    def to_dict(self) -> Dict:
+        return {"players": self.keys, "sources": self.sources}
+
+    def save(self, file_path: Optional[str] = None):
+        """Atomically write the crosswalk as JSON (to its own file_path by default)."""
+        file_path = file_path or self.file_path
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=1, sort_keys=True)
+        os.replace(temp_path, file_path)
+        self.changed = False
+
+    def save_if_changed(self):
+        """Write the crosswalk if new players or keys were registered since it was loaded."""
+        if self.changed and self.file_path:
+            self.save()
+            logger.debug("Saved %d player ids to %s", len(self.keys), self.file_path)
+
+
+def load_crosswalk(file_path: str) -> PlayerCrosswalk:
+    """
+    Load a crosswalk saved by PlayerCrosswalk.save(), or start an empty one.
+
+    Keys are re-normalized on load, so a change to the normalization rules only
+    ever adds ids; existing ids keep their meaning.
+    """
+    try:
+        with open(file_path, encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return PlayerCrosswalk(file_path=file_path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable player crosswalk %s: %s", file_path, exc)
+        return PlayerCrosswalk(file_path=file_path)
+    crosswalk = PlayerCrosswalk(data.get("players", []), file_path=file_path)
+    for source, source_keys in data.get("sources", {}).items():
+        for raw_key, player_id in source_keys.items():
+            crosswalk.sources.setdefault(source, {})[raw_key] = player_id
+            crosswalk._ids.setdefault(normalize_name(raw_key), player_id)
+    return crosswalk
+
+
+_crosswalks: Dict[str, PlayerCrosswalk] = {}
+
+
+def get_crosswalk(file_path: str) -> PlayerCrosswalk:
+    """Return the process-wide crosswalk stored at file_path, loading it on first use."""
+    crosswalk = _crosswalks.get(file_path)
+    if crosswalk is None:
+        crosswalk = _crosswalks[file_path] = load_crosswalk(file_path)
+    return crosswalk
+
+
+def use_crosswalk(crosswalk: PlayerCrosswalk):
+    """Make a crosswalk the one shared for its file_path."""
+    _crosswalks[crosswalk.file_path] = crosswalk
@@ -0,0 +1,128 @@
+"""
+Profiling Module
+----------------
+This module provides lightweight timing spans for the projection pipeline. A
+span is opened with the `span` context manager or the `profiled` decorator and
+accumulates call count, wall time and CPU time under its name. Profiling is off
+by default: a disabled span is a shared no-op object and a disabled decorator
+adds a single flag check, so instrumented code costs next to nothing in normal
+runs. Times are inclusive, so nested spans are also counted in their parents.
+"""
+
+import time
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+_enabled = False
+# name -> [calls, wall seconds, CPU seconds]
+_stats: Dict[str, List[float]] = {}
+
+
+class _Span:
+    """Times one entry into a named stage."""
+
+    __slots__ = ['name', 'wall', 'cpu']
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        _record(self.name, time.perf_counter() - self.wall, time.process_time() - self.cpu)
+        return False
+
+
+class _NullSpan:
+    """Span used while profiling is disabled."""
+
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _record(name: str, wall: float, cpu: float):
+    entry = _stats.get(name)
+    if entry is None:
+        _stats[name] = [1, wall, cpu]
+    else:
+        entry[0] += 1
+        entry[1] += wall
+        entry[2] += cpu
+
+
+def enable():
+    """Start recording spans."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording spans; what was recorded is kept."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Discard every recorded span."""
+    _stats.clear()
+
+
+def span(name: str):
+    """Return a context manager timing the enclosed block under a stage name."""
+    return _Span(name) if _enabled else _NULL_SPAN
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorate a function so every call is timed as a span (named after the function by default)."""
+    def decorator(function: Callable) -> Callable:
+        span_name = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_stats() -> Dict[str, Dict[str, float]]:
+    """Return the recorded spans as name -> {'calls', 'wall', 'cpu'}."""
+    return {name: {'calls': calls, 'wall': wall, 'cpu': cpu} for name, (calls, wall, cpu) in _stats.items()}
+
+
+def report(total_wall: Optional[float] = None) -> str:
+    """
+    Return the recorded spans as a table, slowest first.
+
+    Args:
+        total_wall (Optional[float]): Wall time of the whole run, used for the percentage
+            column; defaults to the slowest span.
+    """
+    if not _stats:
+        return "No profiling spans recorded."
+    rows = sorted(_stats.items(), key=lambda item: -item[1][1])
+    total_wall = total_wall or rows[0][1][1]
+    width = max(len("Stage"), *(len(name) for name in _stats))
+    lines = [f"{'Stage':<{width}} {'Calls':>8} {'Wall (s)':>10} {'CPU (s)':>10} {'Avg (ms)':>10} {'% Wall':>7}",
+             "-" * (width + 50)]
+    for name, (calls, wall, cpu) in rows:
+        lines.append(f"{name:<{width}} {calls:>8} {wall:>10.4f} {cpu:>10.4f} "
+                     f"{wall / calls * 1000:>10.3f} {wall / total_wall * 100:>6.1f}%")
+    return "\n".join(lines)
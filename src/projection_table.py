@@ -0,0 +1,192 @@
+"""
+Projection Table Module
+-----------------------
+This module defines the ProjectionTable, the compact columnar storage used for
+player projections. Every projected stat is a column of one players x stats
+array, teams and positions are small integer codes, and players are read
+through lightweight Player row views, so a week of projections costs a few
+hundred bytes per player and many weeks or sources can be held at once. Rows
+are indexed by team, by team and position, and by crosswalk player id, and each
+team's position groups and volume totals are summed once when the table is built.
+"""
+
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from player import Player
+from utils import safe_float
+
+# Projected stats held for every player, in column order
+PROJECTION_STATS = ("PassAtt", "PassComp", "PassTDs", "PassYds", "PassInt", "RushAtt", "RushYds", "RushTDs",
+                    "Targets", "Receptions", "RecYards", "RecTDs", "Fumbles")
+STAT_INDEX = {stat: i for i, stat in enumerate(PROJECTION_STATS)}
+
+# Projection file column of each stat, by source
+FANTASYDATA_COLUMNS = {
+    "PassAtt": "pass_att",
+    "PassComp": "pass_cmp",
+    "PassTDs": "pass_td",
+    "PassYds": "pass_yds",
+    "PassInt": "pass_int",
+    "RushAtt": "rush_att",
+    "RushYds": "rush_yds",
+    "RushTDs": "rush_td",
+    "Targets": "rec_tgt",
+    "Receptions": "rec",
+    "RecYards": "rec_yds",
+    "RecTDs": "rec_td",
+    "Fumbles": "fum"
+}
+
+# Position groups the team value model reads
+PASSING_POSITIONS = ("QB",)
+RECEIVING_POSITIONS = ("WR", "RB", "TE")
+RUSHING_POSITIONS = ("WR", "RB")
+# Positions whose rush attempts make up a team's total
+RUSH_ATTEMPT_POSITIONS = ("QB", "WR", "RB")
+
+# (player name, team, position, source row)
+ProjectionRow = Tuple[str, str, str, Mapping[str, str]]
+
+
+class TeamRoster(NamedTuple):
+    """A team's projected players by position group, with its volume totals."""
+    passers: np.ndarray
+    receivers: np.ndarray
+    rushers: np.ndarray
+    # QB pass attempts
+    pass_attempts: float
+    # WR, RB and TE targets
+    targets: float
+    # QB, WR and RB rush attempts
+    rush_attempts: float
+
+
+class ProjectionTable:
+    """Columnar projected stats for one week and source."""
+
+    __slots__ = ['names', 'team_names', 'position_names', 'teams', 'positions', 'stats', 'player_ids',
+                 '_team_rows', '_team_position_rows', '_rosters', '_id_rows']
+
+    STATS = PROJECTION_STATS
+
+    def __init__(self, names: Sequence[str], teams: Sequence[str], positions: Sequence[str], stats: np.ndarray):
+        """Build the table from per-player columns.
+
+        Args:
+            names: Player names as listed by the source, one per row.
+            teams: Team of each row.
+            positions: Position of each row.
+            stats: Players x PROJECTION_STATS array of projected stats.
+        """
+        self.names = tuple(names)
+        self.team_names = tuple(dict.fromkeys(teams))
+        self.position_names = tuple(dict.fromkeys(positions))
+        team_codes = {team: i for i, team in enumerate(self.team_names)}
+        position_codes = {position: i for i, position in enumerate(self.position_names)}
+        self.teams = np.array([team_codes[team] for team in teams], dtype=np.int16)
+        self.positions = np.array([position_codes[position] for position in positions], dtype=np.int8)
+        self.stats = np.asarray(stats, dtype=float).reshape(len(self.names), len(PROJECTION_STATS))
+        self.player_ids = np.full(len(self.names), -1, dtype=np.int64)
+        self._id_rows: Dict[int, int] = {}
+
+        rows = np.arange(len(self.names))
+        self._team_rows = {team: rows[self.teams == code] for team, code in team_codes.items()}
+        self._team_position_rows = {
+            (team, position): team_rows[self.positions[team_rows] == position_code]
+            for team, team_rows in self._team_rows.items()
+            for position, position_code in position_codes.items()
+        }
+        self._rosters = {team: self._build_roster(team) for team in self.team_names}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[ProjectionRow], columns: Mapping[str, str]) -> "ProjectionTable":
+        """Build the table from source rows, reading each stat from its column in `columns`.
+
+        Stats a source does not provide, or leaves blank or non-numeric, are 0.
+        """
+        names, teams, positions, stats = [], [], [], []
+        for name, team, position, row in rows:
+            names.append(name)
+            teams.append(team)
+            positions.append(position)
+            stats.append([safe_float(row.get(columns[stat])) if stat in columns else 0.0
+                          for stat in PROJECTION_STATS])
+        return cls(names, teams, positions, np.array(stats, dtype=float))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, row: int) -> Player:
+        return Player(self, row)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the table's arrays."""
+        return self.teams.nbytes + self.positions.nbytes + self.stats.nbytes + self.player_ids.nbytes
+
+    def team_of(self, row: int) -> str:
+        return self.team_names[self.teams[row]]
+
+    def position_of(self, row: int) -> str:
+        return self.position_names[self.positions[row]]
+
+    def stat(self, row: int, stat: str) -> float:
+        """Return one player's projection for a stat."""
+        return float(self.stats[row, STAT_INDEX[stat]])
+
+    def column(self, stat: str) -> np.ndarray:
+        """Return a view of every player's projection for a stat."""
+        return self.stats[:, STAT_INDEX[stat]]
+
+    def rows_of(self, team: str, position: Optional[str] = None) -> np.ndarray:
+        """Return the rows of a team's players (of one position if given), in source order.
+
+        Raises:
+            KeyError: If the team has no projected players.
+        """
+        rows = self._team_rows[team]
+        if position is None:
+            return rows
+        return self._team_position_rows.get((team, position), rows[:0])
+
+    def players_of(self, team: str, position: Optional[str] = None) -> List[Player]:
+        """Return row views of a team's players (of one position if given)."""
+        return [Player(self, row) for row in self.rows_of(team, position).tolist()]
+
+    def roster_of(self, team: str) -> TeamRoster:
+        """Return a team's position groups and volume totals.
+
+        Raises:
+            KeyError: If the team has no projected players.
+        """
+        return self._rosters[team]
+
+    def _group_rows(self, team: str, positions: Sequence[str]) -> np.ndarray:
+        """Return the rows of a team's players at any of the given positions, in source order."""
+        position_codes = [self.position_names.index(position) for position in positions
+                          if position in self.position_names]
+        team_rows = self._team_rows[team]
+        return team_rows[np.isin(self.positions[team_rows], position_codes)]
+
+    def _build_roster(self, team: str) -> TeamRoster:
+        """Split a team into position groups and sum its volume in source order."""
+        rush_attempt_rows = self._group_rows(team, RUSH_ATTEMPT_POSITIONS)
+        passers = self._group_rows(team, PASSING_POSITIONS)
+        receivers = self._group_rows(team, RECEIVING_POSITIONS)
+        return TeamRoster(
+            passers, receivers, self._group_rows(team, RUSHING_POSITIONS),
+            sum(self.stats[passers, STAT_INDEX["PassAtt"]].tolist()),
+            sum(self.stats[receivers, STAT_INDEX["Targets"]].tolist()),
+            sum(self.stats[rush_attempt_rows, STAT_INDEX["RushAtt"]].tolist())
+        )
+
+    def assign_ids(self, player_ids: Sequence[int]):
+        """Set the crosswalk player id of every row."""
+        self.player_ids[:] = player_ids
+        self._id_rows = {player_id: row for row, player_id in reversed(list(enumerate(self.player_ids.tolist())))}
+
+    def row_of(self, player_id: int) -> int:
+        """Return the row of a player id, or -1 if the player is not in the table."""
+        return self._id_rows.get(player_id, -1)
@@ -1,47 +1,55 @@
 import config
 import csv
-from player import Player
+from functools import cached_property
+from projection_table import FANTASYDATA_COLUMNS, ProjectionTable
 
 import pprint as pp
 
 class Projections:
-    def __init__(self):
-        self.projections_data = self._load_projections()
+    POSITIONS = ["QB", "WR", "RB", "TE"]
+
+    def __init__(self, week: int = config.WEEK_NUM, season: str = config.SEASON, data_dir: str = config.DATA_DIR):
+        self.week = week
+        self.season = season
+        self.data_dir = data_dir
+
+    @cached_property
+    def table(self) -> ProjectionTable:
+        return self._load_projections()
+
+    @cached_property
+    def players(self):
+        return [self.table[row] for row in range(len(self.table))]
+
+    def load(self):
+        """Load the projections now rather than on first access."""
+        self.table
+        return self
 
     def _load_projections(self):
-        projections = self._load_fantasydata_projections()
-        #ftn_projections = self._load_ftn_projections()
-        #fantasy_data_projections = self._load_fantasydata_projections(ftn_projections)
-        return projections
+        return self._load_fantasydata_projections()
+
+    def get_source_files(self):
+        return [self._fantasydata_file(position) for position in self.POSITIONS]
+
+    def _fantasydata_file(self, position):
+        return f"{self.data_dir}projections/{self.season}/week{self.week}/projections_{position.lower()}.csv"
 
     def _load_fantasydata_projections(self):
-        team_data = {}
-        positions = ["QB", "WR", "RB", "TE"]
-        for position in positions:
-            with open(f"../data/raw/projections/2024/week{config.WEEK_NUM}/projections_{position.lower()}.csv", newline='', encoding='utf-8') as csvfile:
+        rows = []
+        for position in self.POSITIONS:
+            with open(self._fantasydata_file(position), newline='', encoding='utf-8') as csvfile:
                 reader = csv.DictReader(csvfile)
                 for row in reader:
-                    team = row['team']
-                    player_name = row['player']
-                    player_position = row['pos']
-                    player_obj = Player(player_name, player_position, team)
-                    player_obj.load_fd_data(row)
-                    team_data.setdefault(team, []).append((player_name, player_position, player_obj))
-        return team_data
-
-    # def _load_ftn_projections(self):
-    #     team_data = {}
-    #     for position in ["qb","rb","wr","te"]:
-    #         with open(f"../data/raw/projections/2024/week4/ftn_projections_{position}.csv", newline='', encoding='utf-8') as csvfile:
-    #             reader = csv.DictReader(csvfile)
-    #             for row in reader:
-    #                 team = row['Team']
-    #                 player_name = row['Player']
-    #                 player_position = row['Position']
-    #                 player_obj = Player(player_name, player_position, team)
-    #                 player_obj.load_ftn_data(row)
-    #                 team_data.setdefault(team, []).append((player_name, player_position, player_obj))
-    #     return team_data
+                    rows.append((row['player'], row['team'], row['pos'], row))
+        return ProjectionTable.from_rows(rows, FANTASYDATA_COLUMNS)
 
     def get_team_projections(self, team_name):
-        return self.projections_data[team_name]
\ No newline at end of file
+        return [(self.table.names[row], self.table.position_of(row), self.table[row])
+                for row in self.table.rows_of(team_name).tolist()]
+
+    def get_team_roster(self, team_name):
+        return self.table.roster_of(team_name)
+
+    def get_players(self):
+        return self.players
\ No newline at end of file
@@ -0,0 +1,283 @@
+"""
+Scenario Sweep Module
+---------------------
+This module answers what-if questions about a slate ("what if it rains at every
+outdoor game", "what if home advantage is 1.5", "what if every team passes 5% more")
+without editing the data files. A Scenarios set holds a grid or list of overrides
+of precipitation, pass rates, home field advantage, field type and the weights of
+the team value components. ScenarioSweep gathers each game's team components once
+and then evaluates every game under every scenario in one vectorized pass,
+returning scenarios × games arrays of projected scores, win percentages and edges.
+
+Temperature and wind are not sweep axes: the points model only reads the
+precipitation impact of WeatherConditions.
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+import config
+from calibration import get_calibration
+from context import SeasonDataContext
+from data_loader import ParsedDataCache
+from game_projection import BETTING_LINE_KEYS, EDGE_KEYS
+from matchup import WIN_PCT_BOUNDS, Matchup
+from team import PASS_COMPONENTS, RUSH_COMPONENTS, Team
+from weather import WeatherConditions
+
+FIELD_TYPES = ('turf', 'grass')
+# Component weight axes, e.g. 'qb_weight', in the order of PASS_COMPONENTS then RUSH_COMPONENTS
+WEIGHT_AXES = tuple(f"{key}_weight" for key in (*PASS_COMPONENTS, *RUSH_COMPONENTS))
+# precipitation: chance at every outdoor game; pass_rate_shift: points added to every
+# game's pass rates; home_advantage: every home team's advantage; field: every game's field
+AXES = ('precipitation', 'pass_rate_shift', 'home_advantage', 'field') + WEIGHT_AXES
+
+
+class Scenarios:
+    """A set of what-if scenarios, stored as one override array per axis.
+
+    Axes a scenario leaves alone hold NaN (None for field), meaning each game keeps
+    its own value.
+    """
+
+    __slots__ = ['overrides', 'count']
+
+    def __init__(self, overrides: Mapping[str, Sequence[Any]], count: int):
+        """
+        Raises:
+            ValueError: If an axis is unknown, a field type is not turf or grass, or an
+                axis does not have one value per scenario.
+        """
+        unknown = set(overrides) - set(AXES)
+        if unknown:
+            raise ValueError(f"Unknown scenario axes {sorted(unknown)}; expected some of {', '.join(AXES)}")
+        self.count = count
+        self.overrides: Dict[str, np.ndarray] = {}
+        for axis, values in overrides.items():
+            if axis == 'field':
+                invalid = set(values) - {*FIELD_TYPES, None}
+                if invalid:
+                    raise ValueError(f"Unknown field types {sorted(invalid)}; expected turf or grass")
+                array = np.array(values, dtype=object)
+            else:
+                array = np.array([np.nan if value is None else value for value in values], dtype=float)
+            if len(array) != count:
+                raise ValueError(f"Axis {axis} has {len(array)} values for {count} scenarios")
+            self.overrides[axis] = array
+
+    @classmethod
+    def grid(cls, **axes: Sequence[Any]) -> "Scenarios":
+        """Return every combination of the given axis values, the last axis varying fastest."""
+        names = list(axes)
+        shape = tuple(len(axes[name]) for name in names)
+        combinations = np.indices(shape).reshape(len(shape), -1)
+        return cls({name: [axes[name][i] for i in combinations[axis].tolist()] for axis, name in enumerate(names)},
+                   int(np.prod(shape)))
+
+    @classmethod
+    def from_list(cls, scenarios: Sequence[Mapping[str, Any]]) -> "Scenarios":
+        """Return the given scenarios, each a mapping of the axes it overrides."""
+        names = list(dict.fromkeys(axis for scenario in scenarios for axis in scenario))
+        return cls({name: [scenario.get(name) for scenario in scenarios] for name in names}, len(scenarios))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Return the axes one scenario overrides."""
+        scenario = {}
+        for axis, values in self.overrides.items():
+            value = values[index]
+            if value is not None and not (isinstance(value, float) and np.isnan(value)):
+                scenario[axis] = value.item() if isinstance(value, np.generic) else value
+        return scenario
+
+    def values(self, axis: str, default: float) -> np.ndarray:
+        """Return a numeric axis for every scenario, with default where it is not overridden."""
+        values = self.overrides.get(axis)
+        if values is None:
+            return np.full(self.count, default, dtype=float)
+        return np.where(np.isnan(values), default, values)
+
+
+class SweepResult(NamedTuple):
+    """Every game projected under every scenario; arrays are scenarios × games."""
+    games: List[Tuple[str, str]]
+    scenarios: Scenarios
+    home_points: np.ndarray
+    away_points: np.ndarray
+    home_win_pct: np.ndarray
+    # scenarios × games × EDGE_KEYS, NaN for games without betting lines
+    edges: np.ndarray
+
+    def game(self, home: str, away: str) -> int:
+        """Return the column of a game."""
+        return self.games.index((home, away))
+
+    def edge(self, market: str) -> np.ndarray:
+        """Return one market's edges (scenarios × games)."""
+        return self.edges[:, :, EDGE_KEYS.index(market)]
+
+    def save(self, file_path: str):
+        """Save the arrays, game names and scenario overrides to a NumPy .npz file."""
+        overrides = {f"scenario_{axis}": values.astype(str) if axis == 'field' else values
+                     for axis, values in self.scenarios.overrides.items()}
+        np.savez(file_path, home=np.array([home for home, _ in self.games]),
+                 away=np.array([away for _, away in self.games]), home_points=self.home_points,
+                 away_points=self.away_points, home_win_pct=self.home_win_pct, edges=self.edges, **overrides)
+
+
+class ScenarioSweep:
+    """One week's games, gathered once and evaluated under any set of scenarios."""
+
+    def __init__(self, context: SeasonDataContext):
+        """Compute every team's value components with the current calibration and read each game's conditions."""
+        matchups = context.matchups
+        self.games = [(matchup_data['home'], matchup_data['away']) for matchup_data in matchups]
+        teams = {name: Team(name, context) for game in self.games for name in game}
+
+        def per_game(side: int, read) -> np.ndarray:
+            return np.array([read(teams[game[side]]) for game in self.games], dtype=float)
+
+        # (games × components) offensive components and (games × [pass, rush]) defensive values
+        self.passing = [per_game(side, lambda team: list(team.get_passing_components().values())) for side in (0, 1)]
+        self.rushing = [per_game(side, lambda team: list(team.get_rushing_components().values())) for side in (0, 1)]
+        self.defense = [per_game(side, lambda team: [team.get_total_passing_value_def(),
+                                                     team.get_total_rushing_value_def()]) for side in (0, 1)]
+        # (games × [offense, defense]) pass rates
+        self.pass_rates = [per_game(side, lambda team: team.get_pass_rates(context.pass_rates)) for side in (0, 1)]
+        self.home_advantage = np.array([float(context.home_field_advantage[home][0]) for home, _ in self.games])
+
+        self.turf = np.array([matchup_data['field'] == 'turf' for matchup_data in matchups])
+        self.outdoor = np.array([matchup_data['dome'] != "yes" for matchup_data in matchups])
+        self.precipitation = np.array([matchup_data['weather'] if matchup_data['dome'] != "yes" else 0
+                                       for matchup_data in matchups], dtype=float)
+        self.lines = np.array([[lines[key] for key in BETTING_LINE_KEYS] if lines else [np.nan] * len(BETTING_LINE_KEYS)
+                               for lines in (matchup_data['betting_lines'] for matchup_data in matchups)],
+                              dtype=float).reshape(len(matchups), len(BETTING_LINE_KEYS))
+        self.implied_home_win = np.array([Matchup._calculate_implied_win_pct(lines['home_ml']) if lines else np.nan
+                                          for lines in (matchup_data['betting_lines'] for matchup_data in matchups)])
+
+    def run(self, scenarios: Scenarios) -> SweepResult:
+        """Project every game under every scenario; weights it leaves alone are the calibration's."""
+        calibration = get_calibration()
+        pass_weights = np.column_stack([scenarios.values(f"{key}_weight", calibration.weight(key))
+                                        for key in PASS_COMPONENTS])
+        rush_weights = np.column_stack([scenarios.values(f"{key}_weight", calibration.weight(key))
+                                        for key in RUSH_COMPONENTS])
+        offense = [(self._weighted(self.passing[side], pass_weights), self._weighted(self.rushing[side], rush_weights))
+                   for side in (0, 1)]
+
+        shift = scenarios.values('pass_rate_shift', 0.0)[:, None]
+        home_pass_rate = (self.pass_rates[0][:, 0] + self.pass_rates[1][:, 1]) / 2 + shift
+        away_pass_rate = (self.pass_rates[1][:, 0] + self.pass_rates[0][:, 1]) / 2 + shift
+
+        precipitation = scenarios.values('precipitation', np.nan)[:, None]
+        precipitation = np.where(self.outdoor & ~np.isnan(precipitation), precipitation, self.precipitation)
+        precipitation_impact = WeatherConditions(None, None, precipitation).calculate_precipitation_impact()
+        home_advantage = scenarios.values('home_advantage', np.nan)[:, None]
+        home_advantage = np.where(np.isnan(home_advantage), self.home_advantage, home_advantage)
+        field = scenarios.overrides.get('field', np.full(len(scenarios), None, dtype=object))
+        keep_field = np.array([value is None for value in field])[:, None]
+        turf = np.where(keep_field, self.turf, (field == 'turf')[:, None])
+
+        home_value = self._offensive_value(offense[0], self.defense[1], home_pass_rate) - precipitation_impact
+        away_value = self._offensive_value(offense[1], self.defense[0], away_pass_rate) - precipitation_impact
+        home_points = self._points(home_value, turf) + (home_advantage / 2)
+        away_points = self._points(away_value, turf) - (home_advantage / 2)
+
+        home_win_pct = np.clip(calibration.apply("Win Pct", away_points - home_points) * 100, *WIN_PCT_BOUNDS)
+        line = {key: self.lines[:, i] for i, key in enumerate(BETTING_LINE_KEYS)}
+        edges = np.stack([
+            home_win_pct - self.implied_home_win,
+            (100 - home_win_pct) - (100 - self.implied_home_win),
+            (home_points - away_points) - line['home_spread'],
+            (home_points + away_points) - line['total']
+        ], axis=-1)
+        return SweepResult(list(self.games), scenarios, home_points, away_points, home_win_pct, edges)
+
+    @staticmethod
+    def _weighted(components: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """Return games' weighted component sums under each scenario's weights (scenarios × games).
+
+        The sum is compensated like the built-in sum() Team uses, so the unchanged
+        weights reproduce Team's values exactly.
+        """
+        total = compensation = 0.0
+        for i in range(components.shape[1]):
+            term = components[None, :, i] * weights[:, None, i]
+            updated = total + term
+            compensation = compensation + np.where(np.abs(total) >= np.abs(term), (total - updated) + term,
+                                                   (term - updated) + total)
+            total = updated
+        return total + compensation
+
+    @staticmethod
+    def _offensive_value(offense: Tuple[np.ndarray, np.ndarray], defense: np.ndarray,
+                         pass_rate: np.ndarray) -> np.ndarray:
+        """Vectorized Matchup._calculate_offensive_value, before the precipitation impact."""
+        off_pass, off_rush = offense
+        pass_value = (off_pass - defense[:, 0]) * pass_rate / 100
+        rush_value = (off_rush - defense[:, 1]) * (100 - pass_rate) / 100
+        return pass_value + rush_value
+
+    @staticmethod
+    def _points(offensive_value: np.ndarray, turf: np.ndarray) -> np.ndarray:
+        calibration = get_calibration()
+        return np.where(turf, calibration.apply("Points Turf", offensive_value),
+                        calibration.apply("Points Grass", offensive_value))
+
+
+def _parse_weights(items: Sequence[str], parser: argparse.ArgumentParser) -> Dict[str, List[float]]:
+    """Parse COMPONENT=V1,V2,... weight axes."""
+    axes = {}
+    for item in items:
+        component, _, values = item.partition('=')
+        axis = f"{component}_weight"
+        if axis not in WEIGHT_AXES:
+            parser.error(f"unknown component '{component}' (choose from {', '.join(PASS_COMPONENTS + RUSH_COMPONENTS)})")
+        axes[axis] = [float(value) for value in values.split(',')]
+    return axes
+
+
+def main(argv=None):
+    """Sweep a grid of scenarios over one week from the command line."""
+    parser = argparse.ArgumentParser(description="Project a week's games under a grid of what-if scenarios.")
+    parser.add_argument('--week', type=int, default=config.WEEK_NUM, help=f"Week (default: {config.WEEK_NUM})")
+    parser.add_argument('--season', default=config.SEASON, help=f"Season (default: {config.SEASON})")
+    parser.add_argument('--precipitation', type=float, nargs='+', help="Precipitation chances at outdoor games")
+    parser.add_argument('--pass-rate-shift', type=float, nargs='+', help="Points added to every pass rate")
+    parser.add_argument('--home-advantage', type=float, nargs='+', help="Home field advantages")
+    parser.add_argument('--field', nargs='+', choices=FIELD_TYPES, help="Field types")
+    parser.add_argument('--weight', nargs='+', metavar='COMPONENT=V1,V2', default=[],
+                        help="Component weights, e.g. qb=0.4,0.5,0.6 rushing=0.5,0.6")
+    parser.add_argument('--output', help="Save the sweep to a .npz file")
+    args = parser.parse_args(argv)
+
+    axes = {axis: getattr(args, axis) for axis in ('precipitation', 'pass_rate_shift', 'home_advantage', 'field')
+            if getattr(args, axis)}
+    axes.update(_parse_weights(args.weight, parser))
+    if not axes:
+        parser.error("give at least one axis to sweep")
+
+    sweep = ScenarioSweep(SeasonDataContext(args.week, args.season, cache=ParsedDataCache()))
+    started = time.perf_counter()
+    result = sweep.run(Scenarios.grid(**axes))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{len(result.scenarios)} scenarios x {len(result.games)} games in {elapsed_ms:.1f} ms")
+    print(f"{'Game':<12} {'Home':>17} {'Away':>17} {'Total':>17}")
+    for column, (home, away) in enumerate(result.games):
+        ranges = [values[:, column] for values in (result.home_points, result.away_points,
+                                                   result.home_points + result.away_points)]
+        print(f"{away + ' @ ' + home:<12} " + " ".join(f"{values.min():>5.1f}-{values.max():<5.1f}"
+                                                      f"({values.mean():>4.1f})" for values in ranges))
+    if args.output:
+        result.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
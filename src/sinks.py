@@ -0,0 +1,182 @@
+"""
+Projection Sinks Module
+-----------------------
+This module defines the output sinks a slate of GameProjection records can be
+written to: the colored terminal report, CSV, JSON Lines and a columnar NumPy
+(.npz) file with one array per column. Every sink renders the whole slate in
+memory and writes it in a single call, so output never interleaves with the
+computation and costs one write per slate rather than one per line.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+from typing import Dict, List, Sequence, TextIO, Type
+
+import numpy as np
+from colorama import Fore, Style
+
+from game_projection import GameProjection
+
+
+class ProjectionSink:
+    """Base class for destinations a slate of projections is written to."""
+
+    def write(self, projections: Sequence[GameProjection]):
+        """Write every projection of a slate."""
+        raise NotImplementedError
+
+
+class TerminalSink(ProjectionSink):
+    """Renders the full game analysis report, one section per game."""
+
+    def __init__(self, stream: TextIO = None):
+        self.stream = stream
+
+    def write(self, projections: Sequence[GameProjection]):
+        text = "".join(self.render(projection) for projection in projections)
+        (self.stream or sys.stdout).write(text)
+
+    def render(self, projection: GameProjection) -> str:
+        """Return the game analysis report for one projection."""
+        lines = []
+        self._render_header(projection, lines)
+        self._render_details(projection, lines)
+        self._render_lineups(projection, lines)
+        self._render_scores(projection, lines)
+        if projection.betting_lines:
+            self._render_betting_info(projection, lines)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _section(title: str) -> str:
+        return f"\n{Fore.GREEN}{Style.BRIGHT}{title}:{Style.RESET_ALL}"
+
+    def _render_header(self, projection: GameProjection, lines: List[str]):
+        lines.append("\n" + "=" * 60)
+        lines.append(f"{Fore.CYAN}{Style.BRIGHT}Game Analysis: {projection.away} vs {projection.home}{Style.RESET_ALL}")
+        lines.append("=" * 60)
+
+    def _render_details(self, projection: GameProjection, lines: List[str]):
+        lines.append(self._section("Game Details"))
+        details = [
+            ('Home Team:', projection.home),
+            ('Away Team:', projection.away),
+            ('Field Type:', projection.field),
+            ('Dome:', projection.dome),
+            ('Temperature:', f"{projection.temperature}°F"),
+            ('Wind:', f"{projection.wind} mph"),
+            ('Precipitation:', projection.precipitation)
+        ]
+        lines.extend(f"{label:<15} {value}" for label, value in details)
+
+    def _render_lineups(self, projection: GameProjection, lines: List[str]):
+        lines.append(self._section("Starting Lineups"))
+        for team, lineup in [(projection.home, projection.home_lineup), (projection.away, projection.away_lineup)]:
+            lines.append(f"\n{team}:")
+            lines.extend(f"{player:<20} ({position})" for player, position in lineup)
+
+    def _render_scores(self, projection: GameProjection, lines: List[str]):
+        lines.append(self._section("Projected Scores"))
+        lines.append(f"{projection.home:<20} {projection.home_points:.0f}")
+        lines.append(f"{projection.away:<20} {projection.away_points:.0f}")
+        lines.append(self._section("Win Percentages"))
+        lines.append(f"{projection.home:<20} {projection.home_win_pct:.0f}%")
+        lines.append(f"{projection.away:<20} {100 - projection.home_win_pct:.0f}%")
+
+    def _render_betting_info(self, projection: GameProjection, lines: List[str]):
+        lines.append(self._section("Betting Lines"))
+        for label, key in [
+            ('Home Team Spread:', 'home_spread'),
+            ('Away Team Spread:', 'away_spread'),
+            ('Over/Under:', 'total'),
+            ('Home Team Moneyline:', 'home_ml'),
+            ('Away Team Moneyline:', 'away_ml')
+        ]:
+            lines.append(f"{label:<20} {projection.betting_lines[key]}")
+
+        lines.append(self._section("Bet Recommendations"))
+        recommendations = []
+        for bet in projection.bets:
+            if bet['market'] == 'moneyline':
+                odds_str = f"+{bet['odds']}" if bet['odds'] > 0 else str(bet['odds'])
+                recommendations.append(f"{"Moneyline:":<10} {bet['team']:<5} ({odds_str}) ${bet['stake']:<3.0f}  | Implied Win% ({bet['impl_win']:.1f}) | Edge: {bet['edge']:.1f}%")
+            elif bet['market'] == 'total':
+                over_under = "o" if bet['bet'] == 'over' else "u"
+                recommendations.append(f"{"Total:":<10} {over_under}{bet['line']:<11} ${bet['stake']:<4.0f} | Proj Total   ({bet['proj_total']:.1f}) | Edge: {bet['edge']:.1f}%")
+        lines.extend(recommendations or ["No strong betting recommendations for this game."])
+        lines.append("\n" + "=" * 60)
+
+
+class CSVSink(ProjectionSink):
+    """Writes one flat row per game to a CSV file."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def write(self, projections: Sequence[GameProjection]):
+        rows = [projection.to_row() for projection in projections]
+        buffer = io.StringIO()
+        if rows:
+            writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        with open(self.file_path, 'w', encoding='utf-8', newline='') as file:
+            file.write(buffer.getvalue())
+
+
+class JSONLinesSink(ProjectionSink):
+    """Writes one JSON object per game, including lineups and bets."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def write(self, projections: Sequence[GameProjection]):
+        text = "".join(json.dumps(projection.to_dict()) + "\n" for projection in projections)
+        with open(self.file_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+
+class NpzSink(ProjectionSink):
+    """Writes the slate column-wise to a NumPy .npz file, one array per row field.
+
+    Numeric columns are float arrays with NaN for missing values; every other column
+    is a string array with '' for missing values.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def write(self, projections: Sequence[GameProjection]):
+        rows = [projection.to_row() for projection in projections]
+        columns = {}
+        for name in (rows[0] if rows else {}):
+            values = [row[name] for row in rows]
+            if all(value is None or isinstance(value, (int, float)) for value in values):
+                columns[name] = np.array([np.nan if value is None else value for value in values], dtype=float)
+            else:
+                columns[name] = np.array(['' if value is None else str(value) for value in values])
+        np.savez(self.file_path, **columns)
+
+
+SINKS_BY_EXTENSION: Dict[str, Type[ProjectionSink]] = {
+    '.csv': CSVSink,
+    '.jsonl': JSONLinesSink,
+    '.npz': NpzSink
+}
+
+
+def get_sink(file_path: str) -> ProjectionSink:
+    """
+    Return the file sink matching a path's extension.
+
+    Raises:
+        ValueError: If the extension is not one of SINKS_BY_EXTENSION.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in SINKS_BY_EXTENSION:
+        raise ValueError(f"Unsupported output format '{extension}' for {file_path}; "
+                         f"expected one of {', '.join(SINKS_BY_EXTENSION)}")
+    return SINKS_BY_EXTENSION[extension](file_path)
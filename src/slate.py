@@ -0,0 +1,91 @@
+"""
+Slate Module
+------------
+This module projects whole slates of matchups, optionally across several weeks,
+either in-process or fanned out to a process pool. Results come back as
+structured GameProjection records in original slate order, so they can be
+written to any set of sinks after the computation without interleaving output
+from workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+import config
+from calibration import CalibrationRegistry, get_calibration, use_calibration
+from context import SeasonDataContext
+from data_loader import ParsedDataCache
+from game_projection import GameProjection
+from matchup import Matchup
+from player_ids import PlayerCrosswalk, use_crosswalk
+from profiling import profiled, span
+from sinks import ProjectionSink, TerminalSink
+
+# (season, week, data_dir) -> context, one set per process
+_contexts: Dict[Tuple[str, int, str], SeasonDataContext] = {}
+
+
+def get_context(season: str, week: int, data_dir: str = config.DATA_DIR) -> SeasonDataContext:
+    """Return this process's shared context for a season and week, creating it on first use.
+
+    Contexts for other weeks of the same season share its week-independent sources.
+    """
+    key = (season, week, data_dir)
+    if key not in _contexts:
+        season_context = next((context for (other_season, _, other_dir), context in _contexts.items()
+                               if other_season == season and other_dir == data_dir), None)
+        if season_context is None:
+            _contexts[key] = SeasonDataContext(week, season, data_dir, cache=ParsedDataCache())
+        else:
+            _contexts[key] = season_context.for_week(week)
+    return _contexts[key]
+
+
+@profiled("project_slate")
+def project_slate(weeks: Sequence[int], season: str = config.SEASON, workers: int = 1,
+                  data_dir: str = config.DATA_DIR) -> List[GameProjection]:
+    """
+    Project every matchup of the given weeks.
+
+    Args:
+        weeks (Sequence[int]): Weeks to project, in output order.
+        season (str): The season the weeks belong to.
+        workers (int): Number of worker processes; 1 projects in-process.
+        data_dir (str): Root of the raw data tree.
+
+    Returns:
+        List[GameProjection]: One result per game, in slate order.
+    """
+    tasks = [(season, week, index, data_dir)
+             for week in weeks
+             for index in range(len(get_context(season, week, data_dir).matchups))]
+    if workers <= 1:
+        return [_project_game(task) for task in tasks]
+
+    # Register every week's players here so all workers share one set of player ids
+    for week in weeks:
+        get_context(season, week, data_dir).projections
+    crosswalk = get_context(season, weeks[0], data_dir).player_ids
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(get_calibration(), crosswalk)) as executor:
+        return list(executor.map(_project_game, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def write_slate(projections: Sequence[GameProjection], sinks: Sequence[ProjectionSink] = None):
+    """Write a projected slate to each sink (the terminal report by default)."""
+    for sink in (sinks if sinks is not None else [TerminalSink()]):
+        with span(f"write.{type(sink).__name__}"):
+            sink.write(projections)
+
+
+def _init_worker(calibration: CalibrationRegistry, crosswalk: PlayerCrosswalk):
+    """Give a worker process the parent's calibration and player crosswalk."""
+    use_calibration(calibration)
+    use_crosswalk(crosswalk)
+
+
+def _project_game(task: Tuple[str, int, int, str]) -> GameProjection:
+    """Project one game; runs in a worker process when the slate is parallel."""
+    season, week, index, data_dir = task
+    context = get_context(season, week, data_dir)
+    return Matchup(context.matchups[index], context).project(index)
@@ -0,0 +1,151 @@
+"""
+Stats Store Module
+------------------
+This module defines the columnar, NumPy-backed storage used for historical box-score
+stats. Each StatsTable holds one category (passing, receiving or rushing) as a
+rows x stats array with one row per player, season and team stint, plus small
+integer codes for season, team and position. Rows are ordered by season, so a
+season's rows are a contiguous slice and its columns are views; once crosswalk ids
+are assigned, rows are also indexed by player id.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Stats held for each category, in source column order (after Player, Team and Pos)
+PASSING_STATS = ("Games", "Snap%", "Att", "DB", "Cmp", "Cmp%", "Yds", "YPA", "YPC", "aDOT", "YAC", "TD", "INT",
+                 "INT-6", "Sack", "Sack%", "Rtg", "PPR", "PPR/G")
+RECEIVING_STATS = ("Games", "Tgt", "Rec", "Yds", "YPR", "TD", "PPR", "PPR/G", "PPR/T")
+RUSHING_STATS = ("Games", "Att", "Yds", "YPA", "TD", "Fum", "FumL", "PPR", "PPR/G", "PPR/T")
+CATEGORY_STATS = {"passing": PASSING_STATS, "receiving": RECEIVING_STATS, "rushing": RUSHING_STATS}
+
+# (season, player name, team, position, stat values in the category's column order)
+StatsRow = Tuple[str, str, str, str, Sequence[float]]
+
+
+class StatsTable:
+    """Columnar historical stats for one category, one row per player, season and team."""
+
+    __slots__ = ['category', 'stats', 'season_names', 'team_names', 'position_names', 'names', 'seasons',
+                 'teams', 'positions', 'values', 'player_ids', '_stat_index', '_season_slices', '_id_rows']
+
+    def __init__(self, category: str, rows: Iterable[StatsRow]):
+        """Build the table from (season, name, team, position, values) rows.
+
+        Rows are stably sorted by season, so within a season they keep source order.
+        """
+        self.category = category
+        self.stats = CATEGORY_STATS[category]
+        self._stat_index = {stat: i for i, stat in enumerate(self.stats)}
+        rows = sorted(rows, key=lambda row: row[0])
+
+        self.season_names = tuple(dict.fromkeys(row[0] for row in rows))
+        self.team_names = tuple(dict.fromkeys(row[2] for row in rows))
+        self.position_names = tuple(dict.fromkeys(row[3] for row in rows))
+        season_codes = {season: i for i, season in enumerate(self.season_names)}
+        team_codes = {team: i for i, team in enumerate(self.team_names)}
+        position_codes = {position: i for i, position in enumerate(self.position_names)}
+
+        self.names = tuple(row[1] for row in rows)
+        self.seasons = np.array([season_codes[row[0]] for row in rows], dtype=np.int16)
+        self.teams = np.array([team_codes[row[2]] for row in rows], dtype=np.int16)
+        self.positions = np.array([position_codes[row[3]] for row in rows], dtype=np.int8)
+        self.values = np.array([row[4] for row in rows], dtype=float).reshape(len(rows), len(self.stats))
+        self.player_ids = np.full(len(rows), -1, dtype=np.int64)
+        self._id_rows: Dict[int, np.ndarray] = {}
+
+        bounds = np.searchsorted(self.seasons, np.arange(len(self.season_names) + 1))
+        self._season_slices = {season: slice(int(bounds[i]), int(bounds[i + 1]))
+                               for i, season in enumerate(self.season_names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory held by the table's arrays."""
+        return (self.seasons.nbytes + self.teams.nbytes + self.positions.nbytes + self.values.nbytes
+                + self.player_ids.nbytes)
+
+    def season_of(self, row: int) -> str:
+        return self.season_names[self.seasons[row]]
+
+    def team_of(self, row: int) -> str:
+        return self.team_names[self.teams[row]]
+
+    def position_of(self, row: int) -> str:
+        return self.position_names[self.positions[row]]
+
+    def stat(self, row: int, stat: str) -> float:
+        """Return one row's value for a stat."""
+        return float(self.values[row, self._stat_index[stat]])
+
+    def season_rows(self, season: str) -> slice:
+        """Return the slice of a season's rows (empty if the season was not loaded)."""
+        return self._season_slices.get(season, slice(0, 0))
+
+    def column(self, stat: str, season: Optional[str] = None) -> np.ndarray:
+        """Return a view of every row's value for a stat (only one season's rows if given)."""
+        rows = self.season_rows(season) if season is not None else slice(None)
+        return self.values[rows, self._stat_index[stat]]
+
+    def assign_ids(self, player_ids: Sequence[int]):
+        """Set the crosswalk player id of every row and index the rows by player."""
+        self.player_ids[:] = player_ids
+        order = np.argsort(self.player_ids, kind='stable')
+        ids, starts = np.unique(self.player_ids[order], return_index=True)
+        self._id_rows = dict(zip(ids.tolist(), np.split(order, starts[1:])))
+
+    def rows_of(self, player_id: int, season: Optional[str] = None) -> np.ndarray:
+        """Return a player's rows, oldest season first (only one season's if given)."""
+        rows = self._id_rows.get(player_id, np.empty(0, dtype=np.int64))
+        if season is None:
+            return rows
+        season_rows = self.season_rows(season)
+        return rows[(rows >= season_rows.start) & (rows < season_rows.stop)]
+
+    def player_totals(self, player_id: int, season: str) -> np.ndarray:
+        """Return a player's stats for a season summed over every team they played for.
+
+        Only counting stats (games, attempts, yards, touchdowns, points) are
+        meaningful as sums; rates and averages are not re-derived.
+        """
+        return self.values[self.rows_of(player_id, season)].sum(axis=0)
+
+    def totals(self, stat: str, season: str) -> np.ndarray:
+        """Return every player's season total of a counting stat, indexed by player id.
+
+        Ids must have been assigned. The array is as long as the largest id plus
+        one; players without a row that season are 0.
+        """
+        rows = self.season_rows(season)
+        player_ids = self.player_ids[rows]
+        return np.bincount(player_ids, weights=self.values[rows, self._stat_index[stat]],
+                           minlength=int(self.player_ids.max(initial=-1)) + 1)
+
+
+class StatsStore:
+    """Historical passing, receiving and rushing stats for every loaded season."""
+
+    __slots__ = ['passing', 'receiving', 'rushing']
+
+    def __init__(self, passing: StatsTable, receiving: StatsTable, rushing: StatsTable):
+        self.passing = passing
+        self.receiving = receiving
+        self.rushing = rushing
+
+    @property
+    def tables(self) -> Tuple[StatsTable, StatsTable, StatsTable]:
+        return self.passing, self.receiving, self.rushing
+
+    @property
+    def seasons(self) -> Tuple[str, ...]:
+        """Return every season any table holds, oldest first."""
+        return tuple(sorted({season for table in self.tables for season in table.season_names}))
+
+    def table(self, category: str) -> StatsTable:
+        """Return the table for 'passing', 'receiving' or 'rushing'."""
+        if category not in CATEGORY_STATS:
+            raise KeyError(f"Unknown stats category: {category}")
+        return getattr(self, category)
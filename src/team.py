@@ -3,209 +3,211 @@ Team Module
 -----------
 This module defines the Team class, which represents a football team and provides methods
 to calculate various offensive and defensive values based on player projections and DVOA data.
+Everything the values are computed from is gathered once into a TeamInputs snapshot, so a
+Team can also be rebuilt from a snapshot alone (see incremental.py).
 """
 
-from typing import Callable, Dict, Tuple
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from calibration import get_calibration
+from context import SeasonDataContext
+from profiling import profiled
+from projection_table import STAT_INDEX
+
+PASS_ATT, TARGETS, RUSH_ATT = STAT_INDEX["PassAtt"], STAT_INDEX["Targets"], STAT_INDEX["RushAtt"]
+TEAM_DVOA_CATEGORIES = ("OL Pass", "OL Run", "Defense Pass", "Defense Rush")
+# Components of a team's offensive passing and rushing values, named like their calibration weights
+PASS_COMPONENTS = ('qb', 'rec', 'ol')
+RUSH_COMPONENTS = ('rushing', 'ol_rush')
+
+
+class TeamInputs(NamedTuple):
+    """Everything the team value model reads for one team, as plain comparable values."""
+    # (weighted passing DVOA, projected attempts, PFF grade or None, PFF attempts) per QB
+    passers: Tuple[Tuple[float, float, Optional[float], float], ...]
+    # (weighted receiving DVOA, projected targets) per WR, RB and TE
+    receivers: Tuple[Tuple[float, float], ...]
+    # (weighted rushing DVOA, projected rush attempts) per WR and RB
+    rushers: Tuple[Tuple[float, float], ...]
+    pass_attempts: float
+    targets: float
+    rush_attempts: float
+    # Year-weighted team DVOA, ordered like TEAM_DVOA_CATEGORIES
+    team_dvoa: Tuple[float, ...]
+    # (offense, defense, special teams) DAVE
+    dave: Tuple[str, str, str]
+    # (player, position) in projection order
+    lineup: Tuple[Tuple[str, str], ...]
+
+    @classmethod
+    def from_context(cls, team_name: str, context: SeasonDataContext) -> "TeamInputs":
+        """Gather a team's inputs from the week's data sources."""
+        projections, weighted_dvoa = context.projections, context.weighted_dvoa
+        roster, stats = projections.get_team_roster(team_name), projections.table.stats
+        pff_grades = context.passing_grades.values_of(roster.passers).tolist()
+        passers = tuple(
+            (dvoa, attempts, None, 0.0) if math.isnan(grade) else (dvoa, attempts, grade, passes)
+            for dvoa, attempts, (grade, passes) in zip(weighted_dvoa.values_of(roster.passers, "Passing").tolist(),
+                                                        stats[roster.passers, PASS_ATT].tolist(), pff_grades)
+        )
+        receivers = tuple(zip(weighted_dvoa.values_of(roster.receivers, "Receiving").tolist(),
+                              stats[roster.receivers, TARGETS].tolist()))
+        rushers = tuple(zip(weighted_dvoa.values_of(roster.rushers, "Rushing").tolist(),
+                            stats[roster.rushers, RUSH_ATT].tolist()))
+
+        dvoa = context.dvoa
+        year_weights = np.array([1 / 2 ** i for i in range(len(dvoa.years))])
+        team_dvoa = tuple(float(dvoa.teams.values_of(team_name, category) @ year_weights) * 15 / 4
+                          for category in TEAM_DVOA_CATEGORIES)
+        lineup = tuple((player, position) for player, position, _ in projections.get_team_projections(team_name))
+        return cls(passers, receivers, rushers, roster.pass_attempts, roster.targets, roster.rush_attempts,
+                   team_dvoa, tuple(context.dave[team_name][0]), lineup)
 
-from projections import Projections
 
 class Team:
     """Represents a football team."""
 
-    __slots__ = ['team_name', 'dvoa', 'pff', 'team_projections', 'dave_off', 'dave_def', 'dave_st']
+    __slots__ = ['team_name', 'inputs', 'dave_off', 'dave_def', 'dave_st']
 
-    def __init__(self, team_name: str, projections: Projections, dvoa: Dict, dave: Dict, pff_data: Dict):
+    @profiled("team.init")
+    def __init__(self, team_name: str, context: Optional[SeasonDataContext] = None,
+                 inputs: Optional[TeamInputs] = None):
+        """Create a team from the week's context, or from an already gathered TeamInputs."""
         self.team_name = team_name
-        self.dvoa = dvoa
-        self.pff = pff_data
-        self.team_projections = projections.get_team_projections(self.team_name)
-        self.dave_off, self.dave_def, self.dave_st = self._get_dave_values(dave)
-
-    @staticmethod
-    def _create_function_dict() -> Dict[str, Callable[[float], float]]:
-        """Create a dictionary of linear functions used in the projection model."""
-        def create_linear_function(x1: float, y1: float, x2: float, y2: float) -> Callable[[float], float]:
-            slope = (y2 - y1) / (x2 - x1)
-            return lambda x: slope * x + (y1 - slope * x1)
+        self.inputs = inputs if inputs is not None else TeamInputs.from_context(team_name, context)
+        self.dave_off, self.dave_def, self.dave_st = self.inputs.dave
 
-        return {
-            "Pass": create_linear_function(-.35, 0, .40, 10),
-            "Rush": create_linear_function(-.20, 0, .20, 10),
-            "Rec": create_linear_function(-.22, 0, .25, 10),
-            "OLPF": create_linear_function(.88, 0, .25, 10),
-            "OLRF": create_linear_function(24, 0, 35, 10),
-            "DPF": create_linear_function(3.10, 0, -1.4, 10),
-            "DRF": create_linear_function(0.09, 0, -1.75, 10),
-            "DAVE DEF": create_linear_function(9.5, 0, -10.5, 10),
-            "DAVE OFF": create_linear_function(-17, 0, 17, 10),
-            "PFF Pass": create_linear_function(45,0,87.5,10)
-        }
+    @property
+    def lineup(self) -> List[Tuple[str, str]]:
+        """Return the team's projected (player, position) pairs in source order."""
+        return list(self.inputs.lineup)
 
+    @profiled("team.get_total_passing_value")
     def get_total_passing_value(self) -> float:
         """Calculate the total passing value based on QB, receiving, OL pass, and rushing values."""
-        qb_value = self._get_passing_value()
-        receiving_value = self._get_receiving_value()
-        ol_pass_value = self._get_offensive_line_pass_value()
-        # print(f"{self.team_name} QB Value: {round(qb_value,1)}")
-        # print(f"{self.team_name} Rec Value: {round(receiving_value,1)}")
-        # print(f"{self.team_name} OL Pass Value: {round(ol_pass_value,1)}")
-
-        weights = {'qb': 0.50, 'rec': 0.30, 'ol': 0.20}
         offensive_pass_value = sum(
-            value * weights[key] for key, value in {
-                'qb': qb_value, 'rec': receiving_value, 'ol': ol_pass_value
-            }.items()
+            value * get_calibration().weight(key) for key, value in self.get_passing_components().items()
         )
-
-        #print(f"  O: {self.team_name} P: {round(offensive_pass_value,1)}")
-
         return offensive_pass_value
 
+    @profiled("team.get_total_rushing_value")
     def get_total_rushing_value(self) -> float:
         """Calculate the total rushing value based on rushing and OL rush values."""
-        ol_rush_value = self._get_offensive_line_rush_value()
-        rushing_value = self._get_rushing_value()
-        # print(f"{self.team_name} Rush Value: {round(rushing_value,1)}")
-        # print(f"{self.team_name} OL Rush Value: {round(ol_rush_value,1)}")
-        
-
-        weights = {'rushing': 0.60, 'ol_rush': 0.40}
         offensive_rush_value = sum(
-            value * weights[key] for key, value in {
-                'rushing': rushing_value, 'ol_rush': ol_rush_value
-            }.items()
+            value * get_calibration().weight(key) for key, value in self.get_rushing_components().items()
         )
-        #print(f"  O: {self.team_name} R: {round(offensive_rush_value,1)}")
         return offensive_rush_value
 
+    def get_passing_components(self) -> Dict[str, float]:
+        """Return the normalized QB, receiving and OL pass values, keyed like PASS_COMPONENTS."""
+        qb_value = self._get_passing_value()
+        receiving_value = self._get_receiving_value()
+        ol_pass_value = self._get_offensive_line_pass_value()
+        return {'qb': qb_value, 'rec': receiving_value, 'ol': ol_pass_value}
+
+    def get_rushing_components(self) -> Dict[str, float]:
+        """Return the normalized rushing and OL rush values, keyed like RUSH_COMPONENTS."""
+        ol_rush_value = self._get_offensive_line_rush_value()
+        rushing_value = self._get_rushing_value()
+        return {'rushing': rushing_value, 'ol_rush': ol_rush_value}
+
+    def get_calibration_inputs(self) -> Dict[str, float]:
+        """Return the raw value each calibration map of the team's values is applied to, keyed by map name."""
+        dvoa_per_attempt, pff_grade = self._get_passing_inputs()
+        return {
+            "Pass": dvoa_per_attempt,
+            "PFF Pass": pff_grade,
+            "Rec": self._get_receiving_input(),
+            "OLPF": self._get_weighted_team_dvoa("OL Pass"),
+            "Rush": self._get_rushing_input(),
+            "OLRF": self._get_weighted_team_dvoa("OL Run"),
+            "DPF": self._get_weighted_team_dvoa("Defense Pass"),
+            "DRF": self._get_weighted_team_dvoa("Defense Rush")
+        }
+
     def _get_passing_value(self) -> float:
         """Calculate the passing value based on QB projections and DVOA."""
-        total_passing_att = sum(
-            player_data.get_proj_passing_att() for _, player_position, player_data in self.team_projections
-            if player_position == "QB"
-        )
-        total_contribution = sum(
-            player_data.get_passing_dvoa(self.dvoa) * player_data.get_proj_passing_att()
-            for _, player_position, player_data in self.team_projections if player_position == "QB"
-        )
+        dvoa_per_attempt, pff_grade = self._get_passing_inputs()
+        normalized_dvoa_value = get_calibration().apply("Pass", dvoa_per_attempt)
 
-        normalized_dvoa_value = self._create_function_dict()["Pass"](total_contribution / total_passing_att)
-        # print(f"Value: {total_contribution/total_passing_att}")
-        # print(f"Norm Pass DVOA: {normalized_dvoa_value}")
-        # import pprint
-        # pprint.pprint(self.pff)
-        pff_passing_data = self.pff["2024"]["Passing"]
+        pff_player_grade = get_calibration().apply("PFF Pass", pff_grade)
+
+        return (normalized_dvoa_value + pff_player_grade) / 2
 
-        pff_player_grade = 0
+    def _get_passing_inputs(self) -> Tuple[float, float]:
+        """Return the attempt-weighted QB DVOA and the pass-weighted PFF grade (50 for QBs without one)."""
+        total_contribution = 0
         total_passes = 0
         total_cont = 0
-        for _, player_position, player_data in self.team_projections:
-            if player_position == "QB":
-                try:
-                    pff_player_grade = pff_passing_data[player_data.name][0][0]
-                    passes = pff_passing_data[player_data.name][0][1]
-                    total_passes += passes
-                    total_cont += pff_player_grade * passes
-                except KeyError:
-                    total_cont += 50
-                    total_passes += 1  
-                    pff_player_grade = "N/A"
-                    passes = 0
-                # print(f"Name: {player_data.name}")
-                # print(f"PFF: {pff_player_grade}")   
-                # print(f"Passes: {passes}")           
-
-        #print(f"total_cont / total_passes: {total_cont / total_passes}")
-        pff_player_grade = self._create_function_dict()["PFF Pass"](total_cont / total_passes)
-        #print(f"Norm PFF: {pff_player_grade}")
+        for dvoa, attempts, pff_player_grade, passes in self.inputs.passers:
+            total_contribution += dvoa * attempts
+            if pff_player_grade is None:
+                total_cont += 50
+                total_passes += 1
+            else:
+                total_passes += passes
+                total_cont += pff_player_grade * passes
 
-        return (normalized_dvoa_value + pff_player_grade) / 2
+        return total_contribution / self.inputs.pass_attempts, total_cont / total_passes
 
     def _get_receiving_value(self) -> float:
         """Calculate the receiving value based on WR, RB, and TE projections and DVOA."""
-        total_targets = sum(
-            player_data.get_proj_targets() for _, player_position, player_data in self.team_projections
-            if player_position in ["WR", "RB", "TE"]
-        )
-        total_contribution = sum(
-            player_data.get_receiving_dvoa(self.dvoa) * player_data.get_proj_targets()
-            for _, player_position, player_data in self.team_projections if player_position in ["WR", "RB", "TE"]
-        )
-        #print(f"Total REC DVOA: {round(total_contribution / total_targets,2)}")
-        return self._create_function_dict()["Rec"](total_contribution / total_targets)
+        return get_calibration().apply("Rec", self._get_receiving_input())
+
+    def _get_receiving_input(self) -> float:
+        """Return the target-weighted receiving DVOA."""
+        total_contribution = sum(dvoa * targets for dvoa, targets in self.inputs.receivers)
+        total_targets = self.inputs.targets
+        return total_contribution / total_targets
 
     def _get_offensive_line_pass_value(self) -> float:
         """Get the offensive line pass value based on DVOA."""
-        _weighted_avg = (
-            ((self.dvoa["2021"]["OL Pass"][self.team_name][0]) / 8) + \
-            ((self.dvoa["2022"]["OL Pass"][self.team_name][0]) / 4) + \
-            ((self.dvoa["2023"]["OL Pass"][self.team_name][0]) / 2) + \
-            (self.dvoa["2024"]["OL Pass"][self.team_name][0])
-        ) * 15 / 4
-        #print(_weighted_avg)
-        return self._create_function_dict()["OLPF"](_weighted_avg)
+        _weighted_avg = self._get_weighted_team_dvoa("OL Pass")
+        return get_calibration().apply("OLPF", _weighted_avg)
 
     def _get_offensive_line_rush_value(self) -> float:
         """Get the offensive line rush value based on DVOA."""
-        _weighted_avg = (
-            ((self.dvoa["2021"]["OL Run"][self.team_name][0]) / 8) + \
-            ((self.dvoa["2022"]["OL Run"][self.team_name][0]) / 4) + \
-            ((self.dvoa["2023"]["OL Run"][self.team_name][0]) / 2) + \
-            (self.dvoa["2024"]["OL Run"][self.team_name][0])
-        ) * 15 / 4
-        #print(_weighted_avg)
-        return self._create_function_dict()["OLRF"](_weighted_avg)
+        _weighted_avg = self._get_weighted_team_dvoa("OL Run")
+        return get_calibration().apply("OLRF", _weighted_avg)
 
     def _get_rushing_value(self) -> float:
         """Calculate the rushing value based on RB and WR projections and DVOA."""
-        total_attempts = sum(
-            player_data.get_proj_attempts() for _, player_position, player_data in self.team_projections
-            if player_position in ["QB", "WR", "RB"]
-        )
-        total_contribution = sum(
-            player_data.get_rushing_dvoa(self.dvoa) * player_data.get_proj_attempts()
-            for _, player_position, player_data in self.team_projections if player_position in ["WR", "RB"]
-        )
-        #print(f"Total RUSH DVOA: {round(total_contribution / total_attempts,2)}")
-        return self._create_function_dict()["Rush"](total_contribution / total_attempts)
+        return get_calibration().apply("Rush", self._get_rushing_input())
+
+    def _get_rushing_input(self) -> float:
+        """Return the attempt-weighted rushing DVOA."""
+        total_contribution = sum(dvoa * attempts for dvoa, attempts in self.inputs.rushers)
+        total_attempts = self.inputs.rush_attempts
+        return total_contribution / total_attempts
 
+    @profiled("team.get_total_passing_value_def")
     def get_total_passing_value_def(self) -> float:
         """Get the defensive pass value with potential multiplier."""
-        _weighted_avg = (
-            ((self.dvoa["2021"]["Defense Pass"][self.team_name][0]) / 8) + \
-            ((self.dvoa["2022"]["Defense Pass"][self.team_name][0]) / 4) + \
-            ((self.dvoa["2023"]["Defense Pass"][self.team_name][0]) / 2) + \
-            (self.dvoa["2024"]["Defense Pass"][self.team_name][0])
-        ) * 15 / 4
-        #print(_weighted_avg)
-        # print(f"  D: {self.team_name} P: {round(self._create_function_dict()["DPF"](_weighted_avg),1)}")
-        return self._create_function_dict()["DPF"](_weighted_avg)
+        _weighted_avg = self._get_weighted_team_dvoa("Defense Pass")
+        return get_calibration().apply("DPF", _weighted_avg)
 
+    @profiled("team.get_total_rushing_value_def")
     def get_total_rushing_value_def(self) -> float:
         """Get the defensive rush value with potential multiplier."""
-        _weighted_avg = (
-            ((self.dvoa["2021"]["Defense Rush"][self.team_name][0]) / 8) + \
-            ((self.dvoa["2022"]["Defense Rush"][self.team_name][0]) / 4) + \
-            ((self.dvoa["2023"]["Defense Rush"][self.team_name][0]) / 2) + \
-            (self.dvoa["2024"]["Defense Rush"][self.team_name][0])
-        ) * 15 / 4
-        #print(round(_weighted_avg,3))
-        # print(f"  D: {self.team_name} R: {round(self._create_function_dict()["DRF"](_weighted_avg),1)}")
-        return self._create_function_dict()["DRF"](_weighted_avg)
+        _weighted_avg = self._get_weighted_team_dvoa("Defense Rush")
+        return get_calibration().apply("DRF", _weighted_avg)
+
+    def _get_weighted_team_dvoa(self, category: str) -> float:
+        """Get the year-weighted team DVOA for a category (2021/8 + 2022/4 + 2023/2 + 2024) * 15/4."""
+        return self.inputs.team_dvoa[TEAM_DVOA_CATEGORIES.index(category)]
 
     def get_def_dave_normalized(self) -> float:
         """Get the normalized defensive DAVE value."""
-        print(f"Dave Def: {self.dave_def}")
-        return self._create_function_dict()["DAVE DEF"](float(self.dave_def))
+        return get_calibration().apply("DAVE DEF", float(self.dave_def))
 
     def get_off_dave_normalized(self) -> float:
         """Get the normalized offensive DAVE value."""
-        return self._create_function_dict()["DAVE OFF"](float(self.dave_off))
-
-    def _get_dave_values(self, dave_data: Dict) -> Tuple[float, float, float]:
-        """Get the DAVE values for the team."""
-        return dave_data[self.team_name][0]
+        return get_calibration().apply("DAVE OFF", float(self.dave_off))
 
+    @profiled("team.get_pass_rates")
     def get_pass_rates(self, pass_rate_data: Dict) -> Tuple[float, float]:
         """Get the pass rates for the team."""
         return pass_rate_data[self.team_name][0]
\ No newline at end of file
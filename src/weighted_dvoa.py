@@ -0,0 +1,49 @@
+"""
+Weighted DVOA Module
+--------------------
+This module defines the WeightedDVOA table, which holds the decay-weighted passing,
+rushing and receiving DVOA of every projected player. It is computed once, in a
+single vectorized pass over the DVOA store, after DVOA and projections are loaded.
+Players are joined to the store by player id through the player crosswalk.
+"""
+
+import logging
+from typing import Sequence
+
+import numpy as np
+
+from dvoa_store import DVOAStore, PLAYER_CATEGORIES
+from player import Player
+from player_ids import PlayerCrosswalk
+
+logger = logging.getLogger(__name__)
+
+
+class WeightedDVOA:
+    """Precomputed weighted DVOA for every projected player, indexed by projection row."""
+
+    __slots__ = ['values']
+
+    def __init__(self, players: Sequence[Player], dvoa: DVOAStore, crosswalk: PlayerCrosswalk):
+        """Compute weighted DVOA for all players in one pass.
+
+        Args:
+            players: Projected players, ordered by their projection row.
+            dvoa: The loaded DVOA store.
+            crosswalk: The crosswalk the players' ids were assigned from.
+        """
+        year_divisors = dvoa.year_divisors
+        dvoa_rows = crosswalk.rows_by_id("dvoa", dvoa.players.names)
+        dvoa_ids = dvoa_rows[np.array([player.player_id for player in players], dtype=np.int64)]
+        found = dvoa_ids >= 0
+        if not found.all():
+            logger.debug("No DVOA for %d of %d projected players", len(players) - found.sum(), len(players))
+
+        self.values = np.zeros((len(players), len(PLAYER_CATEGORIES)))
+        for category_id, category in enumerate(PLAYER_CATEGORIES):
+            league_values = dvoa.players.weighted_average(category, year_divisors)
+            self.values[found, category_id] = league_values[dvoa_ids[found]]
+
+    def values_of(self, rows: np.ndarray, category: str) -> np.ndarray:
+        """Return the weighted DVOA of many players at once, by projection row."""
+        return self.values[rows, PLAYER_CATEGORIES.index(category)]